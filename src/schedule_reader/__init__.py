@@ -1,68 +1,146 @@
+from collections.abc import Mapping
 import pandas as pd
-from .data_reader import read_data
+from .data_reader import read_data, iter_schedule, ScheduleDict
 from .welspec import extract_welspecs, extract_welspecl, extract_wellspec, extract_welspec2
-from .compdat import extract_compdat, extract_compdatl, extract_compdat2
+from .compdat import extract_compdat, extract_compdatl, extract_compdat2, expand_connections, extract_connections
 from .wcon import extract_wconprod, extract_wconinje, extract_wconhist, extract_wconinjh
-from .property_keywords import read_keyword_from_include, expand_keyword, ijk_index, get_dimens
+from .property_keywords import read_keyword_from_include, expand_keyword, ijk_index, ijk_arrays, get_dimens, read_property, read_properties, parse_property, property_dtype
 from .schedule_keywords import extract_keyword
+from .all_keywords import extract_all
+from .well_state import WellStateIndex
+from .well_matrix import WellMatrices, build_matrices, well_matrices
+from .cumulative import integrate_rates, cumulative_volumes
 from .counter import start_counter
+from .deck import ScheduleDeck
+from .columnar import ColumnarSchedule
+from .rle import RLEProperty, read_property_rle
+from .active_grid import ActiveGrid
+from .grid_section import index_properties, read_grid_properties
 
-__all__ = ['compdat2df', 'welspecs2df', 'property2df', 'start_counter']
+__all__ = ['compdat2df', 'connections2df', 'welspec2df', 'property2df', 'properties2df', 'start_counter', 'ScheduleDeck', 'ColumnarSchedule', 'ScheduleDict', 'extract_all', 'WellStateIndex', 'WellMatrices', 'well_matrices', 'cumulative_volumes', 'RLEProperty', 'read_property_rle', 'ActiveGrid', 'index_properties', 'read_grid_properties', 'iter_schedule']
 __version__ = '0.6.5'
 
 
 def compdat2df(path, encoding='cp1252', verbose=False):
-    if type(path) is dict:
+    if isinstance(path, ScheduleDeck):
+        return path.compdat2
+    if isinstance(path, (Mapping, ColumnarSchedule)):
         return extract_compdat2(path)
     return extract_compdat2(read_data(path, encoding=encoding, verbose=verbose))
 
+def connections2df(path, dimens=None, encoding='cp1252', verbose=False):
+    if isinstance(path, ScheduleDeck):
+        return expand_connections(path.compdat2, dimens)
+    if isinstance(path, (Mapping, ColumnarSchedule)):
+        return extract_connections(path, dimens)
+    if dimens is None and path.upper().endswith('.DATA'):
+        dimens = get_dimens(path, encoding=encoding)
+    return extract_connections(read_data(path, encoding=encoding, verbose=verbose), dimens)
+
 def welspec2df(path, encoding='cp1252', verbose=False):
-    if type(path) is dict:
+    if isinstance(path, ScheduleDeck):
+        return path.welspec2
+    if isinstance(path, (Mapping, ColumnarSchedule)):
         return extract_welspec2(path)
     return extract_welspec2(read_data(path, encoding=encoding, verbose=verbose))
 
 def wconprod2df(path, encoding='cp1252', verbose=False):
-    if type(path) is dict:
+    if isinstance(path, ScheduleDeck):
+        return path.wconprod
+    if isinstance(path, (Mapping, ColumnarSchedule)):
         return extract_wconprod(path)
     return extract_wconprod(read_data(path, encoding=encoding, verbose=verbose))
 
 def wconinje2df(path, encoding='cp1252', verbose=False):
-    if type(path) is dict:
+    if isinstance(path, ScheduleDeck):
+        return path.wconinje
+    if isinstance(path, (Mapping, ColumnarSchedule)):
         return extract_wconinje(path)
     return extract_wconinje(read_data(path, encoding=encoding, verbose=verbose))
 
 def wconhist2df(path, encoding='cp1252', verbose=False):
-    if type(path) is dict:
+    if isinstance(path, ScheduleDeck):
+        return path.wconhist
+    if isinstance(path, (Mapping, ColumnarSchedule)):
         return extract_wconhist(path)
     return extract_wconhist(read_data(path, encoding=encoding, verbose=verbose))
 
 def wconinjh2df(path, encoding='cp1252', verbose=False):
-    if type(path) is dict:
+    if isinstance(path, ScheduleDeck):
+        return path.wconinjh
+    if isinstance(path, (Mapping, ColumnarSchedule)):
         return extract_wconinjh(path)
     return extract_wconinjh(read_data(path, encoding=encoding, verbose=verbose))
 
 def keyword2df(path, keyword, record_names=[], encoding='cp1252', verbose=False):
     record_names = None if len(record_names) == 0 else record_names
-    if type(path) is dict:
+    if isinstance(path, ScheduleDeck):
+        return path.keyword(keyword, record_names=record_names)
+    if isinstance(path, (Mapping, ColumnarSchedule)):
         return extract_keyword(path, keyword=keyword, record_names=record_names)
     return extract_keyword(
         read_data(path, encoding=encoding, verbose=verbose),
         keyword=keyword, record_names=record_names
     )
 
-def property2df(path, keyword, dimens=(None, None, None), encoding='cp1252', verbose=False, parse_to=None):       
-    keyword_data = expand_keyword(read_keyword_from_include(path, keyword, encoding=encoding))
+def property2df(path, keyword, dimens=(None, None, None), encoding='cp1252', verbose=False, parse_to=None, cache_dir=None):       
     if dimens[0] is not None and dimens[1] is not None and dimens[2] is not None:
-        cells = ijk_index(dimens[0], dimens[1], dimens[2])
-        output = pd.Series(
-            keyword_data.split(),
-            index=pd.MultiIndex.from_tuples(cells),
-            name=keyword).reset_index()
-        output.columns = ['I', 'J', 'K', keyword]
-        output[['I', 'J', 'K']] = output[['I', 'J', 'K']].astype(int)
-        if parse_to is None:
-            parse_to = int if keyword.endswith('NUM') else float
-        output[keyword] = output[keyword].astype(parse_to)
-        return output
+        return properties2df(path, [keyword], dimens, encoding=encoding, verbose=verbose,
+                             parse_to=None if parse_to is None else {keyword: parse_to}, cache_dir=cache_dir)
     else:
-        return keyword_data
+        return expand_keyword(read_keyword_from_include(path, keyword, encoding=encoding))
+
+def properties2df(path, keywords, dimens=(None, None, None), encoding='cp1252', verbose=False, parse_to=None, cache_dir=None, active=None,
+                  workers=None):
+    """
+    reads every one of the `keywords` from the property file in a single pass, and returns them as columns of one DataFrame
+    with the I, J, K of the cells. If `dimens` is not provided, returns a dictionary {keyword: numpy.ndarray}.
+
+    Params:
+        path: str
+            the property include file, or a .DATA file to look for the keywords in its GRID and PROPS sections and their INCLUDE files
+        keywords: list of str
+            i.e.: ['PORO', 'PERMX', 'PERMY', 'PERMZ', 'NTG', 'ACTNUM', 'SATNUM']
+        dimens: tuple (NX, NY, NZ)
+            as returned by `get_dimens`. For a .DATA file it is read from its DIMENS keyword if not provided.
+        parse_to: dict {keyword: dtype}, optional
+            int32 for ACTNUM and *NUM keywords and float64 for the others, by default.
+        cache_dir: str, optional
+            folder for the binary cache of the parsed properties, the next loads of the same unchanged file skip the parsing.
+        active: ActiveGrid or bool, optional
+            return only the active cells, indexed by their global cell number. If True the ACTNUM is read from the same file.
+        workers: int, optional
+            only for a .DATA file, number of processes to read the include files in parallel.
+    """
+    deck = path.upper().endswith('.DATA')
+    if deck and (dimens[0] is None or dimens[1] is None or dimens[2] is None):
+        dimens = get_dimens(path, encoding=encoding)
+    size = None if dimens[0] is None or dimens[1] is None or dimens[2] is None else int(dimens[0]) * int(dimens[1]) * int(dimens[2])
+
+    def read(names):
+        if deck:
+            return read_grid_properties(path, names, parse_to, encoding=encoding, size=size, workers=workers, cache_dir=cache_dir, verbose=verbose)
+        return read_properties(path, names, parse_to, encoding=encoding, size=size, cache_dir=cache_dir, verbose=verbose)
+
+    if active is True and size is None:
+        raise ValueError(f"dimens is required with active=True, {'the deck has no DIMENS' if deck else 'pass the dimens of the grid'}")
+    if active is not None and active is not False:
+        # the ACTNUM is read in the same pass as the other keywords
+        names = [keyword.upper() for keyword in keywords]
+        values = read(names + ['ACTNUM'] if active is True and 'ACTNUM' not in names else names)
+        if active is True:
+            active = ActiveGrid(values['ACTNUM'], dimens)
+        for keyword in names:
+            active.properties[keyword] = active.compress(values[keyword])
+        return active.to_dataframe(keywords)
+    if size is None:
+        return read(keywords)
+    I, J, K = ijk_arrays(dimens)
+    values = read(keywords)
+    if verbose:
+        print(f"{', '.join(values)} read from {path}")
+    output = {'I': I, 'J': J, 'K': K}
+    for keyword in keywords:
+        output[keyword] = values[keyword.upper()]
+    # the columns are the arrays read, without a copy: the memory mapped pages of the cache are read only when they are used
+    return pd.DataFrame(output, copy=False)
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from .property_keywords import read_properties, read_property
+
+__all__ = ['ActiveGrid']
+
+
+class ActiveGrid(object):
+    """
+    the active cells of a grid, from its ACTNUM, with the mapping between the global and the active cell indexes.
+    The properties loaded through the grid are stored only for the active cells, joins and aggregations run in that space.
+
+    Params:
+        actnum: numpy.ndarray, RLEProperty or None
+            the ACTNUM of every cell of the grid, in the order of the property keywords. None if all the cells are active.
+        dimens: tuple (NX, NY, NZ)
+            as returned by `get_dimens`
+
+    Attributes:
+        dimens: tuple of int
+        size: int
+            the number of cells of the grid
+        global_index: numpy.ndarray of int64
+            the flat (0-based) global index of each active cell
+        active_index: numpy.ndarray of int32
+            the active index of each cell of the grid, -1 for inactive cells
+        properties: dict {keyword: numpy.ndarray}
+            the properties loaded, only for the active cells
+
+    Example:
+        grid = ActiveGrid.read('grid.grdecl', get_dimens('MODEL.DATA'))
+        grid.load('grid.grdecl', ['PORO', 'PERMX', 'SATNUM'])
+        grid.aggregate('PORO', by='SATNUM', how='mean')
+        grid.to_dataframe()
+    """
+    def __init__(self, actnum, dimens):
+        self.dimens = tuple(int(each) for each in dimens)
+        self.size = self.dimens[0] * self.dimens[1] * self.dimens[2]
+        if actnum is None:
+            active = np.ones(self.size, dtype=bool)
+        else:
+            active = np.asarray(actnum) > 0
+        if len(active) != self.size:
+            raise ValueError(f"ACTNUM has {len(active)} cells but the grid {self.dimens} has {self.size}")
+        self.global_index = np.flatnonzero(active)
+        self.active_index = np.full(self.size, -1, dtype=np.int32)
+        self.active_index[self.global_index] = np.arange(len(self.global_index), dtype=np.int32)
+        self.properties = {}
+
+    @classmethod
+    def read(cls, path, dimens, encoding='cp1252', cache_dir=None):
+        """
+        creates the ActiveGrid from the ACTNUM keyword in the property file `path`.
+        """
+        dimens = tuple(int(each) for each in dimens)
+        return cls(read_property(path, 'ACTNUM', encoding=encoding, size=dimens[0] * dimens[1] * dimens[2], cache_dir=cache_dir), dimens)
+
+    def __len__(self):
+        return len(self.global_index)
+
+    def __repr__(self):
+        return f"ActiveGrid({self.dimens}, {len(self)} active of {self.size} cells, {len(self.properties)} properties)"
+
+    def compress(self, values):
+        """
+        the `values` of every cell of the grid, only for the active cells.
+        """
+        values = np.asarray(values)
+        if len(values) != self.size:
+            raise ValueError(f"expected {self.size} values, received {len(values)}")
+        return values[self.global_index]
+
+    def expand(self, values, fill=np.nan):
+        """
+        the `values` of the active cells (or the name of a loaded property) for every cell of the grid, `fill` for the inactive cells.
+        """
+        values = self._values(values)
+        output = np.full(self.size, fill, dtype=np.result_type(values.dtype, np.asarray(fill).dtype))
+        output[self.global_index] = values
+        return output
+
+    def to_active(self, cells):
+        """
+        the active index of the global flat (0-based) `cells`, -1 for inactive cells.
+        """
+        return self.active_index[np.asarray(cells, dtype=np.int64)]
+
+    def to_global(self, cells):
+        """
+        the global flat (0-based) index of the active `cells`.
+        """
+        return self.global_index[np.asarray(cells, dtype=np.int64)]
+
+    def ijk(self):
+        """
+        the I, J and K (1-based) of the active cells, as three numpy.ndarray of int32.
+        """
+        nx, ny, nz = self.dimens
+        return ((self.global_index % nx + 1).astype(np.int32),
+                (self.global_index // nx % ny + 1).astype(np.int32),
+                (self.global_index // (nx * ny) + 1).astype(np.int32))
+
+    def load(self, path, keywords, dtypes=None, encoding='cp1252', cache_dir=None, verbose=False):
+        """
+        reads the `keywords` from the property file `path` in one pass, and keeps them only for the active cells.
+
+        Return:
+            dict {keyword: numpy.ndarray} of the active cells
+        """
+        values = read_properties(path, keywords, dtypes, encoding=encoding, size=self.size, cache_dir=cache_dir, verbose=verbose)
+        for keyword in values:
+            self.properties[keyword] = self.compress(values[keyword])
+        return {keyword: self.properties[keyword] for keyword in values}
+
+    def _values(self, values):
+        if isinstance(values, str):
+            return self.properties[values.upper()]
+        values = np.asarray(values)
+        if len(values) == self.size and self.size != len(self):
+            return self.compress(values)
+        return values
+
+    def aggregate(self, values, by, how='sum'):
+        """
+        aggregates the `values` of the active cells by the regions in `by`, i.e.: pore volume by SATNUM or FIPNUM.
+
+        Params:
+            values: str or numpy.ndarray
+                a loaded property name, or an array of the active cells (or of all the cells of the grid)
+            by: str or numpy.ndarray
+                the integer region of the cells, a loaded property name or an array
+            how: str
+                'sum', 'mean' or 'count'
+
+        Return:
+            pandas.Series indexed by region
+        """
+        value_name = values if isinstance(values, str) else None
+        region_name = by if isinstance(by, str) else None
+        values = self._values(values).astype(np.float64, copy=False)
+        regions = self._values(by).astype(np.int64, copy=False)
+        unique, inverse = np.unique(regions, return_inverse=True)
+        count = np.bincount(inverse, minlength=len(unique))
+        if how == 'count':
+            result = count
+        else:
+            result = np.bincount(inverse, weights=values, minlength=len(unique))
+            if how == 'mean':
+                result = result / count
+            elif how != 'sum':
+                raise ValueError(f"how must be 'sum', 'mean' or 'count', received {how}")
+        return pd.Series(result, index=pd.Index(unique, name=region_name), name=value_name)
+
+    def to_dataframe(self, keywords=None):
+        """
+        DataFrame of the active cells, with their I, J, K and the loaded properties (or only the `keywords`).
+        """
+        I, J, K = self.ijk()
+        output = {'I': I, 'J': J, 'K': K}
+        for keyword in (self.properties if keywords is None else [keyword.upper() for keyword in keywords]):
+            output[keyword] = self.properties[keyword]
+        return pd.DataFrame(output, index=pd.Index(self.global_index, name='cell'))
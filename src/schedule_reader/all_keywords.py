@@ -0,0 +1,76 @@
+import pandas as pd
+from .columnar import ColumnarSchedule
+from .data_reader import ScheduleDict
+from .dates import parse_dates
+from .schemas import build_table
+from .compdat import _defaultIJ
+from .wcon import _ffill_vfp
+
+__all__ = ['extract_all']
+
+# the keywords needed to complete other keywords: the defaulted I and J of COMPDAT come from WELSPECS
+_REQUIRES = {'COMPDAT': 'WELSPECS', 'COMPDATL': 'WELSPECL'}
+
+
+def extract_all(schedule_dict, keywords=None):
+    """
+    extract every keyword (or only the `keywords`) from the schedule dictionary in a single pass over its records.
+    The records are put together by keyword while the current date is carried along, then each keyword is built into
+    a DataFrame typed with its schema, like `extract_keyword` and the extractors (`extract_compdat`, `extract_wconhist`, ...) do.
+
+    Params:
+        schedule_dict: dict, ScheduleDict or ColumnarSchedule
+            shedule dictionary prepared by the .data_reader.read_data function
+        keywords: list of str, optional
+            the keywords to extract, by default all of them. DATES is returned as a Series.
+
+    Return:
+        dict {keyword: pandas.DataFrame}
+    """
+    wanted = None if keywords is None else {keyword.upper() for keyword in keywords}
+    needed = None if wanted is None else wanted | {_REQUIRES[keyword] for keyword in wanted if keyword in _REQUIRES}
+    tables = {}
+
+    if isinstance(schedule_dict, ColumnarSchedule):
+        for keyword, columns in schedule_dict.keywords.items():
+            if needed is None or keyword in needed:
+                tables[keyword] = build_table(columns.positions, schedule_dict.record_datetimes(keyword), schedule_dict.records(keyword), keyword)
+        dates = schedule_dict.date_table
+    else:
+        buckets = {}
+        dates = []
+        date = None
+        for each, record in schedule_dict.items():
+            for keyword, data in record.items():
+                if keyword == 'DATES':
+                    date = data
+                    dates.append(data)
+                    continue
+                if needed is not None and keyword not in needed:
+                    continue
+                bucket = buckets.get(keyword)
+                if bucket is None:
+                    bucket = buckets[keyword] = ([], [], [])
+                bucket[0].append(each)
+                bucket[1].append(date)
+                bucket[2].append(data if type(data) is list else [data])
+        with_table = isinstance(schedule_dict, ScheduleDict) and schedule_dict.has_dates
+        for keyword, (index, record_dates, records) in buckets.items():
+            if with_table:
+                record_dates = schedule_dict.record_dates(index)
+            tables[keyword] = build_table(index, record_dates, records, keyword)
+        dates = schedule_dict.date_table if with_table else parse_dates(dates)
+
+    # the same completions done by the extractors
+    for keyword, welspec in _REQUIRES.items():
+        if keyword in tables and ((tables[keyword]['I'] == 0).any() or (tables[keyword]['J'] == 0).any()):
+            _defaultIJ(tables[keyword], tables.get(welspec, build_table([], [], [], welspec)))
+    for keyword in ('WCONHIST', 'WCONINJH'):
+        if keyword in tables:
+            _ffill_vfp(tables[keyword])
+
+    if wanted is not None:
+        tables = {keyword: tables[keyword] for keyword in tables if keyword in wanted}
+    if wanted is None or 'DATES' in wanted:
+        tables['DATES'] = pd.Series(dates, name='DATES')
+    return tables
@@ -0,0 +1,272 @@
+from array import array
+from collections.abc import Mapping
+import numpy as np
+from .dates import date_table
+
+__all__ = ['ColumnarSchedule', 'KeywordColumns', 'ScheduleView']
+
+# kind of record, as stored by `read_data`
+_LIST, _STRING, _NONE = 0, 1, 2
+
+
+class KeywordColumns(object):
+    """
+    contiguous storage of every record of one keyword.
+
+    Attributes:
+        keyword: str
+        positions: numpy.ndarray of int64
+            the position (counter) of each record in the schedule, in order of appearance
+        date_index: numpy.ndarray of int32
+            index of the DATES in effect for each record, in the `dates` of the ColumnarSchedule (-1 if no date yet)
+        codes: numpy.ndarray of int32, shape (records, columns)
+            the token id of every item of each record, -1 where the record is shorter than the widest one
+        kind: numpy.ndarray of int8
+            0 if the record was a list of items, 1 if it was a single string and 2 if it was None
+    """
+    def __init__(self, keyword, positions, date_index, codes, kind):
+        self.keyword = keyword
+        self.positions = positions
+        self.date_index = date_index
+        self.codes = codes
+        self.kind = kind
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __repr__(self):
+        return f"KeywordColumns({self.keyword}, {len(self)} records x {self.codes.shape[1]} columns)"
+
+    @property
+    def nbytes(self):
+        return self.positions.nbytes + self.date_index.nbytes + self.codes.nbytes + self.kind.nbytes
+
+
+class _KeywordBuilder(object):
+    def __init__(self):
+        self.positions = array('q')
+        self.date_index = array('i')
+        self.kind = array('b')
+        self.offsets = array('q', [0])
+        self.codes = array('i')
+
+    def finalize(self, keyword):
+        n = len(self.positions)
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        lengths = np.diff(offsets)
+        width = int(lengths.max()) if n > 0 else 0
+        codes = np.full((n, width), -1, dtype=np.int32)
+        if n > 0 and width > 0:
+            # scatter the flat codes into the padded 2D table in one vectorized step
+            rows = np.repeat(np.arange(n), lengths)
+            cols = np.arange(len(self.codes)) - np.repeat(offsets[:-1], lengths)
+            codes[rows, cols] = np.frombuffer(self.codes, dtype=np.int32)
+        return KeywordColumns(keyword,
+                              np.frombuffer(self.positions, dtype=np.int64).copy(),
+                              np.frombuffer(self.date_index, dtype=np.int32).copy(),
+                              codes,
+                              np.frombuffer(self.kind, dtype=np.int8).copy())
+
+
+class ColumnarSchedule(object):
+    """
+    columnar alternative to the `{i: {keyword: [records]}}` schedule dictionary prepared by `read_data`.
+
+    Every distinct token is stored once in `tokens`, each keyword keeps its records as a 2D array of token ids
+    together with the record position and the index of the DATES in effect. Extracting one keyword is a slice
+    of its own arrays, there is no need to walk the whole schedule.
+
+    Attributes:
+        tokens: numpy.ndarray of object
+            the distinct strings found in the records
+        dates: list of str
+            every DATES entry, in order of appearance
+        date_table: numpy.ndarray of datetime64[ns]
+            the parsed `dates`, each distinct DATES entry is parsed once (NaT if it can't be parsed)
+        date_positions: numpy.ndarray of int64
+            the position (counter) of each DATES entry
+        keywords: dict {str: KeywordColumns}
+        record_keyword: numpy.ndarray of int16
+            for every position in the schedule, the id of its keyword in `keyword_names` (-1 for DATES)
+        record_row: numpy.ndarray of int32
+            for every position in the schedule, the row within its keyword (or within `dates`)
+    """
+    def __init__(self):
+        self._token_ids = {}
+        self._tokens = []
+        self._builders = {}
+        self._dates = []
+        self._date_positions = array('q')
+        self._record_keyword = array('h')
+        self._record_row = array('i')
+        self._keyword_ids = {}
+        self._first_position = None
+        self.keywords = None
+
+    def _code(self, token):
+        code = self._token_ids.get(token)
+        if code is None:
+            code = self._token_ids[token] = len(self._tokens)
+            self._tokens.append(token)
+        return code
+
+    def append(self, position, keyword, record):
+        """
+        add one record of the schedule, in order of appearance.
+
+        Params:
+            position: int
+                the position (counter) of the record in the schedule
+            keyword: str
+            record: list of str, str or None
+                the record as stored by `read_data`
+        """
+        if self.keywords is not None:
+            raise ValueError("this ColumnarSchedule is already finalized, records can't be appended.")
+        if self._first_position is None:
+            self._first_position = position
+        elif position != self._first_position + len(self._record_row):
+            raise ValueError(f"records must be appended in order, expected position {self._first_position + len(self._record_row)} but received {position}")
+        if keyword == 'DATES':
+            self._record_keyword.append(-1)
+            self._record_row.append(len(self._dates))
+            self._dates.append(record)
+            self._date_positions.append(position)
+            return
+        if keyword not in self._builders:
+            self._keyword_ids[keyword] = len(self._keyword_ids)
+            self._builders[keyword] = _KeywordBuilder()
+        builder = self._builders[keyword]
+        self._record_keyword.append(self._keyword_ids[keyword])
+        self._record_row.append(len(builder.positions))
+        builder.positions.append(position)
+        builder.date_index.append(len(self._dates) - 1)
+        if record is None:
+            builder.kind.append(_NONE)
+        elif type(record) is list:
+            builder.kind.append(_LIST)
+            builder.codes.extend([self._code(token) for token in record])
+        else:
+            builder.kind.append(_STRING)
+            builder.codes.append(self._code(record))
+        builder.offsets.append(len(builder.codes))
+
+    def finalize(self):
+        """
+        convert the appended records into contiguous numpy arrays. No more records can be appended after this.
+        """
+        if self.keywords is not None:
+            return self
+        self.keywords = {keyword: builder.finalize(keyword) for keyword, builder in self._builders.items()}
+        self.keyword_names = list(self._keyword_ids)
+        self.tokens = np.empty(len(self._tokens), dtype=object)
+        self.tokens[:] = self._tokens
+        self.dates = self._dates
+        self.date_table = date_table(self._dates)
+        self.date_positions = np.frombuffer(self._date_positions, dtype=np.int64).copy()
+        self.record_keyword = np.frombuffer(self._record_keyword, dtype=np.int16).copy()
+        self.record_row = np.frombuffer(self._record_row, dtype=np.int32).copy()
+        self.first_position = 0 if self._first_position is None else self._first_position
+        del self._builders, self._token_ids, self._tokens, self._date_positions, self._record_keyword, self._record_row
+        return self
+
+    @classmethod
+    def from_dict(cls, schedule_dict):
+        """
+        build a ColumnarSchedule from a schedule dictionary prepared by `read_data`.
+        """
+        columnar = cls()
+        for each in schedule_dict:
+            for keyword, record in schedule_dict[each].items():
+                columnar.append(each, keyword, record)
+        return columnar.finalize()
+
+    def __len__(self):
+        return len(self.record_row)
+
+    def __contains__(self, keyword):
+        return keyword == 'DATES' or keyword in self.keywords
+
+    def __repr__(self):
+        return f"ColumnarSchedule({len(self)} records, {len(self.keywords)} keywords, {len(self.dates)} dates, {len(self.tokens)} distinct tokens)"
+
+    @property
+    def nbytes(self):
+        return self.record_keyword.nbytes + self.record_row.nbytes + self.date_positions.nbytes \
+            + sum(columns.nbytes for columns in self.keywords.values())
+
+    def records(self, keyword):
+        """
+        the records of the `keyword` as a 2D numpy array of strings (None where the record is shorter), one row per record.
+        """
+        columns = self.keywords[keyword]
+        tokens = np.append(self.tokens, None)  # code -1 picks the trailing None
+        return tokens[columns.codes]
+
+    def record_dates(self, keyword):
+        """
+        the DATES entry (str) in effect for each record of the `keyword`.
+        """
+        dates = np.empty(len(self.dates) + 1, dtype=object)
+        dates[:-1] = self.dates
+        return dates[self.keywords[keyword].date_index]
+
+    def record_datetimes(self, keyword):
+        """
+        the date (datetime64) in effect for each record of the `keyword`, looked up in the `date_table` (NaT if there is no date yet).
+        """
+        return np.append(self.date_table, np.datetime64('NaT', 'ns'))[self.keywords[keyword].date_index]
+
+    def record(self, position):
+        """
+        the record at the `position` (counter) of the schedule, as `{keyword: record}` as `read_data` would store it.
+        """
+        i = position - self.first_position
+        if i < 0 or i >= len(self.record_row):
+            raise KeyError(position)
+        row = int(self.record_row[i])
+        if self.record_keyword[i] < 0:
+            return {'DATES': self.dates[row]}
+        keyword = self.keyword_names[self.record_keyword[i]]
+        columns = self.keywords[keyword]
+        kind = columns.kind[row]
+        if kind == _NONE:
+            return {keyword: None}
+        codes = columns.codes[row]
+        codes = codes[codes >= 0]
+        if kind == _STRING:
+            return {keyword: self.tokens[codes[0]]}
+        return {keyword: self.tokens[codes].tolist()}
+
+    @property
+    def view(self):
+        """
+        read-only dictionary-like view `{i: {keyword: [records]}}` for code expecting the output of `read_data`.
+        """
+        return ScheduleView(self)
+
+    def to_dict(self):
+        """
+        rebuild the full `{i: {keyword: [records]}}` dictionary.
+        """
+        return {position: self.record(position) for position in self.view}
+
+
+class ScheduleView(Mapping):
+    """
+    read-only `{i: {keyword: [records]}}` view over a ColumnarSchedule, records are rebuilt on access.
+    """
+    def __init__(self, columnar):
+        self._columnar = columnar
+
+    def __getitem__(self, position):
+        return self._columnar.record(position)
+
+    def __iter__(self):
+        return iter(range(self._columnar.first_position, self._columnar.first_position + len(self._columnar)))
+
+    def __len__(self):
+        return len(self._columnar)
+
+    def __contains__(self, position):
+        return type(position) is int and 0 <= position - self._columnar.first_position < len(self._columnar)
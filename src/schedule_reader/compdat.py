@@ -1,26 +1,47 @@
 import pandas as pd
 import numpy as np
 
-from .dates import parse_dates
 from .schedule_keywords import extract_keyword
 from .welspec import extract_welspecs, extract_welspecl
+from .property_keywords import get_dimens
 
 
-def _defaultIJ(well, date, IJ, welspec_table):
+def _defaultIJ(compdat_table, welspec_table):
     """
-    Helper function to find the I and J coordinates for a well, from its WELSPECS definition.
+    Helper function to find the I and J coordinates for the wells, from its WELSPECS definition.
     Used when the I or J coordinates are defaulted in the COMPDAT keyword.
+    Every defaulted row is resolved at once, by an as-of join on well and date: the last WELSPECS of the well up to the COMPDAT date.
 
     Params:
-        well: str
-        date: str or datetime
-        IJ: str 'I' 'J'
-            the coordinate to be extracted
-        welspecs_table: pandas.DataFrame
+        compdat_table: pandas.DataFrame
+            A DataFrame prepared by `extract_compdat` or `extract_compdatl`, with 0 in the defaulted 'I' or 'J'. It is updated in place.
+        welspec_table: pandas.DataFrame
             A DataFrame containing at least the 'date', 'well', 'I' and 'J' data from the WELSPEC keyword.
             This DataFrame is prepared by the function `extract_welspecs`. It is automatically called by the function `extract_compdat` if required.
     """
-    return welspec_table[(welspec_table['well'] == well) & (welspec_table['date'] <= date), IJ].iloc[-1]
+    defaulted = ((compdat_table['I'] == 0) | (compdat_table['J'] == 0)).to_numpy()
+    if not defaulted.any() or len(welspec_table) == 0:
+        return compdat_table
+    rows = np.flatnonzero(defaulted)
+    left = pd.DataFrame({'date': compdat_table['date'].to_numpy()[rows],
+                         'well': compdat_table['well'].astype(str).to_numpy()[rows],
+                         'row': rows})
+    right = pd.DataFrame({'date': welspec_table['date'].to_numpy(),
+                          'well': welspec_table['well'].astype(str).to_numpy(),
+                          'welspec_I': welspec_table['I'].to_numpy(),
+                          'welspec_J': welspec_table['J'].to_numpy()})
+    # stable sort, so the last WELSPECS of the same date wins
+    left = left.sort_values('date', kind='mergesort')
+    right = right.sort_values('date', kind='mergesort')
+    merged = pd.merge_asof(left, right, on='date', by='well', direction='backward')
+    merged = merged[merged['welspec_I'].notna()]
+    rows = merged['row'].to_numpy()
+    for IJ in ('I', 'J'):
+        values = compdat_table[IJ].to_numpy().copy()
+        resolve = values[rows] == 0
+        values[rows[resolve]] = merged['welspec_' + IJ].to_numpy()[resolve].astype(values.dtype)
+        compdat_table[IJ] = values
+    return compdat_table
 
 
 def extract_compdat(schedule_dict):
@@ -35,27 +56,10 @@ def extract_compdat(schedule_dict):
     Return:
         pandas.DataFrame
     """
-    compdat_columns = ['date', 'well', 'I', 'J', 'K_up', 'K_low', 'status', 'saturation table', 'transimissibility factor', 'well bore diameter', 'Kh', 'skin', 'D-factor', 'direction', 'pressure equivalent radius']
-    compdat_table = extract_keyword(schedule_dict, 'COMPDAT', compdat_columns)  # {}
+    compdat_table = extract_keyword(schedule_dict, 'COMPDAT')  # columns and types from schemas.SCHEMAS
     if len(compdat_table) > 0:
-        compdat_table['date'] = parse_dates(compdat_table['date'].to_list())  # to parse dates exactly as stated by DATES eclipse format
-        compdat_table['well'] = [well.strip("'") for well in compdat_table['well']]
-        compdat_table['well'] = compdat_table['well'].astype('category', errors='ignore')
-        compdat_table.replace('1*', np.nan, inplace=True)
-        compdat_table.replace("'1*'", np.nan, inplace=True)
-        to_int = ['I', 'J', 'K_up', 'K_low']
-        compdat_table[to_int] = compdat_table[to_int].fillna('0').astype(int, errors='ignore')
         if 0 in compdat_table['I'].values or 0 in compdat_table['J'].values:
-            welspecs_table = extract_welspecs(schedule_dict)
-            if 0 in compdat_table['I'].values:
-                compdat_table['I'] = [compdat_table['I'].iloc[r] if compdat_table['I'].iloc[r] > 0 else _defaultIJ(compdat_table['date'].iloc[r], compdat_table['date'].iloc[r], 'I', welspecs_table) for r in len(compdat_table)]
-            if 0 in compdat_table['J'].values:
-                compdat_table['J'] = [compdat_table['I'].iloc[r] if compdat_table['I'].iloc[r] > 0 else _defaultIJ(compdat_table['date'].iloc[r], compdat_table['date'].iloc[r], 'J', welspecs_table) for r in len(compdat_table)]
-        to_float = ['transimissibility factor', 'well bore diameter', 'Kh', 'skin', 'D-factor', 'pressure equivalent radius']
-        compdat_table[to_float] = compdat_table[to_float].astype(float, errors='ignore')
-        compdat_table['status'] = compdat_table['status'].fillna('OPEN').astype('category', errors='ignore')
-        compdat_table['skin'].fillna(0.0, inplace=True)
-        compdat_table['direction'] = compdat_table['direction'].fillna('Z').astype('category', errors='ignore')
+            _defaultIJ(compdat_table, extract_welspecs(schedule_dict))
     return compdat_table
 
 
@@ -71,27 +75,10 @@ def extract_compdatl(schedule_dict):
     Return:
         pandas.DataFrame
     """
-    compdatl_columns = ['date', 'well', 'local grid', 'I', 'J', 'K_up', 'K_low', 'status', 'saturation table', 'transimissibility factor', 'well bore diameter', 'Kh', 'skin', 'D-factor', 'direction', 'pressure equivalent radius']
-    compdatl_table = extract_keyword(schedule_dict, 'COMPDATL', compdatl_columns)  # {}
+    compdatl_table = extract_keyword(schedule_dict, 'COMPDATL')  # columns and types from schemas.SCHEMAS
     if len(compdatl_table) > 0:
-        compdatl_table['date'] = parse_dates(compdatl_table['date'].to_list())  # to parse dates exactly as stated by DATES eclipse format
-        compdatl_table['well'] = [well.strip("'") for well in compdatl_table['well']]
-        compdatl_table['well'] = compdatl_table['well'].astype('category', errors='ignore')
-        compdatl_table.replace('1*', np.nan, inplace=True)
-        compdatl_table.replace("'1*'", np.nan, inplace=True)
-        to_int = ['I', 'J', 'K_up', 'K_low']
-        compdatl_table[to_int] = compdatl_table[to_int].fillna('0').astype(int, errors='ignore')
         if 0 in compdatl_table['I'].values or 0 in compdatl_table['J'].values:
-            welspecl_table = extract_welspecl(schedule_dict)
-            if 0 in compdatl_table['I'].values:
-                compdatl_table['I'] = [compdatl_table['I'].iloc[r] if compdatl_table['I'].iloc[r] > 0 else _defaultIJ(compdatl_table['date'].iloc[r], compdatl_table['date'].iloc[r], 'I', welspecl_table) for r in len(compdatl_table)]
-            if 0 in compdatl_table['J'].values:
-                compdatl_table['J'] = [compdatl_table['I'].iloc[r] if compdatl_table['I'].iloc[r] > 0 else _defaultIJ(compdatl_table['date'].iloc[r], compdatl_table['date'].iloc[r], 'J', welspecl_table) for r in len(compdatl_table)]
-        to_float = ['transimissibility factor', 'well bore diameter', 'Kh', 'skin', 'D-factor', 'pressure equivalent radius']
-        compdatl_table[to_float] = compdatl_table[to_float].astype(float, errors='ignore')
-        compdatl_table['status'] = compdatl_table['status'].fillna('OPEN').astype('category', errors='ignore')
-        compdatl_table['skin'].fillna(0.0, inplace=True)
-        compdatl_table['direction'] = compdatl_table['direction'].fillna('Z').astype('category', errors='ignore')
+            _defaultIJ(compdatl_table, extract_welspecl(schedule_dict))
     return compdatl_table
 
 
@@ -121,4 +108,60 @@ def extract_compdat2(schedule_dict):
     elif len(compdatl) > 0:
         return compdatl
     else:
-        return compdat
\ No newline at end of file
+        return compdat
+
+
+def expand_connections(compdat_table, dimens=None):
+    """
+    Expand the K_up..K_low range of every completion into one row per connected cell, for all the rows at once.
+    If the `dimens` of the grid are provided, the flat (0-based) index of the cell in the property arrays is added in the column 'cell':
+    (I - 1) + (J - 1) * NX + (K - 1) * NX * NY, so the properties of the connections are an integer gather like `poro[connections['cell']]`.
+
+    Params:
+        compdat_table: pandas.DataFrame
+            A DataFrame prepared by `extract_compdat`, `extract_compdatl` or `extract_compdat2`.
+        dimens: tuple (NX, NY, NZ) or str, optional
+            as returned by `get_dimens`, or the path to the .DATA file to read them from.
+
+    Return:
+        pandas.DataFrame with a 'K' column instead of 'K_up' and 'K_low', indexed as the `compdat_table` (repeated for each cell).
+        The 'cell' is -1 for the connections outside the grid and for the connections in a local grid.
+    """
+    if isinstance(dimens, str):
+        dimens = get_dimens(dimens)
+    K_up = compdat_table['K_up'].to_numpy(dtype=np.int64)
+    K_low = compdat_table['K_low'].to_numpy(dtype=np.int64)
+    K_low = np.where(K_low < K_up, K_up, K_low)  # a defaulted or reversed K_low connects only K_up
+    lengths = K_low - K_up + 1
+    rows = np.repeat(np.arange(len(compdat_table)), lengths)
+    K = np.repeat(K_up - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+    connections = compdat_table.iloc[rows].drop(columns=['K_up', 'K_low'])
+    connections.insert(connections.columns.get_loc('J') + 1, 'K', K)
+    if dimens is not None and dimens[0] is not None and dimens[1] is not None and dimens[2] is not None:
+        nx, ny, nz = (int(each) for each in dimens)
+        I = connections['I'].to_numpy(dtype=np.int64)
+        J = connections['J'].to_numpy(dtype=np.int64)
+        cell = (I - 1) + (J - 1) * nx + (K - 1) * nx * ny
+        outside = (I < 1) | (I > nx) | (J < 1) | (J > ny) | (K < 1) | (K > nz)
+        if 'local grid' in connections:
+            outside |= connections['local grid'].notna().to_numpy()
+        connections['cell'] = np.where(outside, -1, cell)
+    return connections
+
+
+def extract_connections(schedule_dict, dimens=None):
+    """
+    Extract COMPDAT, COMPDATL and COMPDATM from the schedule dictionary and return a DataFrame with one row for each connected cell by DATES.
+    See `expand_connections`.
+
+    Params:
+        schedule_dict: dict
+            shedule dictionary prepared by the .data_reader.read_data function
+        dimens: tuple (NX, NY, NZ) or str, optional
+            to compute the flat index of the cells
+
+    Return:
+        pandas.DataFrame
+    """
+    return expand_connections(extract_compdat2(schedule_dict), dimens)
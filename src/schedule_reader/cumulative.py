@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+from .all_keywords import extract_all
+from .well_matrix import WellMatrices, build_matrices, _cells, _last_events, _ffill, _CONTROLS
+
+__all__ = ['integrate_rates', 'cumulative_volumes']
+
+# the injected phase of each injector type of WCONINJH
+_INJECTED = {'WATER': 'WATER injected', 'WAT': 'WATER injected', 'GAS': 'GAS injected', 'OIL': 'OIL injected'}
+
+
+def _increments(rates, dates):
+    """
+    the volume of each report step: the rate in effect from a report date multiplied by the days until the next one.
+    The rates after the last report date are not integrated. NaN rates (no record of the well) count as zero.
+    """
+    days = np.diff(np.asarray(dates, dtype='datetime64[ns]')) / np.timedelta64(1, 'D')
+    increments = np.zeros(rates.shape, dtype=rates.dtype)
+    np.multiply(np.nan_to_num(rates[:, :-1]), days, out=increments[:, :-1])
+    return increments
+
+
+def _accumulate(increments):
+    """
+    the cumulative of the increments before each report date, zero at the first date.
+    """
+    cumulative = np.zeros(increments.shape, dtype=increments.dtype)
+    np.cumsum(increments[:, :-1], axis=1, out=cumulative[:, 1:])
+    return cumulative
+
+
+def integrate_rates(rates, dates):
+    """
+    integrates rates (volume per day) in time, along the report dates.
+
+    Params:
+        rates: numpy.ndarray
+            (wells, dates) array of rates, each one in effect from its report date until the next one
+            (as the matrices of `build_matrices`, with the SHUT and STOP already zeroed)
+        dates: array of datetime64
+            the report dates
+
+    Return:
+        numpy.ndarray (wells, dates), the cumulative volume at every report date
+    """
+    return _accumulate(_increments(np.asarray(rates), dates))
+
+
+def _well_groups(welspecs, wells, dates):
+    """
+    the (wells, dates) codes of the group of each well in effect at each report date, from WELSPECS, and the group names.
+    """
+    names, codes = np.unique(welspecs['group'].astype(str).to_numpy(), return_inverse=True)
+    rows = _ffill(_last_events(_cells(welspecs, 'well', wells, dates), welspecs.index.to_numpy(), len(wells) * len(dates)), len(dates))
+    return np.append(codes, len(names))[rows], np.append(names, '')
+
+
+def cumulative_volumes(schedule_dict, by='well', wells=None, dtype=np.float64):
+    """
+    cumulative produced (WCONHIST) and injected (WCONINJH) volumes at every report date of the schedule.
+    The rates are integrated between consecutive DATES, the steps when the well is SHUT or STOP (by its status or WELOPEN) count as zero,
+    and so do the steps after the well is switched to another control keyword (i.e.: from WCONHIST to WCONPROD).
+    Every phase is computed for all the wells at once, on the arrays of `well_matrices`.
+
+    Params:
+        schedule_dict: dict, ScheduleDict or ColumnarSchedule
+            shedule dictionary prepared by the .data_reader.read_data function
+        by: str
+            'well', 'group' (the group of the well in WELSPECS at each report date) or 'field'
+        wells: list of str, optional
+            only these wells, by default all the wells of WCONHIST and WCONINJH
+        dtype: numpy dtype
+
+    Return:
+        WellMatrices with the columns 'OIL', 'WATER', 'GAS' and the injected phases ('WATER injected', 'GAS injected'),
+        one row for each well, group or the field.
+
+    Example:
+        cumulative = cumulative_volumes(read_data('MODEL.DATA'), by='group')
+        cumulative.to_dataframe('OIL')
+    """
+    if by not in ('well', 'group', 'field'):
+        raise ValueError(f"by must be 'well', 'group' or 'field', received {by}")
+    tables = extract_all(schedule_dict, list(_CONTROLS) + ['WELOPEN', 'DATES'] + (['WELSPECS'] if by == 'group' else []))
+    dates = tables['DATES'].to_numpy(dtype='datetime64[ns]')
+    dates = np.unique(dates[~np.isnat(dates)])
+    if wells is None:
+        wells = np.sort(pd.unique(np.concatenate([tables[keyword]['well'].astype(str).to_numpy() for keyword in ('WCONHIST', 'WCONINJH')
+                                                  if keyword in tables] + [np.zeros(0, dtype=object)])))
+    wells = np.asarray(wells, dtype=object)
+    welopen = tables.get('WELOPEN')
+    # the history rates of a well end at its next record of another control keyword
+    ends = {keyword: [tables[control] for control in _CONTROLS if control in tables and control != keyword] for keyword in _CONTROLS}
+
+    increments = {}
+    if 'WCONHIST' in tables:
+        history = build_matrices(tables['WCONHIST'], wells, dates, ['OIL rate', 'WATER rate', 'GAS rate'], welopen, True, dtype, 'WCONHIST',
+                                 ends['WCONHIST'])
+        for phase in ('OIL', 'WATER', 'GAS'):
+            increments[phase] = _increments(history[phase + ' rate'], dates)
+    if 'WCONINJH' in tables:
+        injection = tables['WCONINJH']
+        types, names = pd.factorize(injection['injector type'].astype(str).str.strip().str.upper())
+        injection = injection.assign(_type=types.astype(np.float64))
+        history = build_matrices(injection, wells, dates, ['injection rate', '_type'], welopen, True, dtype, 'WCONINJH',
+                                 ends['WCONINJH'])
+        volumes = _increments(history['injection rate'], dates)
+        for code, name in enumerate(names):
+            phase = _INJECTED.get(name, name + ' injected')
+            increments[phase] = increments.get(phase, 0) + np.where(history['_type'] == code, volumes, 0)
+    if len(increments) == 0:
+        increments['OIL'] = np.zeros((len(wells), len(dates)), dtype=dtype)
+
+    rows = wells
+    if by == 'group':
+        if 'WELSPECS' not in tables:
+            raise ValueError("the groups of the wells are not defined, there is no WELSPECS in the schedule")
+        groups, rows = _well_groups(tables['WELSPECS'], wells, dates)
+        # the increments of every well added to its group of the same step, for all the steps at once
+        cells = (groups * len(dates) + np.arange(len(dates))).ravel()
+        for phase in increments:
+            increments[phase] = np.bincount(cells, weights=increments[phase].ravel(), minlength=len(rows) * len(dates)
+                                            ).reshape(len(rows), len(dates)).astype(dtype, copy=False)
+        if not (groups == len(rows) - 1).any():
+            rows = rows[:-1]  # every well has a group, the row of the wells without group is dropped
+            increments = {phase: values[:-1] for phase, values in increments.items()}
+    elif by == 'field':
+        rows = np.array(['FIELD'], dtype=object)
+        increments = {phase: values.sum(axis=0, keepdims=True) for phase, values in increments.items()}
+
+    values = {phase: _accumulate(increments[phase]) for phase in increments}
+    defined = np.ones((len(rows), len(dates)), dtype=bool)
+    return WellMatrices('CUMULATIVE', rows, dates, values, defined, np.zeros((len(rows), len(dates)), dtype=bool))
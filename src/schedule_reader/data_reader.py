@@ -1,9 +1,22 @@
+import gc
+from contextlib import contextmanager
 import pandas as pd
 from .counter import Counter
-from os.path import exists
+from .parse_cache import load_parse_cache, save_parse_cache
+from .columnar import ColumnarSchedule
+from .keyword_table import keyword_rule
+from .dates import parse_date, to_datetime, date_table
+import numpy as np
+import io
+from array import array
+from itertools import islice
+from os.path import exists, getsize
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 def read_data(filepath:str, *, encoding: str='cp1252', verbose: bool=False, 
-              start_date: str=None, paths: dict={}, folder: str=None, counter: Counter=None, main=True):
+              start_date: str=None, paths: dict=None, folder: str=None, counter: Counter=None, main=True,
+              cache_dir: str=None, visited: list=None, columnar: bool=False, workers: int=None, split_size: int=None,
+              keywords=None, start=None, end=None):
     """
     reads the .DATA file, look for schedule section and returns a dictionary of keywords and its records on order of appereance.
 
@@ -23,44 +36,92 @@ def read_data(filepath:str, *, encoding: str='cp1252', verbose: bool=False,
             set it to False to skip printing messages.
         counter: an instance of the Counter class, should not be provided by the user!
             internal counter provided by the same funcion recursive calls when reading include files.
+        cache_dir: str, optional
+            folder where the parsed schedule is stored in binary form. The next call with the same file returns the cached
+            schedule, unless any file in the INCLUDE tree (path, size, mtime and content hash) has changed.
+        visited: list, should not be provided by the user!
+            internal list where the path of every file read is appended, to build the cache key.
+        columnar: bool
+            set it to True to return a ColumnarSchedule, that stores every keyword as contiguous columns of token ids,
+            instead of the dictionary. Its `.view` property provides the dictionary interface for older code.
+        workers: int, optional
+            number of processes to read the INCLUDE files in parallel. The main file is read first, then every include file
+            (and the includes inside them) is read in a pool of processes and the records are put together in order of the deck.
+            By default the include files are read one after another.
+        split_size: int, optional
+            only with `workers`, a schedule file (not .DATA) bigger than `split_size` bytes is cut at its DATES keywords into
+            chunks of about `split_size` bytes, and each chunk is read by a different worker. The output is the same as reading the file at once.
+        keywords: set of str, optional
+            read only these keywords (DATES are always read). The data of any other keyword is skipped up to its closing /
+            without being split in items or stored.
+        start: str or datetime, optional
+            read only the records from this date. The keywords before it are skipped like the not requested `keywords`,
+            only the DATES are followed. The START date is "1 'JAN' 2000" format or anything understood by pandas.
+        end: str or datetime, optional
+            stop reading as soon as a DATES after this date is found, the rest of the file and any later include file are not opened.
 
     Return:
-        dict of dicts of keywords and their records
+        ScheduleDict, a dict of dicts of keywords and their records
             {i: {keyword: [records]}}
+            with the parsed `date_table` and the `timesteps` (index of the DATES in effect) of every record
+        or ColumnarSchedule if `columnar` is True
     """
-    def _keyword():
-        return datafile[line].split()[0].upper()
-    def _keyword_end():
-        if line >= len(datafile):
-            return True
-        return datafile[line].strip().startswith('/')
-    def _comment_line():
-        return datafile[line].strip().startswith('--')
-    def _empty_line():
-        return len(datafile[line].strip()) == 0
-    def _line_data():
-        if '/' in  datafile[line]:
-            _cut = datafile[line].index('/')
-        elif '--' in datafile[line]:
-            _cut = datafile[line].index('--')
-        else:
-            _cut = len(datafile[line])
-        return datafile[line][:_cut].strip()
-    def _last_date():
-        extracted_dates = [k_ for k_ in extracted 
-                           if list(extracted[k_].keys())[0] == 'DATES' and extracted[k_]['DATES'] is not False]
-        if len(extracted_dates) == 0:
-            return start_date
-        else:
-            return extracted[max(extracted_dates)]['DATES']
-    skip0_keywords = ('ECHO', 'NOECHO', 'SKIPREST', 'SKIP', 'SKIP100', 'SKIP300', 'ENDSKIP', 'RPTONLY', 'RPTONLYO')
-    skip1_keywords = ('NEXT', 'NEXTSTEP', 'LIFTOPT', 'GCONTOL', 'GUIDERAT', 'WLIMTOL', 'RPTSCHED', 'FILEUNIT')
-    skip3_keywords = ('TUNING')
-        
+    if paths is None:
+        paths = {}
+    keywords = _wanted_keywords(keywords)
+    if columnar and main and cache_dir is None and (workers is None or workers <= 1):
+        # the records are streamed into the columns, the dictionary is never built
+        columns = ColumnarSchedule()
+        for position, (date, keyword, record, source, line_no) in enumerate(
+                iter_schedule(filepath, encoding=encoding, verbose=verbose, start_date=start_date, paths=paths, folder=folder, keywords=keywords, start=start, end=end)):
+            columns.append(position, keyword, record)
+        return columns.finalize()
+    if columnar:
+        return ColumnarSchedule.from_dict(
+            read_data(filepath, encoding=encoding, verbose=verbose, start_date=start_date, paths=paths,
+                      folder=folder, counter=counter, main=main, cache_dir=cache_dir, visited=visited, workers=workers, split_size=split_size, keywords=keywords, start=start, end=end))
 
     # check file exists
     if not exists(filepath):
         raise ValueError(f"The file doesn't exists: {filepath}")
+
+    # look for a previous parse of the whole INCLUDE tree
+    if main and cache_dir is not None:
+        cache_options = {'encoding': encoding, 'start_date': start_date, 'paths': dict(paths), 'folder': folder,
+                         'keywords': None if keywords is None else sorted(keywords), 'start': start, 'end': end}
+        extracted = load_parse_cache(filepath, cache_dir, cache_options, verbose=verbose)
+        if extracted is not None:
+            return extracted
+        visited = []
+        extracted = read_data(filepath, encoding=encoding, verbose=verbose, start_date=start_date, paths=paths,
+                              folder=folder, counter=counter, main=main, visited=visited, workers=workers, split_size=split_size, keywords=keywords, start=start, end=end)
+        save_parse_cache(filepath, cache_dir, visited, extracted, cache_options, verbose=verbose)
+        return extracted
+
+    with _gc_paused():
+        return _read_schedule(filepath, encoding, verbose, start_date, paths, folder, counter, main, visited, workers, split_size,
+                              keywords, start, end)
+
+
+@contextmanager
+def _gc_paused():
+    """
+    the records don't have reference cycles, the garbage collector is paused while millions of them are created.
+    At the end it is enabled again, if it was enabled before.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _read_schedule(filepath, encoding, verbose, start_date, paths, folder, counter, main, visited, workers, split_size, keywords, start, end):
+    """
+    reads the schedule section of the file and its include files into a ScheduleDict, see `read_data`.
+    """
     filepath = filepath.replace('\\', '/')
     if folder is None:
         folder = '/'.join(filepath.split('/')[:-1]) + '/'
@@ -71,13 +132,6 @@ def read_data(filepath:str, *, encoding: str='cp1252', verbose: bool=False,
     else:
         verbose = bool(verbose)
 
-    # read and clean the main file
-    if verbose:
-        print('Reading the file:', filepath)
-    with open(filepath, 'r', encoding=encoding) as f:
-        datafile = f.readlines()
-    datafile = [line.strip() for line in datafile]
-
     # initialize the counter
     if counter is None:
         counter = Counter()
@@ -85,622 +139,666 @@ def read_data(filepath:str, *, encoding: str='cp1252', verbose: bool=False,
         keywords_before = counter.curr()
         print(f"{counter.curr()} keywords found until now")
 
-    # if the file is the .DATA, look for START and PATHS keywords
-    if filepath.upper().endswith('.DATA'):
-
-
-        # looks for START
-        if main and start_date is None and 'START' in datafile:
-            start_date = datafile[datafile.index('START') + 1].replace('/', '').strip()
-            if verbose:
-                print(f"Found START date: {start_date}")
-
-
-        # looks for PATHS and update dictionary if PATHS found
-        if main and len(paths) == 0 and 'PATHS' in datafile:
-            line = datafile.index('PATHS') + 1
-            while not _keyword_end():
-                paths.update({datafile[line].strip().strip('/').split()[0].strip("'"): datafile[line].strip().strip('/').split()[1].strip("'")})
-                line += 1
-            if verbose:
-                print('Found PATHS keyword:\n', "\n   ".join([k + ":" + v for k, v in paths.items()]))
-
-
-        # jumpt to SCHEDULE keyword line
-        schedule_line = None
-        if main and 'SCHEDULE' in datafile:
-            schedule_line = datafile.index('SCHEDULE')
-        else:
-            schedule_line = [line.split()[0].upper().startswith('SCHEDULE') if len(line) > 0 else False for line in datafile]
-            schedule_line = schedule_line.index(True) if True in schedule_line else None
-        if schedule_line is None:
-            schedule_line = 0  # read the entire file
-            # raise ValueError("'SCHEDULE' keyword not found in this DATA file.")
-        if verbose:
-            if main and schedule_line == 0:
-                print(f"SCHEDULE keyword not found in this DATA, will proceed to read everything line by line... it could take some time...")
-            else:
-                print(f"found SCHEDULE keyword in line {schedule_line}")
+    parallel = main and workers is not None and workers > 1
+    if parallel and _splittable(filepath, split_size):
+        # the whole file will be cut at DATES keywords and read by the workers
+        datafile, schedule_line = None, 0
     else:
-        schedule_line = 0
+        # read and clean the main file
+        if verbose:
+            print('Reading the file:', filepath)
+        datafile = _read_lines(filepath, encoding)
+        if visited is not None:
+            visited.append(filepath)
 
+        # if the file is the .DATA, look for START and PATHS keywords and the SCHEDULE section
+        schedule_line, start_date = _schedule_section(datafile, filepath, main, start_date, paths, verbose)
 
     # intialize the extracted dictionary, where every read keyword will be stored
     if not main:
-        extracted = {}
+        extracted = ScheduleDict()
     elif start_date is None:  # is main file
         # empty dictionary, START date by default and can be updated at the end of the loop
-        extracted = {counter(): {'DATES': '01 JAN 1900'}}
+        extracted = ScheduleDict({counter(): {'DATES': '01 JAN 1900'}})
         start_date = '01 JAN 1900'
         if verbose:
             print(f"START keyword not found, will start dates from default value '01 JAN 1900'")
     else:  # is main file and start_date is not None
         # START date is the first keyword in the dictionary
-        extracted = {counter(): {'DATES': start_date}}
+        extracted = ScheduleDict({counter(): {'DATES': start_date}})
 
-    
-    # start reading the file, from the schedule_line if found
-    line = schedule_line
-    skip_ = False
-    while line < len(datafile):  # read every line until the end
+    # the dates window, the START date is kept only if it is inside the window
+    state = _ReadState(start_date, start, end)
+    if main and (state.skipping or state.finished):
+        extracted = ScheduleDict()
+        counter.prev()
+    if state.finished:
+        return extracted
 
+    # read the include files in a pool of processes, and put them together in order
+    if parallel:
+        return _read_parallel(extracted, datafile, schedule_line, filepath, paths, folder, counter, encoding, workers, split_size, keywords, state, visited, verbose)
 
-        # skip lines as indicated by SKIP keywords
-        if skip_ and not datafile[line].upper().startswith('ENDSKIP'):
-            line += 1
-        elif skip_ and datafile[line].upper().startswith('ENDSKIP'):
-            line += 1
-            skip_ = False
-
-
-        # skip empty and comment lines
-        if _empty_line() or _comment_line():
-            line += 1
-
-
-        # if a DATES is found
-        elif datafile[line].upper().startswith('DATES'):
-            line += 1
-            if verbose:
-                print("found DATES keyword")
-                _counter0 = counter.curr() + 1
-
-            # read all the dates within DATES until the closing /
-            while not _keyword_end():
-                # skip empty and commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
-
-                extracted[counter()] = {'DATES': str(_line_data())}
-                line += 1
-            line += 1  # keyword end line
-            if verbose:
-                print(f" {' until '.join(set([extracted[_counter0]['DATES'],  extracted[counter.curr()]['DATES']]))}")
-
+    
+    # start reading the file, from the schedule_line if found, and every include file inside it
+    next_position = counter.next
+    dates, timesteps = _initial_timesteps(extracted)
+    timestep = len(dates) - 1
+    for date, keyword, record, source, line_no in _iter_records(filepath, islice(datafile, schedule_line, None), schedule_line,
+                                                                encoding, folder, paths, state, keywords, visited, verbose):
+        if keyword == 'DATES':
+            timestep = len(dates)
+            dates.append(record)
+        timesteps.append(timestep)
+        extracted[next_position()] = {keyword: record}
+    extracted._set_dates(dates, timesteps)
 
-        # if COMPDAT is found
-        elif datafile[line].upper().startswith('COMPDAT'):
-            line += 1
-            key_columns = 14
-            if verbose:
-                print("found COMPDAT keyword")
-                _counter0 = counter.curr() + 1
-
-            # read all the COMPDAT lines until the closing /
-            while not _keyword_end():
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
+    if verbose:
+        print(f"closing this file, {counter.curr() - keywords_before} keywords found here.")
+        print()
 
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword COMPDAT in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                compdat_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(compdat_line) < key_columns:
-                    compdat_line_expanded = []
-                    for each in compdat_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            compdat_line_expanded = compdat_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            compdat_line_expanded.append(each)
-                    compdat_line_expanded = compdat_line_expanded + (['1*'] * (key_columns - len(compdat_line_expanded)))
-                    compdat_line = compdat_line_expanded
-                extracted[counter()] = {'COMPDAT': compdat_line}
-
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['COMPDAT'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+    return extracted
 
 
-        # if COMPDATL or COMPDATM is found
-        elif datafile[line].upper().startswith('COMPDATL') or datafile[line].upper().startswith('COMPDATM'):
-            line += 1
-            key_columns = 15
-            if verbose:
-                print("found COMPDATL keyword")
-                _counter0 = counter.curr() + 1
-
-            # read all the COMPDATL lines until the closing /
-            while not _keyword_end():
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
+def iter_schedule(filepath:str, *, encoding: str='cp1252', verbose: bool=False,
+                  start_date: str=None, paths: dict=None, folder: str=None, keywords=None, start=None, end=None):
+    """
+    reads the .DATA file or schedule include file and yields its records one by one, as they are read from the file and its includes.
+    Unlike `read_data`, nothing is kept in memory: the include files are streamed line by line and
+    the records can be filtered, aggregated or written out before the whole deck is read.
 
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword COMPDATL in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                compdatl_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(compdatl_line) < key_columns:
-                    compdatl_line_expanded = []
-                    for each in compdatl_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            compdatl_line_expanded = compdatl_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            compdatl_line_expanded.append(each)
-                    compdatl_line_expanded = compdatl_line_expanded + (['1*'] * (key_columns - len(compdatl_line_expanded)))
-                    compdatl_line = compdatl_line_expanded
-                extracted[counter()] = {'COMPDATL': compdatl_line}
-
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['COMPDATL'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+    Params:
+        filepath: str
+            the path to the .DATA or schedule include file
+        encoding: str
+            The enconding format of input text files.
+        verbose: bool
+            set it to False to skip printing messages.
+        start_date: str, optional
+            the start date of the simulation
+            if None, it will be read from keyword START or set by default to 01 JAN 1900
+        paths: dict {str: str}, optional
+            dictionary of the paths described by PATHS keyword. If the .DATA is provided this data is automatically extracted.
+        folder: str, optional
+            tha absolute path to the folder where the .DATA file is located.
+        keywords: set of str, optional
+            yield only these keywords (DATES are always yielded), the data of any other keyword is skipped.
+        start: str or datetime, optional
+            yield only the records from this date, the keywords before it are skipped.
+        end: str or datetime, optional
+            stop as soon as a DATES after this date is found, the rest of the files are not read.
+
+    Yields:
+        tuple (date, keyword, record, source_file, line_no)
+            date is the DATES in effect for the record, the record is stored as in `read_data`
+            and line_no is the line of the record in the source_file (None for the START date)
+    """
+    if paths is None:
+        paths = {}
+    keywords = _wanted_keywords(keywords)
+    if not exists(filepath):
+        raise ValueError(f"The file doesn't exists: {filepath}")
+    filepath = filepath.replace('\\', '/')
+    if folder is None:
+        folder = '/'.join(filepath.split('/')[:-1]) + '/'
 
-    
-        # if WELSPECS is found
-        elif datafile[line].upper().startswith('WELSPECS'):
-            line += 1
-            key_columns = 17
-            if verbose:
-                print("found WELSPECS keyword")
-                _counter0 = counter.curr() + 1
+    # the .DATA is read at once to look for START, PATHS and SCHEDULE, the include files are streamed
+    datafile, schedule_line = None, 0
+    if filepath.upper().endswith('.DATA'):
+        datafile = _read_lines(filepath, encoding)
+        schedule_line, start_date = _schedule_section(datafile, filepath, True, start_date, paths, verbose)
+    if start_date is None:
+        start_date = '01 JAN 1900'
+    state = _ReadState(start_date, start, end)
+    if state.finished:
+        return
+    if not state.skipping:
+        yield start_date, 'DATES', start_date, filepath, None
 
-            while not _keyword_end():
+    yield from _iter_file(filepath, encoding, folder, paths, state, keywords, datafile, schedule_line, verbose=verbose)
 
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
 
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword WELSPECS in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                welspecs_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(welspecs_line) < key_columns:
-                    welspecs_line_expanded = []
-                    for each in welspecs_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            welspecs_line_expanded = welspecs_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            welspecs_line_expanded.append(each)
-                    welspecs_line_expanded = welspecs_line_expanded + (['1*'] * (key_columns - len(welspecs_line_expanded)))
-                    welspecs_line = welspecs_line_expanded
-                extracted[counter()] = {'WELSPECS': welspecs_line}
-                
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['WELSPECS'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+def _iter_file(filepath, encoding, folder, paths, state, keywords=None, datafile=None, schedule_line=0, visited=None, verbose=False):
+    """
+    yields the records of the file, following its INCLUDE keywords. The file is streamed unless it is a .DATA or `datafile` is provided.
+    `state` is the _ReadState with the DATES in effect, shared with the files including this one.
+    """
+    if datafile is None:
+        if not exists(filepath):
+            raise ValueError(f"The file doesn't exists: {filepath}")
+        filepath = filepath.replace('\\', '/')
+        if verbose:
+            print('Reading the file:', filepath)
+        if visited is not None:
+            visited.append(filepath)
+        if not filepath.upper().endswith('.DATA'):
+            with open(filepath, 'r', encoding=encoding) as f:
+                yield from _iter_records(filepath, map(str.strip, f), 0, encoding, folder, paths, state, keywords, visited, verbose)
+            return
+        datafile = _read_lines(filepath, encoding)
+        schedule_line, _ = _schedule_section(datafile, filepath, False, None, paths, verbose)
+    yield from _iter_records(filepath, islice(datafile, schedule_line, None), schedule_line, encoding, folder, paths, state, keywords, visited, verbose)
+
+
+def _iter_records(filepath, lines, line, encoding, folder, paths, state, keywords=None, visited=None, verbose=False):
+    for line_no, keyword, record in _scan(lines, line, filepath, verbose, keywords, state):
+        if keyword == 'INCLUDE':
+            yield from _iter_file(_include_path(record, folder, paths), encoding, folder, paths, state, keywords, visited=visited, verbose=verbose)
+            if state.finished:
+                return
+            continue
+        if keyword == 'DATES':
+            state.update(record)
+            if state.finished:
+                if verbose:
+                    print(f"found DATES {record} after the end of the window, stop reading.")
+                return
+        if state.skipping:
+            continue
+        yield state.date, keyword, record, filepath, line_no + 1
+
+
+class ScheduleDict(dict):
+    """
+    the `{i: {keyword: [records]}}` dictionary returned by `read_data`, together with the date table built while reading.
+
+    Every DATES record is parsed once into `date_table`, and every record keeps the integer id of the DATES in effect,
+    so the dates of any keyword are a lookup in the table instead of parsing the same strings again for every row.
+
+    Attributes:
+        dates: list of str
+            every DATES record, in order of appearance
+        date_table: numpy.ndarray of datetime64[ns]
+            the parsed `dates` (NaT if a record can't be parsed)
+        timesteps: numpy.ndarray of int32
+            for every record, in order of the dictionary, the index in `date_table` of the DATES in effect (-1 if no date yet)
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dates = []
+        self.date_table = date_table([])
+        self.timesteps = np.zeros(0, dtype=np.int32)
+        self.first_position = 0
+
+    def _set_dates(self, dates, timesteps):
+        self.dates = dates
+        self.date_table = date_table(dates)
+        self.timesteps = np.frombuffer(timesteps, dtype=np.int32).copy()
+        self.first_position = next(iter(self), 0)
+
+    @property
+    def has_dates(self):
+        """
+        False if records were added or removed after `read_data`, then the timesteps don't match the records anymore.
+        """
+        return len(self.timesteps) == len(self)
+
+    def timestep(self, position):
+        """
+        the index in `date_table` of the DATES in effect for the record at the `position` (counter) of the schedule.
+        """
+        if position not in self:
+            raise KeyError(position)
+        return int(self.timesteps[position - self.first_position])
+
+    def record_dates(self, positions):
+        """
+        the date (datetime64) in effect for each record at the `positions` of the schedule, NaT if there is no date yet.
+        """
+        ids = self.timesteps[np.asarray(positions, dtype=np.int64) - self.first_position]
+        return np.append(self.date_table, np.datetime64('NaT', 'ns'))[ids]
+
+
+class _ReadState(object):
+    """
+    the DATES in effect while reading the files, and the window of dates to read.
+
+    Attributes:
+        date: str
+            the DATES record in effect
+        skipping: bool
+            True while the date is before the `start` of the window
+        finished: bool
+            True once the date is after the `end` of the window
+    """
+    def __init__(self, date, start=None, end=None):
+        self.start = to_datetime(start)
+        self.end = to_datetime(end)
+        self.skipping = False
+        self.finished = False
+        self.update(date)
+
+    def update(self, date):
+        self.date = date
+        if (self.start is None and self.end is None) or date is None:
+            return
+        value = parse_date(date)
+        self.skipping = self.start is not None and value < self.start
+        self.finished = self.end is not None and value > self.end
+
+
+def _read_lines(filepath, encoding):
+    """
+    returns the stripped lines of the file.
+    """
+    with open(filepath, 'r', encoding=encoding) as f:
+        datafile = f.readlines()
+    return [line.strip() for line in datafile]
 
 
-        # if WELSPECL is found
-        elif datafile[line].upper().startswith('WELSPECL'):
-            line += 1
-            key_columns = 18
-            if verbose:
-                print("found WELSPECL keyword")
-                _counter0 = counter.curr() + 1
+def _schedule_section(datafile, filepath, main, start_date, paths, verbose=False):
+    """
+    if the file is a .DATA, looks for the START and PATHS keywords (updating `paths`) and the SCHEDULE keyword.
 
-            while not _keyword_end():
+    Return:
+        tuple (line where to start reading, start date)
+    """
+    if not filepath.upper().endswith('.DATA'):
+        return 0, start_date
 
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
 
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword WELSPECL in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                welspecl_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(welspecl_line) < key_columns:
-                    welspecl_line_expanded = []
-                    for each in welspecs_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            welspecl_line_expanded = welspecl_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            welspecl_line_expanded.append(each)
-                    welspecl_line_expanded = welspecl_line_expanded + (['1*'] * (key_columns - len(welspecl_line_expanded)))
-                    welspecl_line = welspecl_line_expanded
-                extracted[counter()] = {'WELSPECL': welspecl_line}
-                
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['WELSPECL'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+    # looks for START
+    if main and start_date is None and 'START' in datafile:
+        start_date = datafile[datafile.index('START') + 1].replace('/', '').strip()
+        if verbose:
+            print(f"Found START date: {start_date}")
 
 
-        # if WELLSPEC is found
-        elif datafile[line].upper().startswith('WELLSPEC'):
+    # looks for PATHS and update dictionary if PATHS found
+    if main and len(paths) == 0 and 'PATHS' in datafile:
+        line = datafile.index('PATHS') + 1
+        while line < len(datafile) and not datafile[line].startswith('/'):
+            paths.update({datafile[line].strip().strip('/').split()[0].strip("'"): datafile[line].strip().strip('/').split()[1].strip("'")})
             line += 1
-            key_columns = 7
-            if verbose:
-                print("found WELLSPEC keyword")
-                _counter0 = counter.curr() + 1
-
-            while not _keyword_end():
-
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
-
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword WELLSPEC in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                wellspec_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(wellspec_line) < key_columns:
-                    wellspec_line_expanded = []
-                    for each in welspecs_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            wellspec_line_expanded = wellspec_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            wellspec_line_expanded.append(each)
-                    wellspec_line_expanded = wellspec_line_expanded + (['1*'] * (key_columns - len(wellspec_line_expanded)))
-                    wellspec_line = wellspec_line_expanded
-                extracted[counter()] = {'WELLSPEC': wellspec_line}
-                
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['WELLSPEC'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
-
+        if verbose:
+            print('Found PATHS keyword:\n', "\n   ".join([k + ":" + v for k, v in paths.items()]))
 
-        # if WCONPROD is found
-        elif datafile[line].upper().startswith('WCONPROD'):
-            line += 1
-            key_columns = 20
-            if verbose:
-                print("found WCONPROD keyword")
-                _counter0 = counter.curr() + 1
 
-            while not _keyword_end():
+    # jumpt to SCHEDULE keyword line
+    schedule_line = None
+    if main and 'SCHEDULE' in datafile:
+        schedule_line = datafile.index('SCHEDULE')
+    else:
+        schedule_line = [line.split()[0].upper().startswith('SCHEDULE') if len(line) > 0 else False for line in datafile]
+        schedule_line = schedule_line.index(True) if True in schedule_line else None
+    if schedule_line is None:
+        schedule_line = 0  # read the entire file
+        # raise ValueError("'SCHEDULE' keyword not found in this DATA file.")
+    if verbose:
+        if main and schedule_line == 0:
+            print(f"SCHEDULE keyword not found in this DATA, will proceed to read everything line by line... it could take some time...")
+        else:
+            print(f"found SCHEDULE keyword in line {schedule_line}")
+    return schedule_line, start_date
 
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
 
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword WCONPROD in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                wconprod_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(wconprod_line) < key_columns:
-                    wconprod_line_expanded = []
-                    for each in wconprod_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            wconprod_line_expanded = wconprod_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            wconprod_line_expanded.append(each)
-                    wconprod_line_expanded = wconprod_line_expanded + (['1*'] * (key_columns - len(wconprod_line_expanded)))
-                    wconprod_line = wconprod_line_expanded
-                extracted[counter()] = {'WCONPROD': wconprod_line}
-                
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['WCONPROD'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+def _file_records(datafile, schedule_line, filepath, folder, paths, keywords=None):
+    """
+    reads the lines of one file, without following the INCLUDE keywords.
 
+    Return:
+        list of tuples (keyword, record), for INCLUDE keywords the record is the path to the include file
+    """
+    records = []
+    for line_no, keyword, record in _scan(islice(datafile, schedule_line, None), schedule_line, filepath, False, keywords):
+        if keyword == 'INCLUDE':
+            record = _include_path(record, folder, paths)
+        records.append((keyword, record))
+    return records
 
-        # if WCONHIST is found
-        elif datafile[line].upper().startswith('WCONHIST'):
-            line += 1
-            key_columns = 12
-            if verbose:
-                print("found WCONHIST keyword")
-                _counter0 = counter.curr() + 1
 
-            while not _keyword_end():
+def _parse_include(filepath, encoding, folder, paths, keywords=None, start=None, stop=None):
+    """
+    reads one include file in a worker process of `read_data`, or only the bytes from `start` to `stop` of it.
+    """
+    if not exists(filepath):
+        raise ValueError(f"The file doesn't exists: {filepath}")
+    filepath = filepath.replace('\\', '/')
+    # the worker processes are reused by the next include files, the garbage collector is enabled again when this one is read
+    with _gc_paused():
+        if start is None:
+            datafile = _read_lines(filepath, encoding)
+            schedule_line, _ = _schedule_section(datafile, filepath, False, None, paths)
+        else:
+            with open(filepath, 'rb') as f:
+                f.seek(start)
+                chunk = f.read(stop - start)
+            datafile = [line.strip() for line in io.TextIOWrapper(io.BytesIO(chunk), encoding=encoding).readlines()]
+            schedule_line = 0
+        return filepath, _file_records(datafile, schedule_line, filepath, folder, paths, keywords)
 
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
 
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword WCONHIST in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                wconhist_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(wconhist_line) < key_columns:
-                    wconhist_line_expanded = []
-                    for each in wconhist_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            wconhist_line_expanded = wconhist_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            wconhist_line_expanded.append(each)
-                    wconhist_line_expanded = wconhist_line_expanded + (['1*'] * (key_columns - len(wconhist_line_expanded)))
-                    wconhist_line = wconhist_line_expanded
-                extracted[counter()] = {'WCONHIST': wconhist_line}
-                
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['WCONHIST'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+def _splittable(filepath, split_size):
+    return split_size is not None and exists(filepath) and not filepath.upper().endswith('.DATA') \
+        and getsize(filepath) > split_size
 
 
-        # if WCONINJE is found
-        elif datafile[line].upper().startswith('WCONINJE'):
-            line += 1
-            key_columns = 15
-            if verbose:
-                print("found WCONINJE keyword")
-                _counter0 = counter.curr() + 1
+def _dates_offsets(filepath, split_size):
+    """
+    returns the byte offsets where to cut the file in chunks of about `split_size` bytes.
+    Every cut is at the beginning of a line starting with the DATES keyword, so no keyword is split in two chunks.
+    """
+    size = getsize(filepath)
+    offsets = [0]
+    with open(filepath, 'rb') as f:
+        target = split_size
+        while target < size:
+            f.seek(target)
+            f.readline()  # discard the rest of the current line
+            position = f.tell()
+            for line in iter(f.readline, b''):
+                if line.lstrip()[:5].upper() == b'DATES':
+                    break
+                position += len(line)
+            if position >= size:
+                break
+            offsets.append(position)
+            target = max(target + split_size, position + 1)
+    return offsets + [size]
+
+
+def _read_parallel(extracted, datafile, schedule_line, filepath, paths, folder, counter, encoding, workers,
+                   split_size=None, keywords=None, state=None, visited=None, verbose=False):
+    """
+    reads the main file, then every include file in a pool of `workers` processes, as soon as the file including it is read.
+    Files bigger than `split_size` are cut at DATES keywords and the chunks are read by different workers.
+    If `datafile` is None, the main file is read by the workers too.
+    The records are put in `extracted` in the order of the deck, following the INCLUDE keywords.
+    If the `state` has a window of dates, the records out of it are dropped while putting them together.
+    """
+    records = {}
+    chunks = {}  # {file: [records of each chunk]} while its chunks are being read
+    if verbose:
+        print(f"reading include files in {workers} processes")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+
+        def submit(include):
+            if include in records or include in chunks:
+                return
+            if _splittable(include, split_size):
+                offsets = _dates_offsets(include, split_size)
+                chunks[include] = [None] * (len(offsets) - 1)
+                for i in range(len(offsets) - 1):
+                    pending[(include, i)] = pool.submit(_parse_include, include, encoding, folder, paths, keywords, offsets[i], offsets[i + 1])
+                if verbose:
+                    print(f"reading {include} in {len(offsets) - 1} chunks")
+            else:
+                chunks[include] = [None]
+                pending[(include, 0)] = pool.submit(_parse_include, include, encoding, folder, paths, keywords)
 
-            while not _keyword_end():
+        def read(include, file_records):
+            records[include] = file_records
+            for keyword, record in file_records:
+                if keyword == 'INCLUDE':
+                    submit(record)
 
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
+        if datafile is None:
+            submit(filepath)
+        else:
+            read(filepath, _file_records(datafile, schedule_line, filepath, folder, paths, keywords))
+        while len(pending) > 0:
+            done, _ = wait(pending.values(), return_when=FIRST_COMPLETED)
+            for include, i in [key for key in pending if pending[key] in done]:
+                include_path, chunks[include][i] = pending.pop((include, i)).result()
+                if any(chunk is None for chunk in chunks[include]):
                     continue
-
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword WCONINJE in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                wconinje_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(wconinje_line) < key_columns:
-                    wconinje_line_expanded = []
-                    for each in wconinje_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            wconinje_line_expanded = wconinje_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            wconinje_line_expanded.append(each)
-                    wconinje_line_expanded = wconinje_line_expanded + (['1*'] * (key_columns - len(wconinje_line_expanded)))
-                    wconinje_line = wconinje_line_expanded
-                extracted[counter()] = {'WCONINJE': wconinje_line}
-                
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['WCONINJE'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
-
-
-        # if WCONINJH is found
-        elif datafile[line].upper().startswith('WCONINJH'):
-            line += 1
-            key_columns = 12
-            if verbose:
-                print("found WCONINJH keyword")
-                _counter0 = counter.curr() + 1
-
-            while not _keyword_end():
-
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
+                if visited is not None:
+                    visited.append(include_path)
+                if verbose:
+                    print(f"read include file: {include_path}")
+                file_records = chunks.pop(include)
+                read(include, file_records[0] if len(file_records) == 1 else [item for chunk in file_records for item in chunk])
+
+    # put the records together in order, from the main file into every include
+    next_position = counter.next
+    dates, timesteps = _initial_timesteps(extracted)
+    timestep = len(dates) - 1
+    stack = [iter(records[filepath])]
+    while len(stack) > 0:
+        for keyword, record in stack[-1]:
+            if keyword == 'INCLUDE':
+                stack.append(iter(records[record]))
+                break
+            if state is not None:
+                if keyword == 'DATES':
+                    state.update(record)
+                if state.finished:
+                    stack = []
+                    break
+                if state.skipping:
                     continue
+            if keyword == 'DATES':
+                timestep = len(dates)
+                dates.append(record)
+            timesteps.append(timestep)
+            extracted[next_position()] = {keyword: record}
+        else:
+            stack.pop()
+    extracted._set_dates(dates, timesteps)
 
-                if '/' not in datafile[line]:
-                    raise ValueError(f"Error format in keyword WCONINJH in line {line + 1} in file {filepath}. Missing / at the end of the line.")
-                
-                wconinjh_line = _line_data().split()
-                line += 1
-
-                # complete default values at the end if requered
-                if len(wconinjh_line) < key_columns:
-                    wconinjh_line_expanded = []
-                    for each in wconinjh_line:
-                        if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                            wconinjh_line_expanded = wconinjh_line_expanded + (['1*'] * int(each[:-1]))
-                        else:
-                            wconinjh_line_expanded.append(each)
-                    wconinjh_line_expanded = wconinjh_line_expanded + (['1*'] * (key_columns - len(wconinjh_line_expanded)))
-                    wconinjh_line = wconinjh_line_expanded
-                extracted[counter()] = {'WCONINJH': wconinjh_line}
-                
-            line += 1  # keyword end line
-            if verbose:
-                print(f" for wells: {', '.join(set([extracted[i_]['WCONINJH'][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+    if verbose:
+        print(f"{len(records)} files read, {len(extracted)} keywords found.")
+    return extracted
 
+def _initial_timesteps(extracted):
+    """
+    the dates and timesteps of the records already in `extracted` (the START date), to continue them while reading.
+    """
+    dates = [extracted[each]['DATES'] for each in extracted if 'DATES' in extracted[each]]
+    return dates, array('i', range(len(dates)))
 
-        # if INCLUDE is found, will read the include
-        elif datafile[line].upper().startswith('INCLUDE'):
-            line += 1
-            if verbose:
-                print("found INCLUDE file:\n")
-
-            # skip empty or commented lines
-            while _empty_line() or _comment_line():
-                line += 1
-
-            include = datafile[line][::-1][datafile[line][::-1].index('/') + 1:][::-1].strip().strip("'")
-            
-            if '$' in include:  # identify path from PATHS dictionary
-                path_i = include.index('$')
-                path_f = include.index('/', path_i)
-                path_var = include[path_i: path_f]
-                if path_var[1:] not in paths:
-                    raise ValueError(f"Path variable '{path_var}' not defined in keyword PATHS.")
-                include = folder + include[:path_i] + paths[path_var[1:]] + include[path_f:]
-            elif include.startswith('../') or include.startswith('./'):
-                include = folder + include
-            
-            # reading the include file recursively
-            include = read_data(include, paths=paths, folder=folder, verbose=verbose, start_date=_last_date(), counter=counter, main=False)
-            # load the returned keywords dictionary into this keywords dictionary
-            extracted.update(include)
-            line += 1
 
+def _wanted_keywords(keywords):
+    """
+    returns the set of requested keywords in upper case, or None to read every keyword.
+    """
+    if keywords is None:
+        return None
+    if type(keywords) is str:
+        keywords = [keywords]
+    return {keyword.upper() for keyword in keywords} | {'DATES'}
 
-        # read the listed keywords, that doesn't have and ending line with /
-        elif _keyword() in skip0_keywords:
-            keyword_ = _keyword()
-            extracted[counter()] = {keyword_: None}
-            if verbose:
-                print(f"found {keyword_} keyword")
-            line += 1
-        elif _keyword() in skip1_keywords:
-            keyword_ = _keyword()
-            if verbose:
-                print(f"found {keyword_} keyword")
-            line += 1
-            # skip empty or commented lines
-            while _empty_line() or _comment_line():
-                    line += 1
-            extracted[counter()] = {keyword_: _line_data()}
-            line += 1
-        elif _keyword() in skip3_keywords:
-            keyword_ = _keyword()
-            if verbose:
-                print(f"found {keyword_} keyword")
-            line += 1
-            for i in range(3):
-                # skip empty or commented lines
-                while _empty_line() or _comment_line():
-                        line += 1
-                extracted[counter()] = {keyword_: _line_data()}
-                line += 1
 
+def _line_data(line):
+    """
+    returns the data of the `line`, before the closing / or the comment --
+    """
+    if '/' in line:
+        return line[:line.index('/')].strip()
+    elif '--' in line:
+        return line[:line.index('--')].strip()
+    return line
 
-        # generic procedure to read any other COMPLETION, WELL, GROUP or USER DEFINED keyword (because they end with /)
-        elif _keyword()[0] in 'CWGU':
-            keyword_ = _keyword()
-            line += 1
-            _counter0 = counter.curr() + 1
-            if verbose:
-                print(f"found {keyword_} keyword")
 
-            while not _keyword_end():
+def _expand_defaults(items):
+    """
+    expand the N* default items into N items '1*'
+    """
+    expanded = []
+    for each in items:
+        if len(each) >= 2 and each[-1] == '*' and each[:-1].isdigit():
+            expanded += ['1*'] * int(each[:-1])
+        else:
+            expanded.append(each)
+    return expanded
 
-                # skip empty or commented lines
-                if _empty_line() or _comment_line():
-                    line += 1
-                    continue
 
-                keyword_line = _line_data().split()
-
-                # expand default values if needed
-                keyword_line_expanded = []
-                for each in keyword_line:
-                    if len(each) >= 2 and each.endswith('*') and each[:-1].isdigit():
-                        keyword_line_expanded = keyword_line_expanded + (['1*'] * int(each[:-1]))
-                    else:
-                        keyword_line_expanded.append(each)
-                keyword_line = keyword_line_expanded
-                extracted[counter()] = {keyword_: keyword_line}
-                line += 1
-            line += 1
+def _include_path(include_line, folder, paths):
+    """
+    returns the path to the include file from the line following the INCLUDE keyword, resolving the PATHS variables.
+    """
+    if '/' not in include_line:
+        raise ValueError(f"Error format in INCLUDE line: {include_line}. Missing / at the end of the line.")
+    include = include_line[:include_line.rindex('/')].strip().strip("'")
+
+    if '$' in include:  # identify path from PATHS dictionary
+        path_i = include.index('$')
+        path_f = include.index('/', path_i)
+        path_var = include[path_i: path_f]
+        if path_var[1:] not in paths:
+            raise ValueError(f"Path variable '{path_var}' not defined in keyword PATHS.")
+        include = folder + include[:path_i] + paths[path_var[1:]] + include[path_f:]
+    elif include.startswith('../') or include.startswith('./'):
+        include = folder + include
+    return include
+
+
+def _scan(lines, line=0, filepath=None, verbose=False, keywords=None, state=None):
+    """
+    single pass over the lines of a file. The lines are read forward only, so they can be streamed from the file.
+    Every line starting a keyword is dispatched by a lookup in the KEYWORD_TABLE, that declares how its data is read.
 
-            # expand default values at the end if needed
-            keyword_max_ = [len(extracted[i_][keyword_]) for i_ in range(_counter0, counter.curr()+1)]
-            if len(keyword_max_) > 0:
-                keyword_max_ = max([len(extracted[i_][keyword_]) for i_ in range(_counter0, counter.curr()+1)])
-                for each in range(_counter0, counter.curr()+1):
-                    keyword_line = extracted[each][keyword_] 
-                    if len(keyword_line) < keyword_max_:
-                        extracted[each][keyword_] = keyword_line + (['1*'] * (keyword_max_ - len(keyword_line)))           
+    Params:
+        lines: iterable of str
+            the stripped lines of the file, i.e.: a list or a generator over the opened file
+        line: int
+            the line number of the first of the `lines`
+        filepath: str
+            the path to the file, only used for messages
+        verbose: bool
+            set it to False to skip printing messages.
+        keywords: set of str, optional
+            the keywords to read, the data of other keywords is skipped by looking only for the closing /
+        state: _ReadState, optional
+            while its `skipping` is True, the data of every keyword but DATES and INCLUDE is skipped the same way
+
+    Yields:
+        tuple (line number, keyword, record)
+            for INCLUDE keywords, the record is the line with the path to the include file
+    """
+    lines = enumerate(lines, line)
+    rules = {}  # the rules found in this file, to lookup each keyword only once
+    for line, text in lines:
 
-            if verbose:
-                print(f" for: {', '.join(set([extracted[i_][keyword_][0] for i_ in range(_counter0, counter.curr()+1)]))}")
+        # skip empty and comment lines
+        if len(text) == 0 or text.startswith('--'):
+            continue
 
+        keyword = text.split(None, 1)[0].upper()
+        if keyword in rules:
+            rule = rules[keyword]
+        else:
+            rule = rules[keyword] = keyword_rule(keyword)
 
-        elif datafile[line].upper().startswith('VFPPROD'):
-            keyword_ = _keyword()
-            line += 1
+        # skip everything else
+        if rule is None:
             if verbose:
-                print(f"found {keyword_} keyword")
-            
-            vfp_tables, vfp_records, vfp_line, vfp_data = 1, 6, [], ''
-            while line < len(datafile) and vfp_tables > 0:
+                print(f"skipping {text}")
+            continue
+
+        end = rule.end
+
+        # skip the keywords not requested, without reading their data
+        if end != 'dates' and end != 'include' and (
+                (keywords is not None and rule.name not in keywords and keyword not in keywords)
+                or (state is not None and state.skipping)):
+            if end == 'records':
+                for line, text in lines:
+                    if text[:1] == '/':
+                        break
+                continue
+            elif end == 'lines':
+                count = 0
+                for line, text in (lines if rule.lines > 0 else ()):
+                    if len(text) > 0 and not text.startswith('--'):
+                        count += 1
+                        if count == rule.lines:
+                            break
+                continue
+            elif end == 'none':
+                continue
+            # VFP tables are read to know where they end, but not yielded
 
-                if _empty_line() or _comment_line():
-                    line += 1
+        if verbose:
+            print(f"found {keyword} keyword")
+
+        # read all the records until the closing /
+        if end == 'records' or end == 'dates':
+            records = []
+            name, columns, strict = rule.name, rule.columns, rule.strict
+            defaults = ['1*'] * (columns or 0)
+            dates = end == 'dates'
+            for line, text in lines:
+                if len(text) == 0 or text[0] == '-' and text.startswith('--'):
                     continue
+                if text[0] == '/':
+                    break
+                cut = text.find('/')
+                if cut < 0:
+                    if strict:
+                        raise ValueError(f"Error format in keyword {name} in line {line + 1} in file {filepath}. Missing / at the end of the line.")
+                    cut = text.find('--')
+                if dates:
+                    records.append((line, text[:cut].strip() if cut >= 0 else text))
+                    continue
+                items = (text[:cut] if cut >= 0 else text).split()
+                if '*' in text:
+                    items = _expand_defaults(items)
+                if columns is not None and len(items) < columns:
+                    items += defaults[len(items):]
+                records.append((line, items))
 
-                vfp_data += datafile[line]
-
-                if vfp_records > 0:
-                    if '/' not in datafile[line]:
-                        vfp_line += _line_data().split()
-                    elif '/' in datafile[line]:
-                        if vfp_records == 6:
-                            vfp_line = []
-                            vfp_records -= 1
-                        else:
-                            vfp_line += _line_data().split()
-                            vfp_tables *= len(vfp_line)
-                            vfp_line = []
-                elif '/' in datafile[line]:
-                    vfp_tables -= 1
+            # expand default values at the end if needed
+            if rule.pad and len(records) > 0:
+                width = max(len(items) for _, items in records)
+                for _, items in records:
+                    if len(items) < width:
+                        items += ['1*'] * (width - len(items))
+
+            if verbose and len(records) > 0:
+                if dates:
+                    print(f" {' until '.join(dict.fromkeys([records[0][1], records[-1][1]]))}")
                 else:
-                    pass
-                line += 1
-            extracted[counter()] = {keyword_: vfp_data}
-
-        elif datafile[line].upper().startswith('VFPINJ'):
-            keyword_ = _keyword()
-            line += 1
-            if verbose:
-                print(f"found {keyword_} keyword")
-            
-            vfp_tables, vfp_records, vfp_line = 1, 3, []
-            while line < len(datafile) and vfp_tables > 0:
-
-                if _empty_line() or _comment_line():
-                    line += 1
+                    print(f" for: {', '.join(set([items[0] for _, items in records if len(items) > 0]))}")
+            for line_no, record in records:
+                yield line_no, name, record
+
+        # the next line is the include path
+        elif end == 'include':
+            for line, text in lines:
+                if len(text) == 0 or text.startswith('--'):
                     continue
-
-                vfp_data += datafile[line]
-
+                if verbose:
+                    print(f"found INCLUDE file:\n")
+                yield line, 'INCLUDE', text
+                break
+
+        # keywords that doesn't have and ending line with /
+        elif end == 'none':
+            yield line, rule.name, None
+
+        # keywords with a fixed number of records
+        elif end == 'lines':
+            count = 0
+            for line, text in (lines if rule.lines > 0 else ()):
+                if len(text) == 0 or text.startswith('--'):
+                    continue
+                yield line, rule.name, _line_data(text)
+                count += 1
+                if count == rule.lines:
+                    break
+
+        # VFP tables, `rule.lines` header records followed by as many records as the product of the lengths of the axis records
+        elif end == 'vfp':
+            first_line = line
+            vfp_data, vfp_records, vfp_tables, vfp_line = '', rule.lines, 1, []
+            for line, text in lines:
+                if len(text) == 0 or text.startswith('--'):
+                    continue
+                vfp_data += text + '\n'
                 if vfp_records > 0:
-                    if '/' not in datafile[line]:
-                        vfp_line += _line_data().split()
-                    elif '/' in datafile[line]:
-                        if vfp_records == 3:
-                            vfp_line = []
-                            vfp_records -= 1
-                        elif vfp_records == 2:
-                            vfp_line += _line_data().split()
-                            vfp_line = []
-                            vfp_records -= 1
-                        else:
-                            vfp_line += _line_data().split()
-                            vfp_tables = len(vfp_line)
-                            vfp_line = []
-                elif '/' in datafile[line]:
+                    vfp_line += _line_data(text).split()
+                    if '/' in text:
+                        vfp_records -= 1
+                        # the first record is the table header and the second the flow values, the others are table axis
+                        if vfp_records < rule.lines - 2:
+                            vfp_tables *= len(_expand_defaults(vfp_line))
+                        vfp_line = []
+                elif '/' in text:
                     vfp_tables -= 1
-                else:
-                    pass
-                line += 1
-            extracted[counter()] = {keyword_: vfp_data}
-
-        # skip everything else
-        else:
-            if verbose:
-                print(f"skipping {datafile[line]}")
-            line += 1
-
-
-    if verbose:
-        print(f"closing this file, {counter.curr() - keywords_before} keywords found here.")
-        print()
-
-    return extracted
+                if vfp_records == 0 and vfp_tables == 0:
+                    break
+            if (keywords is None or rule.name in keywords or keyword in keywords) and (state is None or not state.skipping):
+                yield first_line, rule.name, vfp_data.rstrip('\n')
@@ -1,5 +1,21 @@
 import pandas as pd
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
+
+MONTHS = {'JAN':  1,
+          'FEB':  2,
+          'MAR':  3,
+          'APR':  4,
+          'MAY':  5,
+          'JUN':  6,
+          'JLY':  7,
+          'JUL':  7,
+          'AUG':  8,
+          'SEP':  9,
+          'OCT': 10,
+          'NOV': 11,
+          'DEC': 12,
+          }
 
 def parse_dates(dates_keyword):
     """
@@ -9,23 +25,8 @@ def parse_dates(dates_keyword):
         dates_keyword: str or list of str
 
     Return:
-        pandas.Series of dtype datetime64[ns]
-    """
-
-    months = {'JAN':  1,
-              'FEB':  2,
-              'MAR':  3,
-              'APR':  4,
-              'MAY':  5,
-              'JUN':  6,
-              'JLY':  7,
-              'JUL':  7,
-              'AUG':  8,
-              'SEP':  9,
-              'OCT': 10,
-              'NOV': 11,
-              'DEC': 12,
-              }
+        numpy.ndarray of dtype datetime64[ns]
+    """
 
     if type(dates_keyword) is str:
         if '\n' in dates_keyword:
@@ -34,21 +35,68 @@ def parse_dates(dates_keyword):
             dates_keyword = [dates_keyword]
         
     # removes 'DATES' keyword or ending slash '/' 
-    dates_keyword = [each.strip('/ ').split() 
+    dates_keyword = [each
                      for each in dates_keyword 
                      if not each.strip().upper().startswith('DATES') and not each.strip().startswith('/')]
 
-    # complete HH:MM:SS.SSSS in case some is incomplete
-
-    # parse dates lines
-    dates_keyword = [datetime(int(each[2]), months[each[1].strip("'").strip('"')], int(each[0]))
-                     if len(each) == 3 else
-                     datetime(int(each[2]), months[each[1].strip("'").strip('"')], int(each[0]),
-                              int(each[3].split(':')[0]),
-                              int(each[3].split(':')[1] if len(each[3].split(':')) >= 2 else 0),
-                              float(each[3].split(':')[2] if len(each[3].split(':')) == 3 else 0.0)
-                              ) 
-                     for each in dates_keyword
-                    ]
-    
-    return pd.to_datetime(dates_keyword).values
+    # each distinct date is parsed only once
+    return date_table(dates_keyword, errors='raise')
+
+
+def date_table(dates, errors='coerce'):
+    """
+    parse a list of DATES records, each distinct record is parsed only once and repeated ones are looked up.
+
+    Parameters:
+        dates: list of str
+            DATES records like "1 'JAN' 2000"
+        errors: str
+            'coerce' to set NaT where a record can't be parsed, 'raise' to raise the error.
+
+    Return:
+        numpy.ndarray of dtype datetime64[ns]
+    """
+    index = {}
+    codes = [index.setdefault(each, len(index)) for each in dates]
+    values = []
+    for each in index:
+        try:
+            values.append(parse_date(each))
+        except (ValueError, KeyError, IndexError, AttributeError):
+            if errors == 'raise':
+                raise
+            values.append(None)
+    values = np.array([np.datetime64('NaT') if each is None else each for each in values], dtype='datetime64[ns]')
+    return values[np.array(codes, dtype=np.int64)]
+
+
+def parse_date(date_record):
+    """
+    parse a single DATES record, according to DATES eclipse format: DD 'MMM' YYYY HH:MM:SS
+
+    Parameters:
+        date_record: str
+
+    Return:
+        datetime
+    """
+    each = date_record.strip('/ ').split()
+    date = datetime(int(each[2]), MONTHS[each[1].strip("'").strip('"').upper()], int(each[0]))
+    if len(each) > 3:
+        time = [float(value) for value in each[3].split(':')] + [0.0, 0.0]
+        date += timedelta(hours=time[0], minutes=time[1], seconds=time[2])
+    return date
+
+
+def to_datetime(date):
+    """
+    returns a datetime from a DATES record like "1 'JAN' 2000", any string understood by pandas, a date or a datetime.
+    """
+    if date is None:
+        return None
+    if type(date) is str:
+        try:
+            return parse_date(date)
+        except (ValueError, KeyError, IndexError):
+            return pd.Timestamp(date).to_pydatetime()
+    return pd.Timestamp(date).to_pydatetime()
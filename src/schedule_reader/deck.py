@@ -0,0 +1,138 @@
+from collections.abc import Mapping
+from .data_reader import read_data
+from .welspec import extract_welspecs, extract_welspecl, extract_wellspec, extract_welspec2
+from .compdat import extract_compdat, extract_compdatl, extract_compdat2
+from .wcon import extract_wconprod, extract_wconinje, extract_wconhist, extract_wconinjh
+from .schedule_keywords import extract_keyword
+from .columnar import ColumnarSchedule
+
+__all__ = ['ScheduleDeck']
+
+
+class ScheduleDeck(object):
+    """
+    parse-once session over a .DATA or schedule include file.
+
+    The file (and all its includes) is read by `read_data` only the first time any table is requested.
+    Every extracted table is computed on first access and memoized, until `invalidate` is called.
+
+    Params:
+        path: str, dict (or any mapping like ColumnarSchedule.view) or ColumnarSchedule
+            the path to the .DATA or schedule include file, or a schedule already prepared by `read_data`
+        encoding: str
+            The enconding format of input text files.
+        verbose: bool
+            set it to False to skip printing messages.
+        cache_dir: str, optional
+            folder for the on-disk parse cache of `read_data`, so a new session over unchanged files skips the parsing.
+
+    Example:
+        deck = ScheduleDeck('MODEL.DATA')
+        deck.compdat      # reads the deck and extracts COMPDAT
+        deck.welspecs     # reuses the already parsed schedule
+        deck.keyword('GCONPROD')
+        deck.invalidate() # next access will read the files again
+    """
+    _extractors = {
+        'compdat': extract_compdat,
+        'compdatl': extract_compdatl,
+        'compdat2': extract_compdat2,
+        'welspecs': extract_welspecs,
+        'welspecl': extract_welspecl,
+        'wellspec': extract_wellspec,
+        'welspec2': extract_welspec2,
+        'wconprod': extract_wconprod,
+        'wconinje': extract_wconinje,
+        'wconhist': extract_wconhist,
+        'wconinjh': extract_wconinjh,
+    }
+
+    def __init__(self, path, encoding='cp1252', verbose=False, cache_dir=None):
+        if isinstance(path, (Mapping, ColumnarSchedule)):
+            self.path = None
+            self._schedule = path
+        else:
+            self.path = path
+            self._schedule = None
+        self.encoding = encoding
+        self.verbose = verbose
+        self.cache_dir = cache_dir
+        self._cache = {}
+
+    @property
+    def schedule(self):
+        """
+        the schedule dictionary, as returned by `read_data`. The files are read only once.
+        """
+        if self._schedule is None:
+            self._schedule = read_data(self.path, encoding=self.encoding, verbose=self.verbose, cache_dir=self.cache_dir)
+        return self._schedule
+
+    def _cached(self, name, builder, *args):
+        if name not in self._cache:
+            self._cache[name] = builder(self.schedule, *args)
+        return self._cache[name]
+
+    def __getattr__(self, name):
+        # only called when the normal lookup fails, i.e.: for the extractor shortcuts
+        if name in ScheduleDeck._extractors:
+            return self._cached(name, ScheduleDeck._extractors[name])
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(ScheduleDeck._extractors)
+
+    @property
+    def dates(self):
+        """
+        pandas.Series of every DATES found in the schedule.
+        """
+        return self._cached('DATES', extract_keyword, 'DATES')
+
+    def keyword(self, keyword, record_names=None):
+        """
+        Extract any `keyword` from the schedule, as `extract_keyword` does. The result is memoized by keyword and record names.
+
+        Params:
+            keyword: str
+                the desired keyword to be extracted
+            record_names: list of str, optional
+                a list with the name of the record names for the `keyword`
+
+        Return:
+            pandas.DataFrame
+        """
+        keyword = keyword.upper()
+        if keyword == 'DATES':
+            return self.dates
+        record_names = None if record_names is None or len(record_names) == 0 else list(record_names)
+        name = keyword if record_names is None else (keyword, tuple(record_names))
+        return self._cached(name, extract_keyword, keyword, record_names)
+
+    def invalidate(self, *names):
+        """
+        drop memoized results, so they are computed again on next access.
+
+        Params:
+            *names: str, optional
+                the tables to drop, i.e.: 'compdat', 'wconhist' or a keyword name like 'GCONPROD'.
+                If no names are provided, every table is dropped and the files will be read again on next access
+                (unless the deck was created from a schedule dictionary).
+        """
+        if len(names) == 0:
+            self._cache.clear()
+            if self.path is not None:
+                self._schedule = None
+            return
+        for name in names:
+            if name in ScheduleDeck._extractors:
+                self._cache.pop(name, None)
+                continue
+            name = name.upper()
+            for key in [key for key in self._cache if key == name or (type(key) is tuple and key[0] == name)]:
+                del self._cache[key]
+
+    def __repr__(self):
+        source = self.path if self.path is not None else 'schedule dictionary'
+        status = 'parsed' if self._schedule is not None else 'not parsed yet'
+        return f"ScheduleDeck({source}, {status}, {len(self._cache)} tables cached)"
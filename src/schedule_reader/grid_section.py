@@ -0,0 +1,253 @@
+import re
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from .data_reader import _include_path
+from .keyword_table import GRID_KEYWORD_TABLE, grid_keyword_rule
+from .property_keywords import read_properties
+
+__all__ = ['PropertyLocation', 'index_properties', 'read_grid_properties']
+
+PropertyLocation = namedtuple('PropertyLocation', ['keyword', 'path', 'offset', 'section', 'order', 'targets', 'box'],
+                              defaults=(None, (), False))
+PropertyLocation.__doc__ = """
+where the data of a keyword is found: the file, the position (in bytes) of the keyword line and the section of the deck.
+`order` is the position of the keyword in the whole deck, `targets` the properties modified by an edit keyword (EQUALS, COPY, MINPV, ...)
+and `box` is True for a keyword inside BOX and ENDBOX, that sets only the cells of the box.
+"""
+
+_SECTIONS = {'RUNSPEC', 'GRID', 'EDIT', 'PROPS', 'REGIONS', 'SOLUTION', 'SUMMARY', 'SCHEDULE'}
+_KEYWORD_NAME = re.compile(r'[A-Z][A-Z0-9_+-]{0,7}$')
+# the keywords editing the properties and the item of each record with the name of the modified property
+_EDITS = {'EQUALS': 0, 'ADD': 0, 'MULTIPLY': 0, 'MINVALUE': 0, 'MAXVALUE': 0, 'COPY': 1, 'OPERATE': 0, 'OPERATER': 0,
+          'EQUALREG': 0, 'ADDREG': 0, 'MULTIREG': 0, 'COPYREG': 1}
+# the keywords deactivating cells by their pore volume, without changing the ACTNUM of the deck
+_MINPV = ('MINPV', 'MINPVV', 'MINPORV')
+
+
+def _lines(path, encoding):
+    """
+    yields the position (in bytes) and the stripped text (without comments) of every line of the file.
+    """
+    offset = 0
+    with open(path, 'rb') as f:
+        for raw in f:
+            line = raw.decode(encoding)
+            if '--' in line:
+                line = line[:line.index('--')]
+            yield offset, line.strip()
+            offset += len(raw)
+
+
+def _starts_keyword(line):
+    """
+    True if the line can only be a keyword: a section, a keyword of GRID_KEYWORD_TABLE,
+    or a single upper case name of up to 8 characters alone in the line, like the flag keywords (HWELLS, NOCASC, ...).
+    """
+    word = line.split(None, 1)[0]
+    if word.upper() in _SECTIONS or word.upper() in GRID_KEYWORD_TABLE:
+        return True
+    return line == word and _KEYWORD_NAME.match(word) is not None
+
+
+def _skip_data(rule, rest, lines, known=True):
+    """
+    reads the `lines` of the data of a keyword up to its end, declared by the `end` of its rule.
+    `rest` is the text of the keyword line after the keyword name.
+    The keywords not `known` (not in GRID_KEYWORD_TABLE) can be flags without data: their data ends before a line starting a keyword.
+
+    Return:
+        the (offset, line) starting a keyword found in the data of a keyword not `known`, or None
+    """
+    end = rule.end
+    if end == 'record':
+        if '/' in rest:
+            return None
+        for offset, line in lines:
+            if '/' in line:
+                return None
+            if not known and len(line) > 0 and line[0].isalpha() and _starts_keyword(line):
+                return offset, line
+    elif end == 'records':
+        for _, line in lines:
+            if line.startswith('/'):
+                return None
+    elif end == 'lines':
+        count = 0
+        for _, line in (lines if rule.lines > 0 else ()):
+            if len(line) > 0:
+                count += 1
+                if count == rule.lines:
+                    return None
+    return None
+
+
+def _edit_targets(position, lines):
+    """
+    reads the records of an edit keyword up to the line starting with / and returns the names in the item `position` of every record.
+    """
+    targets, record = [], ''
+    for _, line in lines:
+        if line.startswith('/'):
+            break
+        record += ' ' + line
+        if '/' in record:
+            items = record[:record.index('/')].split()
+            if len(items) > position:
+                targets.append(items[position].strip("'").upper())
+            record = ''
+    return tuple(dict.fromkeys(targets))
+
+
+def _index_file(path, encoding, folder, paths, index, section, keywords=None, verbose=False, first=False, state=None):
+    """
+    reads the keyword lines of one file, following its INCLUDE keywords in order. Stops at the SCHEDULE section,
+    or, if `first`, as soon as every one of the `keywords` is found.
+    The data of every keyword is skipped by the rule from `grid_keyword_rule`, so its lines are never taken as keywords.
+    The keywords of the SUMMARY section are not indexed, most of them have no data.
+    `state` keeps the count of keywords and the BOX along the INCLUDE files.
+
+    Return:
+        the section at the end of the file, or None if SCHEDULE was found or the search is done
+    """
+    if verbose:
+        print(f"indexing: {path}")
+    state = {'order': 0, 'box': False} if state is None else state
+    lines = _lines(path, encoding)
+    found = None  # a keyword line found while skipping the data of the previous keyword
+    while True:
+        if found is None:
+            offset, line = next(lines, (None, None))
+            if line is None:
+                break
+        else:
+            (offset, line), found = found, None
+        if len(line) == 0 or not line[0].isalpha():
+            continue
+        words = line.split(None, 1)
+        keyword = words[0].upper()
+        if keyword == 'SCHEDULE':
+            return None
+        if keyword in _SECTIONS:
+            section = keyword
+            state['box'] = False
+        elif keyword == 'INCLUDE':
+            include = next((line for _, line in lines if len(line) > 0), '')
+            section = _index_file(_include_path(include, folder, paths), encoding, folder, paths, index, section, keywords, verbose, first, state)
+            if section is None:
+                return None
+        elif keyword == 'PATHS':
+            for _, line in lines:
+                if line.startswith('/'):
+                    break
+                if len(line) > 0:
+                    items = line.strip('/').split()
+                    paths[items[0].strip("'")] = items[1].strip("'")
+        elif section != 'SUMMARY':
+            state['order'] += 1
+            targets = ('ACTNUM',) if keyword in _MINPV else ()
+            if keyword in _EDITS:
+                targets = _edit_targets(_EDITS[keyword], lines)
+            else:
+                found = _skip_data(grid_keyword_rule(keyword), words[1] if len(words) > 1 else '', lines, keyword in GRID_KEYWORD_TABLE)
+            if keywords is None or keyword in keywords:
+                index.setdefault(keyword, []).append(PropertyLocation(keyword, path, offset, section, state['order'], targets, state['box']))
+                if first and len(index) == len(keywords):
+                    return None
+            if keyword in ('BOX', 'ENDBOX'):
+                state['box'] = keyword == 'BOX'
+    return section
+
+
+def index_properties(filepath, keywords=None, encoding='cp1252', paths=None, folder=None, verbose=False, first=False):
+    """
+    walks the .DATA file up to the SCHEDULE section, following the INCLUDE keywords and PATHS variables the same way `read_data` does,
+    and returns where every keyword before the SCHEDULE section (RUNSPEC, GRID, EDIT, PROPS, REGIONS, ...) is found.
+    Only the keyword lines are read, the data of the properties is skipped.
+
+    Params:
+        filepath: str
+            the path to the .DATA file
+        keywords: list of str, optional
+            index only these keywords
+        encoding: str
+        paths: dict, optional
+            the PATHS variables, by default read from the PATHS keyword of the .DATA
+        folder: str, optional
+            the folder for the relative include paths, by default the folder of the .DATA
+        verbose: bool
+            set it to False to skip printing messages.
+        first: bool
+            stop reading the deck as soon as every one of the `keywords` is found, each one with only its first appearance.
+
+    Return:
+        dict {keyword: list of PropertyLocation}, every appearance of the keyword in order of the deck
+    """
+    filepath = filepath.replace('\\', '/')
+    if folder is None:
+        folder = '/'.join(filepath.split('/')[:-1]) + '/'
+    paths = {} if paths is None else dict(paths)
+    keywords = None if keywords is None else {keyword.upper() for keyword in keywords}
+    index = {}
+    _index_file(filepath, encoding, folder, paths, index, 'RUNSPEC', keywords, verbose, first and keywords is not None)
+    return index
+
+
+def read_grid_properties(filepath, keywords, dtypes=None, encoding='cp1252', size=None, workers=None, paths=None, folder=None,
+                         cache_dir=None, verbose=False):
+    """
+    reads the `keywords` of the GRID and PROPS sections of a .DATA file, wherever they are in its INCLUDE files.
+    The keywords are located by `index_properties`, then read in a pool of `workers` processes,
+    each one from its own position in its file, so only the data of the requested keywords is read.
+    If a keyword appears more than once, the last one in order of the deck is read.
+    The edits of the deck (EQUALS, COPY, MULTIPLY, ADD, the BOX definitions, MINPV, ...) are not applied,
+    a warning lists the ones modifying a requested keyword after its definition.
+
+    Params:
+        filepath: str
+            the path to the .DATA file
+        keywords: list of str
+        dtypes: dict {keyword: numpy dtype}, optional
+        encoding: str
+        size: int, optional
+            the number of cells, to allocate every array once
+        workers: int, optional
+            number of processes to read the files in parallel. By default the files are read one after another.
+        paths, folder:
+            see `index_properties`
+        cache_dir: str, optional
+            folder for the binary cache of the parsed properties
+        verbose: bool
+            set it to False to skip printing messages.
+
+    Return:
+        dict {keyword: numpy.ndarray}, in the order of `keywords`
+    """
+    keywords = [keyword.upper() for keyword in keywords]
+    index = index_properties(filepath, keywords + list(_EDITS) + list(_MINPV), encoding=encoding, paths=paths, folder=folder, verbose=verbose)
+    missing = [keyword for keyword in keywords if keyword not in index]
+    if len(missing) > 0:
+        raise ValueError(f"The requested keywords {', '.join(missing)} are not in the GRID or PROPS sections of {filepath}")
+
+    # every keyword is read from the position of its last appearance outside a BOX, the reader takes the first keyword found from there
+    edits = [location for keyword in list(_EDITS) + list(_MINPV) if keyword not in keywords for location in index.get(keyword, [])]
+    locations = {}
+    for keyword in keywords:
+        locations[keyword] = ([location for location in index[keyword] if not location.box] or index[keyword])[-1]
+        later = [('BOX' if location.box else location.keyword) for location in index[keyword] + edits
+                 if (location.order > locations[keyword].order or location.keyword in _MINPV) and (location.box or keyword in location.targets)]
+        if len(later) > 0:
+            warnings.warn(f"{keyword} is modified by {', '.join(dict.fromkeys(later))} after its definition, the edits are not applied.")
+    jobs = [(location.path, [keyword], location.offset) for keyword, location in locations.items()]
+
+    values = {}
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(read_properties, path, job_keywords, dtypes, encoding, size, 1 << 22, cache_dir, verbose, offset)
+                       for path, job_keywords, offset in jobs]
+            for future in futures:
+                values.update(future.result())
+    else:
+        for path, job_keywords, offset in jobs:
+            values.update(read_properties(path, job_keywords, dtypes, encoding, size, 1 << 22, cache_dir, verbose, offset))
+    return {keyword: values[keyword] for keyword in keywords}
@@ -0,0 +1,117 @@
+from collections import namedtuple
+
+__all__ = ['KeywordRule', 'KEYWORD_TABLE', 'GENERIC_RULE', 'register_keyword', 'keyword_rule', 'GRID_KEYWORD_TABLE', 'GRID_RULE', 'grid_keyword_rule']
+
+# how the data of a keyword ends:
+#   'records': one record per line, the keyword ends with a line starting with /
+#   'dates':   like 'records', but every line is a date
+#   'none':    the keyword has no data
+#   'lines':   a fixed number of lines (`lines`), each one stored as a record
+#   'vfp':     VFPPROD and VFPINJ tables, `lines` is the number of header records before the table values
+#   'include': the next line is the path to an include file
+#   'record':  a single record ending with the first /, anywhere in the line (only for the keywords before the SCHEDULE section)
+KeywordRule = namedtuple('KeywordRule', ['name', 'columns', 'end', 'lines', 'strict', 'pad'],
+                         defaults=[None, 'records', 0, False, False])
+KeywordRule.__doc__ = """
+declaration of how a keyword is read by `read_data`.
+
+Params:
+    name: str
+        the name the records are stored with, i.e.: COMPDATM is stored as COMPDATL
+    columns: int, optional
+        the number of items of each record, shorter records are completed with defaults '1*'
+    end: str
+        how the keyword data ends, one of 'records', 'dates', 'none', 'lines', 'vfp' or 'include'
+    lines: int
+        number of lines for the 'lines' end, or number of header records for the 'vfp' end
+    strict: bool
+        if True, every record must end with / in the same line
+    pad: bool
+        if True, the records of the keyword are completed to the length of the longest record of the same block
+"""
+
+
+KEYWORD_TABLE = {
+    'DATES': KeywordRule('DATES', end='dates'),
+    'INCLUDE': KeywordRule('INCLUDE', end='include'),
+    'COMPDAT': KeywordRule('COMPDAT', 14, strict=True),
+    'COMPDATL': KeywordRule('COMPDATL', 15, strict=True),
+    'COMPDATM': KeywordRule('COMPDATL', 15, strict=True),
+    'WELSPECS': KeywordRule('WELSPECS', 17, strict=True),
+    'WELSPECL': KeywordRule('WELSPECL', 18, strict=True),
+    'WELLSPEC': KeywordRule('WELLSPEC', 7, strict=True),
+    'WCONPROD': KeywordRule('WCONPROD', 20, strict=True),
+    'WCONHIST': KeywordRule('WCONHIST', 12, strict=True),
+    'WCONINJE': KeywordRule('WCONINJE', 15, strict=True),
+    'WCONINJH': KeywordRule('WCONINJH', 12, strict=True),
+    'VFPPROD': KeywordRule('VFPPROD', end='vfp', lines=6),
+    'VFPINJ': KeywordRule('VFPINJ', end='vfp', lines=3),
+    'TUNING': KeywordRule('TUNING', end='lines', lines=3),
+}
+# keywords without data
+for _keyword in ('ECHO', 'NOECHO', 'SKIPREST', 'SKIP', 'SKIP100', 'SKIP300', 'ENDSKIP', 'RPTONLY', 'RPTONLYO'):
+    KEYWORD_TABLE[_keyword] = KeywordRule(_keyword, end='none')
+# keywords with a single record
+for _keyword in ('NEXT', 'NEXTSTEP', 'LIFTOPT', 'GCONTOL', 'GUIDERAT', 'WLIMTOL', 'RPTSCHED', 'FILEUNIT'):
+    KEYWORD_TABLE[_keyword] = KeywordRule(_keyword, end='lines', lines=1)
+
+# any other COMPLETION, WELL, GROUP or USER DEFINED keyword, because they end with /
+GENERIC_RULE = KeywordRule(None, pad=True)
+GENERIC_INITIALS = 'CWGU'
+
+
+def register_keyword(keyword, columns=None, end='records', lines=0, strict=False, pad=False, name=None):
+    """
+    add or replace the rule used by `read_data` to read a keyword.
+
+    Params:
+        keyword: str
+            the keyword as it appears in the file
+        columns, end, lines, strict, pad, name:
+            see `KeywordRule`, `name` defaults to the `keyword`
+    """
+    keyword = keyword.upper()
+    KEYWORD_TABLE[keyword] = KeywordRule(keyword if name is None else name.upper(), columns, end, lines, strict, pad)
+    return KEYWORD_TABLE[keyword]
+
+
+def keyword_rule(keyword):
+    """
+    returns the KeywordRule for the `keyword` or None if the keyword is not read.
+    """
+    rule = KEYWORD_TABLE.get(keyword)
+    if rule is None and keyword[0] in GENERIC_INITIALS:
+        return GENERIC_RULE._replace(name=keyword)
+    return rule
+
+
+# the keywords before the SCHEDULE section, used by `index_properties` to skip their data.
+# The grid properties and most of the other keywords are a single record, ending with the first /
+GRID_KEYWORD_TABLE = {
+    'INCLUDE': KeywordRule('INCLUDE', end='include'),
+    'TITLE': KeywordRule('TITLE', end='lines', lines=1),
+}
+# keywords made of several records ending with a line starting with /, their records can start with a keyword name (i.e.: EQUALS)
+for _keyword in ('EQUALS', 'COPY', 'ADD', 'MULTIPLY', 'MINVALUE', 'MAXVALUE', 'OPERATE', 'OPERATER', 'COPYREG', 'ADDREG', 'MULTIREG',
+                 'EQUALREG', 'MULTREGT', 'MULTREGP', 'FAULTS', 'MULTFLT', 'NNC', 'EDITNNC', 'PATHS'):
+    GRID_KEYWORD_TABLE[_keyword] = KeywordRule(_keyword)
+# keywords without data
+for _keyword in ('RUNSPEC', 'GRID', 'EDIT', 'PROPS', 'REGIONS', 'SOLUTION', 'SUMMARY', 'SCHEDULE',
+                 'OIL', 'WATER', 'GAS', 'DISGAS', 'VAPOIL', 'BRINE', 'POLYMER', 'SOLVENT', 'API', 'TEMP', 'THERMAL', 'CO2STORE',
+                 'METRIC', 'FIELD', 'LAB', 'PVT-M', 'UNIFIN', 'UNIFOUT', 'FMTIN', 'FMTOUT', 'MULTIN', 'MULTOUT', 'NOSIM', 'NOINSPEC',
+                 'NORSSPEC', 'IMPES', 'FULLIMP', 'MONITOR', 'NOMONITO', 'NOWARN', 'WARN', 'ECHO', 'NOECHO', 'INIT', 'NEWTRAN',
+                 'OLDTRAN', 'NOGGF', 'NONNC', 'ENDBOX', 'ENDFIN', 'FILLEPS', 'RPTRUNSP', 'SKIP', 'SKIP100', 'SKIP300', 'ENDSKIP'):
+    GRID_KEYWORD_TABLE[_keyword] = KeywordRule(_keyword, end='none')
+
+# any other keyword before the SCHEDULE section
+GRID_RULE = KeywordRule(None, end='record')
+
+
+def grid_keyword_rule(keyword):
+    """
+    returns the KeywordRule for a `keyword` before the SCHEDULE section, by default a single record ending with the first /.
+    """
+    rule = GRID_KEYWORD_TABLE.get(keyword)
+    if rule is None:
+        return GRID_RULE._replace(name=keyword)
+    return rule
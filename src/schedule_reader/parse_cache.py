@@ -0,0 +1,128 @@
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+
+__all__ = ['load_parse_cache', 'save_parse_cache', 'file_signature']
+
+_CACHE_VERSION = 2
+
+
+def file_signature(path, hash_=True):
+    """
+    returns the signature of the file in `path` as a dictionary of its path, size, mtime and (optionally) the sha1 of its content.
+    """
+    stat = os.stat(path)
+    signature = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+    if hash_:
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(chunk)
+        signature['sha1'] = sha1.hexdigest()
+    return signature
+
+
+def _cache_name(filepath, options):
+    key = json.dumps({'path': os.path.abspath(filepath), 'version': _CACHE_VERSION, **options}, sort_keys=True, default=str)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _unchanged(signature):
+    """
+    compare the stored `signature` against the file on disk.
+    The size must match, then a matching mtime is enough, otherwise the content hash is compared.
+    """
+    if not os.path.exists(signature['path']):
+        return False
+    current = file_signature(signature['path'], hash_=False)
+    if current['size'] != signature['size']:
+        return False
+    if current['mtime'] == signature['mtime']:
+        return True
+    return file_signature(signature['path'])['sha1'] == signature['sha1']
+
+
+def load_parse_cache(filepath, cache_dir, options={}, verbose=False):
+    """
+    look in `cache_dir` for a previous parse of `filepath` done with the same `options`.
+
+    Params:
+        filepath: str
+            the path to the .DATA or schedule include file
+        cache_dir: str
+            the folder where the cache files are stored
+        options: dict
+            the parameters of `read_data` that change its output, they are part of the cache key
+        verbose: bool
+            set it to False to skip printing messages.
+
+    Return:
+        the cached schedule dictionary or None if there is no cache or any file in the INCLUDE tree has changed.
+    """
+    name = os.path.join(cache_dir, _cache_name(filepath, options))
+    if not os.path.exists(name + '.manifest') or not os.path.exists(name + '.pkl'):
+        return None
+    try:
+        with open(name + '.manifest', 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != _CACHE_VERSION:
+        return None
+    for signature in manifest['files']:
+        if not _unchanged(signature):
+            if verbose:
+                print(f"cache is outdated, the file changed: {signature['path']}")
+            return None
+    try:
+        with open(name + '.pkl', 'rb') as f:
+            extracted = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if verbose:
+        print(f"loaded schedule from cache: {name}.pkl ({len(manifest['files'])} files checked)")
+    return extracted
+
+
+def _atomic_write(path, data, mode):
+    folder = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.tmp_')
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def save_parse_cache(filepath, cache_dir, visited, extracted, options={}, verbose=False):
+    """
+    store the parsed schedule `extracted` in `cache_dir`, together with the signature of every file `visited` while reading it.
+
+    Params:
+        filepath: str
+            the path to the .DATA or schedule include file
+        cache_dir: str
+            the folder where the cache files are stored, it is created if it doesn't exist
+        visited: list of str
+            the path of every file read, the main file and all its includes
+        extracted: dict
+            the schedule dictionary prepared by `read_data`
+        options: dict
+            the parameters of `read_data` that change its output, they are part of the cache key
+        verbose: bool
+            set it to False to skip printing messages.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    name = os.path.join(cache_dir, _cache_name(filepath, options))
+    manifest = {'version': _CACHE_VERSION,
+                'files': [file_signature(path) for path in dict.fromkeys(visited)]}
+    # the data is written first, so a manifest always points to a complete pickle
+    _atomic_write(name + '.pkl', pickle.dumps(extracted, protocol=pickle.HIGHEST_PROTOCOL), 'wb')
+    _atomic_write(name + '.manifest', json.dumps(manifest), 'w')
+    if verbose:
+        print(f"schedule saved to cache: {name}.pkl")
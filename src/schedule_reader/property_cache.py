@@ -0,0 +1,109 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from .parse_cache import file_signature, _atomic_write
+
+__all__ = ['load_property_cache', 'save_property_cache']
+
+_CACHE_VERSION = 2
+
+
+def _file_hash(path, cache_dir):
+    """
+    the sha1 of the content of the file in `path`. It is stored in `cache_dir` together with the size and mtime of the file,
+    so the file is hashed again only if it changes.
+    """
+    path = os.path.abspath(path)
+    name = os.path.join(cache_dir, hashlib.sha1(path.encode()).hexdigest() + '.sig')
+    current = file_signature(path, hash_=False)
+    try:
+        with open(name, 'r') as f:
+            signature = json.load(f)
+        if signature['size'] == current['size'] and signature['mtime'] == current['mtime']:
+            return signature['sha1']
+    except (OSError, ValueError, KeyError):
+        pass
+    signature = file_signature(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    _atomic_write(name, json.dumps(signature), 'w')
+    return signature['sha1']
+
+
+def _cache_name(path, keyword, cache_dir, size, dtype, offset=0):
+    key = json.dumps({'sha1': _file_hash(path, cache_dir), 'keyword': keyword.upper(), 'size': size, 'offset': offset,
+                      'dtype': None if dtype is None else np.dtype(dtype).str, 'version': _CACHE_VERSION}, sort_keys=True)
+    return os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.npy')
+
+
+def load_property_cache(path, keyword, cache_dir, size=None, dtype=None, verbose=False, offset=0):
+    """
+    look in `cache_dir` for the `keyword` already parsed from the property file in `path` (with the same content).
+    The array is memory-mapped read-only, the processes loading the same property share its pages through the OS.
+
+    Params:
+        path: str
+            the property include file
+        keyword: str
+        cache_dir: str
+            the folder where the cache files are stored
+        size: int, optional
+            the number of cells, from the dimens of the grid
+        dtype: numpy dtype, optional
+            the dtype requested to `read_property`
+        verbose: bool
+            set it to False to skip printing messages.
+        offset: int
+            the position in the file where the keyword was looked for, a repeated keyword is cached once for each copy
+
+    Return:
+        numpy.memmap or None if the property is not in the cache
+    """
+    name = _cache_name(path, keyword, cache_dir, size, dtype, offset)
+    if not os.path.exists(name):
+        return None
+    try:
+        values = np.load(name, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if verbose:
+        print(f"loaded {keyword} from cache: {name}")
+    return values
+
+
+def save_property_cache(path, keyword, cache_dir, values, size=None, dtype=None, verbose=False, offset=0):
+    """
+    store the parsed `values` of the `keyword` from the property file in `path`, as a .npy file in `cache_dir`.
+    The key is the content hash of the file, the keyword, the position it was read from, the number of cells and the dtype.
+
+    Params:
+        path: str
+            the property include file
+        keyword: str
+        cache_dir: str
+            the folder where the cache files are stored, it is created if it doesn't exist
+        values: numpy.ndarray
+        size: int, optional
+            the number of cells, from the dimens of the grid
+        dtype: numpy dtype, optional
+            the dtype requested to `read_property`
+        verbose: bool
+            set it to False to skip printing messages.
+        offset: int
+            the position in the file where the keyword was looked for, a repeated keyword is cached once for each copy
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    name = _cache_name(path, keyword, cache_dir, size, dtype, offset)
+    # written to a temporary file and renamed, a concurrent reader never sees an incomplete array
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, values)
+        os.replace(tmp, name)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    if verbose:
+        print(f"{keyword} saved to cache: {name}")
@@ -1,30 +1,92 @@
+import numpy as np
 import pandas as pd
+from .property_cache import load_property_cache, save_property_cache
 
-__all__ = ['read_keyword_from_include', 'expand_keyword', 'ijk_index', 'get_dimens']
+__all__ = ['read_keyword_from_include', 'iter_keyword_data', 'iter_keywords_data', 'expand_keyword', 'ijk_index', 'ijk_arrays', 'get_dimens', 'parse_property', 'parse_property_runs', 'read_property', 'read_properties', 'property_dtype']
 
-def read_keyword_from_include(path, keyword=None, encoding='cp1252'):
+def iter_keywords_data(path, keywords, encoding='cp1252', chunk_size=1 << 22, offset=0):
     """
-    reads the ASCII include file from the `path`, looks for the `keyword` and extracts its data.
+    streams the ASCII include file from the `path` looking for every one of the `keywords` in a single pass, and yields their data in chunks.
+    The file is read line by line, the comments are removed as the lines are read and only one chunk is kept in memory,
+    so it works on files bigger than the available memory. The file is closed as soon as every keyword is found.
+    Only the first appearance of each keyword is read.
 
-    Returns:
+    Params:
+        path: str
+        keywords: list of str
+            each keyword must be the first word of its line
+        encoding: str
+        chunk_size: int
+            approximated size, in characters, of every chunk. The chunks always end at the end of a line.
+        offset: int
+            the position (in bytes) of the file where to start looking for the keywords, at the beginning of a line.
 
+    Yields:
+        tuple (keyword, str), the data of the keyword without comments, in order of the file
     """
-    with open(path, 'r') as f:
-        keyword_data = ''.join(f.readlines())
-    
-    if keyword not in keyword_data:
+    pending = {keyword.upper() for keyword in keywords}
+    keyword = None
+    chunk, size = [], 0
+    with open(path, 'r', encoding=encoding) as f:
+        if offset > 0:
+            f.seek(offset)
+        for line in f:
+            if keyword is None:
+                # the lines of values can't start a keyword
+                if not line.lstrip()[:1].isalpha():
+                    continue
+                if '--' in line:
+                    line = line[:line.index('--')]
+                words = line.split(None, 1)
+                if len(words) == 0 or words[0].upper() not in pending:
+                    continue
+                keyword = words[0].upper()
+                pending.discard(keyword)
+                line = words[1] if len(words) > 1 else ''
+            elif '--' in line:
+                line = line[:line.index('--')]
+            if '/' in line:
+                chunk.append(line[:line.index('/')])
+                yield keyword, ' '.join(chunk)
+                keyword, chunk, size = None, [], 0
+                if len(pending) == 0:
+                    return
+                continue
+            chunk.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield keyword, ' '.join(chunk)
+                chunk, size = [], 0
+    if keyword is not None and len(chunk) > 0:
+        # the file ended without the ending /
+        yield keyword, ' '.join(chunk)
+
+
+def iter_keyword_data(path, keyword, encoding='cp1252', chunk_size=1 << 22):
+    """
+    streams the ASCII include file from the `path` looking for the `keyword`, and yields its data in chunks,
+    see `iter_keywords_data`.
+
+    Yields:
+        str, the data of the keyword without comments
+    """
+    found = False
+    for _, chunk in iter_keywords_data(path, [keyword], encoding=encoding, chunk_size=chunk_size):
+        found = True
+        yield chunk
+    if not found:
         raise ValueError(f"The requested keyword {keyword} is not in this file {path}")
 
-    i = keyword_data.index(keyword)
-    f = keyword_data.index('/', i)
-    keyword_data = keyword_data[i+len(keyword): f].strip()
 
-    while '--' in keyword_data:
-        i = keyword_data.index('--')
-        f = keyword_data.index('\n', i)
-        keyword_data = keyword_data[:i] + keyword_data[f+1:]
-    
-    return keyword_data
+def read_keyword_from_include(path, keyword=None, encoding='cp1252'):
+    """
+    reads the ASCII include file from the `path`, looks for the `keyword` and extracts its data.
+
+    Returns:
+        str, the data of the keyword without comments
+    """
+    return ' '.join(iter_keyword_data(path, keyword, encoding=encoding)).strip()
+
 
 def expand_keyword(string):
     """
@@ -37,34 +99,226 @@ def expand_keyword(string):
          for each in string.split()]
     )
 
-def ijk_index(i, j=None, k=None):
+def property_dtype(keyword):
+    """
+    the numpy dtype of the `keyword`: int32 for ACTNUM and region keywords like SATNUM or FIPNUM, float64 for the others.
+    """
+    keyword = keyword.upper()
+    return np.int32 if keyword == 'ACTNUM' or keyword.endswith('NUM') else np.float64
+
+
+def parse_property(keyword_data, dtype=np.float64):
+    """
+    parse the string readout from the property keyword into a numpy array, expanding the N*value repeats.
+    The values are parsed by numpy and the repeats are expanded with `numpy.repeat`, no string is built per cell.
+    A defaulted repeat like N* is NaN (or raises ValueError for integer dtypes).
+
+    Params:
+        keyword_data: str
+            the data of the keyword, as returned by `read_keyword_from_include`
+        dtype: numpy dtype
+            float64, float32, int32, ...
+
+    Return:
+        numpy.ndarray of `dtype`
+    """
+    values, counts = parse_property_runs(keyword_data)
+    if counts is not None:
+        values = np.repeat(values, counts)
+    return _as_dtype(values, dtype)
+
+
+def _as_dtype(values, dtype):
+    if np.issubdtype(np.dtype(dtype), np.integer):
+        if np.isnan(values).any():
+            raise ValueError("defaulted values (N*) can't be parsed to an integer dtype.")
+    return values.astype(dtype, copy=False)
+
+
+def parse_property_runs(keyword_data):
+    """
+    parse the string readout from the property keyword into its values and repeat counts, without expanding the N*value repeats.
+
+    Params:
+        keyword_data: str
+            the data of the keyword, as returned by `read_keyword_from_include`
+
+    Return:
+        tuple (numpy.ndarray of float64 values, numpy.ndarray of int64 counts or None if there are no repeats)
+    """
+    try:
+        if '*' not in keyword_data:
+            return np.array(keyword_data.split(), dtype=np.float64), None
+        # split every token in (count, '*', value), the tokens without repeat have count 1
+        head, star, tail = np.char.partition(np.array(keyword_data.split()), '*').T
+        repeated = star == '*'
+        counts = np.where(repeated, head, '1').astype(np.int64)
+        values = np.where(repeated, tail, head)
+        # the defaulted repeats (N*) have no value, they are NaN once the others are converted
+        defaulted = values == ''
+        values = np.where(defaulted, '0', values).astype(np.float64)
+        values[defaulted] = np.nan
+        return values, counts
+    except ValueError as error:
+        raise ValueError(f"the property data has values that are not numbers ({error}): {keyword_data[:80]}")
+
+
+def read_property(path, keyword, dtype=None, encoding='cp1252', size=None, chunk_size=1 << 22, cache_dir=None, verbose=False):
+    """
+    reads the `keyword` from the ASCII include file in the `path` into a numpy array.
+    The file is streamed and every chunk is parsed as it is read, the text of the whole keyword is never in memory.
+
+    Params:
+        path: str
+        keyword: str
+        dtype: numpy dtype, optional
+            by default from `property_dtype`: int32 for ACTNUM and *NUM keywords, float64 for the others.
+        encoding: str
+        size: int, optional
+            the number of cells, if known the array is allocated once and filled while reading.
+        chunk_size: int
+            approximated size, in characters, of the text parsed at once.
+        cache_dir: str, optional
+            folder for the binary cache of the parsed properties, see `read_properties`.
+        verbose: bool
+            set it to False to skip printing messages.
+
+    Return:
+        numpy.ndarray
+    """
+    return read_properties(path, [keyword], None if dtype is None else {keyword: dtype}, encoding, size, chunk_size,
+                           cache_dir, verbose)[keyword.upper()]
+
+
+def read_properties(path, keywords, dtypes=None, encoding='cp1252', size=None, chunk_size=1 << 22, cache_dir=None, verbose=False, offset=0):
+    """
+    reads all the `keywords` from the ASCII include file in the `path` into numpy arrays, in a single pass over the file.
+
+    Params:
+        path: str
+        keywords: list of str
+        dtypes: dict {keyword: numpy dtype}, optional
+            by default from `property_dtype`: int32 for ACTNUM and *NUM keywords, float64 for the others.
+        encoding: str
+        size: int, optional
+            the number of cells, if known each array is allocated once and filled while reading.
+        chunk_size: int
+            approximated size, in characters, of the text parsed at once.
+        cache_dir: str, optional
+            folder for a binary cache of the parsed properties, keyed by the content hash of the file, the keyword, the `offset`, the `size` and the dtype.
+            The properties found in the cache are memory-mapped read-only instead of parsed, so processes loading the same
+            property share its memory. The other properties are parsed and saved to the cache.
+        verbose: bool
+            set it to False to skip printing messages.
+        offset: int
+            the position (in bytes) of the file where to start looking for the keywords, i.e.: from `index_properties`.
+
+    Return:
+        dict {keyword: numpy.ndarray}, in the order of `keywords`
+    """
+    keywords = [keyword.upper() for keyword in keywords]
+    dtypes = {} if dtypes is None else {keyword.upper(): dtype for keyword, dtype in dtypes.items()}
+    dtypes = {keyword: dtypes.get(keyword) or property_dtype(keyword) for keyword in keywords}
+    values = {}
+    if cache_dir is not None:
+        for keyword in keywords:
+            cached = load_property_cache(path, keyword, cache_dir, size, dtypes[keyword], verbose, offset)
+            if cached is not None:
+                values[keyword] = cached
+    pending = [keyword for keyword in keywords if keyword not in values]
+    if len(pending) > 0:
+        chunks = {}
+        for keyword, chunk in iter_keywords_data(path, pending, encoding, chunk_size, offset):
+            chunks.setdefault(keyword, _PropertyBuilder(keyword, dtypes[keyword], size)).append(parse_property(chunk, dtypes[keyword]))
+        missing = [keyword for keyword in pending if keyword not in chunks]
+        if len(missing) > 0:
+            raise ValueError(f"The requested keywords {', '.join(missing)} are not in this file {path}")
+        for keyword in pending:
+            values[keyword] = chunks[keyword].finalize()
+            if cache_dir is not None:
+                save_property_cache(path, keyword, cache_dir, values[keyword], size, dtypes[keyword], verbose, offset)
+    return {keyword: values[keyword] for keyword in keywords}
+
+
+class _PropertyBuilder(object):
+    """
+    puts together the parsed chunks of one property, into an array allocated once if the `size` is known.
+    """
+    def __init__(self, keyword, dtype, size=None):
+        self.keyword = keyword
+        self.size = size
+        self.filled = 0
+        self.chunks = [] if size is None else None
+        self.values = None if size is None else np.empty(size, dtype=dtype)
+
+    def append(self, chunk):
+        if self.size is None:
+            self.chunks.append(chunk)
+            return
+        if self.filled + len(chunk) > self.size:
+            raise ValueError(f"the keyword {self.keyword} has more than the {self.size} values expected.")
+        self.values[self.filled:self.filled + len(chunk)] = chunk
+        self.filled += len(chunk)
+
+    def finalize(self):
+        if self.size is None:
+            return self.chunks[0] if len(self.chunks) == 1 else np.concatenate(self.chunks)
+        if self.filled < self.size:
+            raise ValueError(f"the keyword {self.keyword} has {self.filled} values, {self.size} expected.")
+        return self.values
+
+
+def _ijk_dimens(i, j=None, k=None):
     if j is None and k is None and hasattr(i, '__iter__') and len(i) == 3 \
         and i[0] is not None and i[1] is not None and i[2] is not None:
         i, j, k = i[0], i[1], i[2]
     elif j is None or k is None:
         raise ValueError(f"must provide i, j, k or a tuple of (i, j, k), but received i={i}, j={j}, k={k}")
+    return int(i), int(j), int(k)
+
+
+def ijk_arrays(i, j=None, k=None):
+    """
+    the I, J and K (1-based) of every cell of the grid, in the order of the property keywords (I moves first, then J, then K).
+    Built by repeating the ranges of each axis, no tuple is created per cell.
+
+    Params:
+        i, j, k: int
+            the grid dimensions, or a tuple (NX, NY, NZ) as `i`
+
+    Return:
+        tuple of three numpy.ndarray of int32
+    """
+    i, j, k = _ijk_dimens(i, j, k)
+    return (np.tile(np.arange(1, i + 1, dtype=np.int32), j * k),
+            np.tile(np.repeat(np.arange(1, j + 1, dtype=np.int32), i), k),
+            np.repeat(np.arange(1, k + 1, dtype=np.int32), i * j))
+
+
+def ijk_index(i, j=None, k=None):
+    """
+    pandas.MultiIndex of the (I, J, K) of every cell of the grid, in the order of the property keywords.
+    The index is built from its levels and integer codes, no tuple is created per cell.
+    """
+    i, j, k = _ijk_dimens(i, j, k)
+    # the codes are the 0-based I, J, K
+    codes = [each - 1 for each in ijk_arrays(i, j, k)]
+    return pd.MultiIndex(levels=[np.arange(1, i + 1), np.arange(1, j + 1), np.arange(1, k + 1)],
+                         codes=codes, names=['I', 'J', 'K'], verify_integrity=False)
 
-    cells = [(i_, j_, k_)
-             for k_ in range(1, k+1)
-             for j_ in range(1, j+1)
-             for i_ in range(1, i+1)
-             ]
-    return pd.MultiIndex.from_tuples(cells)
 
 def get_dimens(path, encoding='cp1252'):
     """
     reads the ASCII .DATA file and returns a three items tuple with the DIMENS keyword data.
+    DIMENS is located by `index_properties`, so it is found in the INCLUDE files too.
+    The deck is read only up to the DIMENS keyword.
+
+    Return:
+        tuple of int (NX, NY, NZ), or (None, None, None) if DIMENS is not in the deck
     """
-    with open(path, 'r') as f:
-        keyword_data = ''.join(f.readlines())
-    
-    keyword = 'DIMENS'
-    if keyword not in keyword_data:
+    from .grid_section import index_properties  # grid_section imports this module
+    locations = index_properties(path, ['DIMENS'], encoding=encoding, first=True).get('DIMENS')
+    if locations is None:
         return (None, None, None)
-    
-    i = keyword_data.index(keyword)    
-    f = keyword_data.index('/', i)
-    keyword_data = keyword_data[i+len(keyword): f].strip()
-
-    return tuple(keyword_data.split())
-    
\ No newline at end of file
+    keyword_data = ' '.join(chunk for _, chunk in iter_keywords_data(locations[0].path, ['DIMENS'], encoding=encoding, offset=locations[0].offset))
+    return tuple(int(each) for each in keyword_data.split()[:3])
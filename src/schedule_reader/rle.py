@@ -0,0 +1,147 @@
+import numpy as np
+from .property_keywords import iter_keyword_data, parse_property_runs, property_dtype, _as_dtype
+
+__all__ = ['RLEProperty', 'read_property_rle']
+
+
+class RLEProperty(object):
+    """
+    run-length encoded grid property, for keywords written as a few N*value runs like ACTNUM, SATNUM, FIPNUM, PVTNUM or EQLNUM.
+    Only the value and the length of each run are stored, the array of cells is built only if `expand` is called.
+
+    Attributes:
+        keyword: str
+        values: numpy.ndarray
+            the value of each run, two consecutive runs never have the same value
+        lengths: numpy.ndarray of int64
+            the number of cells of each run
+        ends: numpy.ndarray of int64
+            the flat cell index (0-based) after the last cell of each run
+
+    Example:
+        satnum = read_property_rle('grid.grdecl', 'SATNUM')
+        satnum.counts()            # {1: 1200000, 2: 800000}
+        satnum[[0, 10, 1500000]]   # values at these flat cell indexes
+        satnum.sum_by_value(pore_volume)
+    """
+    def __init__(self, values, lengths, keyword=None):
+        values = np.asarray(values)
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if len(values) > 1:
+            # merge consecutive runs of the same value
+            starts = np.concatenate(([True], values[1:] != values[:-1]))
+            if not starts.all():
+                values = values[starts]
+                lengths = np.add.reduceat(lengths, np.flatnonzero(starts))
+        self.keyword = keyword
+        self.values = values
+        self.lengths = lengths
+        self.ends = np.cumsum(lengths)
+
+    @classmethod
+    def from_array(cls, array, keyword=None):
+        """
+        encode a full array of cells.
+        """
+        array = np.asarray(array)
+        if len(array) == 0:
+            return cls(array, np.zeros(0, dtype=np.int64), keyword)
+        starts = np.flatnonzero(np.concatenate(([True], array[1:] != array[:-1])))
+        return cls(array[starts], np.diff(np.append(starts, len(array))), keyword)
+
+    def __len__(self):
+        return int(self.ends[-1]) if len(self.ends) > 0 else 0
+
+    def __repr__(self):
+        return f"RLEProperty({self.keyword}, {len(self)} cells in {len(self.values)} runs)"
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.lengths.nbytes + self.ends.nbytes
+
+    def expand(self):
+        """
+        the full array of cells.
+        """
+        return np.repeat(self.values, self.lengths)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.expand()
+        return array if dtype is None else array.astype(dtype)
+
+    def __getitem__(self, cells):
+        """
+        the values at the flat cell indexes (0-based) `cells`, an int or an array of ints.
+        """
+        scalar = np.ndim(cells) == 0
+        cells = np.atleast_1d(np.asarray(cells, dtype=np.int64))
+        cells = np.where(cells < 0, cells + len(self), cells)
+        if len(cells) > 0 and (cells.min() < 0 or cells.max() >= len(self)):
+            raise IndexError(f"cell index out of range for {len(self)} cells")
+        values = self.values[np.searchsorted(self.ends, cells, side='right')]
+        return values[0] if scalar else values
+
+    def counts(self):
+        """
+        the number of cells of each value, as a dictionary {value: cells}.
+        """
+        unique, inverse = np.unique(self.values, return_inverse=True)
+        return dict(zip(unique.tolist(), np.bincount(inverse, weights=self.lengths).astype(np.int64).tolist()))
+
+    def mask(self, values):
+        """
+        RLEProperty of bool, True where the cell has any of the `values`.
+        """
+        return RLEProperty(np.isin(self.values, values), self.lengths, self.keyword)
+
+    def ranges(self, value):
+        """
+        the (start, stop) flat cell indexes of the runs with the `value`, as an array of shape (runs, 2).
+        """
+        selected = self.values == value
+        return np.stack([self.ends[selected] - self.lengths[selected], self.ends[selected]], axis=1)
+
+    def sum_by_value(self, weights):
+        """
+        sum of the `weights` (a full array of cells, i.e.: pore volume) of the cells of each value, as a dictionary {value: sum}.
+        """
+        weights = np.asarray(weights)
+        if len(weights) != len(self):
+            raise ValueError(f"weights must have {len(self)} cells, received {len(weights)}")
+        if len(self.values) == 0:
+            return {}
+        sums = np.add.reduceat(weights, self.ends - self.lengths)
+        unique, inverse = np.unique(self.values, return_inverse=True)
+        return dict(zip(unique.tolist(), np.bincount(inverse, weights=sums).tolist()))
+
+
+def read_property_rle(path, keyword, dtype=None, encoding='cp1252', chunk_size=1 << 22):
+    """
+    reads the `keyword` from the ASCII include file in the `path` as a RLEProperty, the N*value repeats are never expanded.
+
+    Params:
+        path: str
+        keyword: str
+        dtype: numpy dtype, optional
+            by default from `property_dtype`: int32 for ACTNUM and *NUM keywords, float64 for the others.
+        encoding: str
+        chunk_size: int
+            approximated size, in characters, of the text parsed at once.
+
+    Return:
+        RLEProperty
+    """
+    if dtype is None:
+        dtype = property_dtype(keyword)
+    values, lengths = [], []
+    for chunk in iter_keyword_data(path, keyword, encoding, chunk_size):
+        chunk_values, chunk_counts = parse_property_runs(chunk)
+        values.append(_as_dtype(chunk_values, dtype))
+        lengths.append(np.ones(len(chunk_values), dtype=np.int64) if chunk_counts is None else chunk_counts)
+    if len(values) == 0:
+        return RLEProperty(np.zeros(0, dtype=dtype), np.zeros(0, dtype=np.int64), keyword.upper())
+    return RLEProperty(np.concatenate(values), np.concatenate(lengths), keyword.upper())
@@ -1,65 +1,57 @@
 import pandas as pd
 import numpy as np
 from .dates import parse_dates
+from .columnar import ColumnarSchedule
+from .data_reader import ScheduleDict
+from .schemas import build_table
 
-def extract_keyword(schedule_dict, keyword: str=None, record_names=None): 
+def extract_keyword(schedule_dict, keyword: str=None, record_names=None, errors='coerce'):
     """
     from the provided schedule dictionay `schedule_dict` extract the desired `keyword`, create a DataFrame and set the column names as the `record_names` provided (optional).
+    The columns of the keywords in `schemas.SCHEMAS` are named and typed by their schema.
 
     Params:
-        schedule_dict: dict
+        schedule_dict: dict, ScheduleDict or ColumnarSchedule
             shedule dictionary prepared by the .data_reader.read_data function
         keyword: str
             the desired keyword to be extracted
         record_names: list of str
             a list with the name of the record names for the `keyword`
+        errors: str
+            'coerce' to set the items of the numeric columns that are not numbers to NaN with a warning, or 'raise'
     
     Return:
         pandas.DataFrame
     """
-    result_table = {}
+    # the columnar schedule already has the records of every keyword together, only that slice is read
+    if isinstance(schedule_dict, ColumnarSchedule):
+        if keyword == 'DATES':
+            return pd.Series(schedule_dict.date_table, name='DATES')
+        if keyword not in schedule_dict.keywords:
+            return build_table([], [], [], keyword, record_names, errors)
+        columns = schedule_dict.keywords[keyword]
+        return build_table(columns.positions, schedule_dict.record_datetimes(keyword), schedule_dict.records(keyword), keyword, record_names, errors)
 
     # extract only the dates, all the dates
     if keyword == 'DATES':
+        if isinstance(schedule_dict, ScheduleDict) and schedule_dict.has_dates:
+            return pd.Series(schedule_dict.date_table, name='DATES')
         result_table = [schedule_dict[each]['DATES'] for each in schedule_dict if 'DATES' in schedule_dict[each]]
         return pd.Series(parse_dates(result_table), name='DATES')
 
     # look for especified keyword, only keep the last previous date
+    index, dates, records = [], [], []
+    date = None
     for each in schedule_dict:
         if 'DATES' in schedule_dict[each]:
             date = schedule_dict[each]['DATES']
         elif keyword in schedule_dict[each]:
-            result_table[each] = [date] + (schedule_dict[each][keyword] 
-                                           if type(schedule_dict[each][keyword]) is list 
-                                           else [schedule_dict[each][keyword]])
-    
-    _len = [len(result_table[each]) for each in result_table]
-    if len(_len) > 0 and max(_len) != min(_len):
-        _len = max(_len)
-        result_table = {each: result_table[each] + (['1*'] * (_len - len(result_table[each]))) for each in result_table}
+            record = schedule_dict[each][keyword]
+            index.append(each)
+            dates.append(date)
+            records.append(record if type(record) is list else [record])
 
-    if record_names is not None:
-        if len(record_names) > 0 and not str(record_names[0]).lower().startswith('date'):
-            record_names = ['date'] + record_names
-        result = pd.DataFrame(data=result_table).transpose()
-        if len(result.columns) == 0:
-            pass
-        elif len(result.columns) >= len(record_names):
-            record_names = record_names + [i for i in range(len(record_names), len(result.columns))]
-            result.columns = record_names
-        elif len(result.columns) < len(record_names):
-            print(f"The last {len(record_names) - len(result.columns)} records were not present in the dataset.")
-            result = pd.DataFrame(data=result_table).transpose()
-            result.columns = record_names[:len(result.columns)]
-            result.loc[:, record_names[len(result.columns):]] = None
-    else:
-        result = pd.DataFrame(data=result_table).transpose()
-        record_names = ['date'] + [i for i in range(1, len(result.columns))]
-        result.columns = record_names
-    
-    result[result.select_dtypes(object).columns] = result.select_dtypes(object)\
-        .apply(lambda col : col.str.strip(""""'" """))\
-        .replace('1*', np.nan)\
-        .convert_dtypes(infer_objects=True, convert_string=False, 
-                        convert_integer=True, convert_boolean=True, convert_floating=True)  # dtype_backend='numpy_nullable'
-    return result
\ No newline at end of file
+    # the dates looked up in the date table of the schedule, if it has one
+    if isinstance(schedule_dict, ScheduleDict) and schedule_dict.has_dates:
+        dates = schedule_dict.record_dates(index)
+    return build_table(index, dates, records, keyword, record_names, errors)
@@ -0,0 +1,196 @@
+import warnings
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from .dates import date_table
+
+__all__ = ['Column', 'SCHEMAS', 'register_schema', 'keyword_schema', 'build_table']
+
+# types of the columns:
+#   'str':      text, the quotes are removed
+#   'category': text stored as pandas.Categorical, for names repeated along the schedule like the wells
+#   'float':    float64, NaN where the item is defaulted (and there is no default value)
+#   'int':      int64 if the column has a default value, else pandas nullable Int64
+#   'auto':     text with the quotes removed, then converted by pandas `convert_dtypes`
+Column = namedtuple('Column', ['name', 'dtype', 'default'], defaults=['auto', None])
+Column.__doc__ = """
+declaration of one item of the records of a keyword, used by `build_table`.
+
+Params:
+    name: str
+        the column name in the DataFrame
+    dtype: str
+        one of 'str', 'category', 'float', 'int' or 'auto'
+    default: optional
+        the value used where the item is defaulted (1*) or not present in the record
+"""
+
+_COMPDAT = [Column('I', 'int', 0), Column('J', 'int', 0), Column('K_up', 'int', 0), Column('K_low', 'int', 0),
+            Column('status', 'category', 'OPEN'), Column('saturation table', 'int'), Column('transimissibility factor', 'float'),
+            Column('well bore diameter', 'float'), Column('Kh', 'float'), Column('skin', 'float', 0.0), Column('D-factor', 'float'),
+            Column('direction', 'category', 'Z'), Column('pressure equivalent radius', 'float')]
+_WELSPECS = [Column('I', 'int', 0), Column('J', 'int', 0), Column('reference depth', 'float'), Column('preferred phase', 'str'),
+             Column('drainage radius', 'float'), Column('inflow equation', 'str'), Column('automatic shut-in', 'str'),
+             Column('crossflow', 'str'), Column('pressure table', 'int'), Column('density calculation', 'str'),
+             Column('FIP region', 'int'), Column('_reserved1', 'str'), Column('_reserved2', 'str'), Column('well model', 'str'),
+             Column('polymer', 'str')]
+
+SCHEMAS = {
+    'COMPDAT': [Column('well', 'category')] + _COMPDAT,
+    'COMPDATL': [Column('well', 'category'), Column('local grid', 'str')] + _COMPDAT,
+    'WELSPECS': [Column('well', 'category'), Column('group', 'str')] + _WELSPECS,
+    'WELSPECL': [Column('well', 'category'), Column('group', 'str'), Column('local grid', 'str')] + _WELSPECS,
+    'WELLSPEC': [Column('well', 'category'), Column('group', 'str'), Column('I', 'int', 0), Column('J', 'int', 0),
+                 Column('reference depth', 'float'), Column('separator name', 'str'), Column('FIP region', 'int')],
+    'WCONPROD': [Column('well', 'category'), Column('status', 'str', 'OPEN'), Column('control mode', 'str', '')]
+                + [Column(name, 'float') for name in ['OIL rate', 'WATER rate', 'GAS rate', 'LIQUID rate', 'RESERVOIR fluid rate',
+                                                      'BHP limit', 'THP limit']]
+                + [Column('VFP', 'int'), Column('ALQ', 'float', 0.0)]
+                + [Column(name, 'float') for name in ['wet gas rate', 'total molar rate', 'steam rate', 'pressure offset',
+                                                      'temperature offset', 'calorific target rate', 'linearly combined rate', 'NGL rate']],
+    'WCONINJE': [Column('well', 'category'), Column('injector type', 'str'), Column('status', 'str', 'OPEN'), Column('control mode', 'str')]
+                + [Column(name, 'float') for name in ['SURFACE fluid rate', 'RESERVOIR fluid rate', 'BHP limit', 'THP limit']]
+                + [Column('VFP', 'int')]
+                + [Column(name, 'float', 0.0) for name in ['vap oil concentration', 'thermal ratio of gas to steam', 'OIL proportion',
+                                                           'WATER proportion', 'GAS proportion', 'ratio of oil oil to steam']],
+    'WCONHIST': [Column('well', 'category'), Column('status', 'str', 'OPEN'), Column('control mode', 'str')]
+                + [Column(name, 'float', 0.0) for name in ['OIL rate', 'WATER rate', 'GAS rate']]
+                + [Column('VFP', 'int'), Column('ALQ', 'float')]
+                + [Column(name, 'float', 0.0) for name in ['THP limit', 'BHP limit', 'wet gas rate', 'NGL rate']],
+    'WCONINJH': [Column('well', 'category'), Column('injector type', 'str'), Column('status', 'str', 'OPEN')]
+                + [Column(name, 'float', 0.0) for name in ['injection rate', 'BHP', 'THP']]
+                + [Column('VFP', 'int')]
+                + [Column(name, 'float', 0.0) for name in ['vap oil concentration', 'OIL proportion', 'WATER proportion', 'GAS proportion']]
+                + [Column('control model', 'str', 'RATE')],
+}
+SCHEMAS['COMPDATM'] = SCHEMAS['COMPDATL']
+
+# the items that mean "default value"
+_DEFAULTED = frozenset(['1*', "'1*'", '"1*"'])
+
+
+def register_schema(keyword, columns):
+    """
+    add or replace the schema used by `extract_keyword` to build the DataFrame of a keyword.
+
+    Params:
+        keyword: str
+        columns: list of Column, or list of (name, dtype, default) tuples
+            one for each item of the records, without the date
+    """
+    SCHEMAS[keyword.upper()] = [column if isinstance(column, Column) else Column(*column) for column in columns]
+    return SCHEMAS[keyword.upper()]
+
+
+def keyword_schema(keyword):
+    """
+    returns the list of Column of the `keyword` or None if it has no schema.
+    """
+    return SCHEMAS.get(keyword)
+
+
+def _to_float(values, name=None, errors='coerce'):
+    """
+    converts the numeric items that numpy can't read: Fortran exponents (1.0D3) are read as 1.0E3,
+    the items that are not numbers are reported by a warning and set to NaN, or raise a ValueError if `errors` is 'raise'.
+    """
+    values = pd.Series([value.replace('D', 'E').replace('d', 'e') if type(value) is str else value for value in values], dtype=object)
+    numbers = pd.to_numeric(values, errors='coerce')
+    failed = numbers.isna() & values.notna() & ~values.astype(str).str.strip().str.lower().isin(['nan', ''])
+    if failed.any():
+        message = f"the column {name} has {failed.sum()} items that are not numbers: {', '.join(map(str, values[failed].unique()[:5]))}"
+        if errors == 'raise':
+            raise ValueError(message)
+        warnings.warn(message + ", they are set to NaN.")
+    return numbers.to_numpy(dtype=float)
+
+
+def _column(items, dtype, default, name=None, errors='coerce'):
+    """
+    converts the items (str or None) of one column of the records into its typed values.
+    """
+    if dtype in ('float', 'int'):
+        fill = np.nan if default is None else default
+        values = [fill if item is None or item in _DEFAULTED else item for item in items]
+        try:
+            values = np.array(values, dtype=float)
+        except ValueError:
+            values = _to_float(values, name, errors)
+        if dtype == 'float':
+            return values
+        missing = np.isnan(values)
+        if not np.array_equal(values[~missing], np.trunc(values[~missing])):
+            return values  # not integer values, kept as float
+        if default is not None and not missing.any():
+            return values.astype(np.int64)
+        return pd.array(values, dtype='Int64')
+    fill = np.nan if default is None else default
+    values = [fill if item is None or item in _DEFAULTED else item.strip(""""'" """) for item in items]
+    if dtype == 'category':
+        return pd.Categorical(values)
+    if dtype == 'str':
+        return np.array(values, dtype=object)
+    return pd.Series(values, dtype=object).convert_dtypes(infer_objects=True, convert_string=False, convert_integer=True,
+                                                          convert_boolean=True, convert_floating=True).array
+
+
+def build_table(index, dates, records, keyword=None, record_names=None, errors='coerce'):
+    """
+    builds the DataFrame of the records of one keyword, every column is converted to its type in one pass over its items.
+
+    Params:
+        index: list of int
+            the position of each record in the schedule
+        dates: numpy.ndarray of datetime64 or list of str
+            the DATES in effect for each record
+        records: numpy.ndarray of object, shape (records, items), or list of lists of str
+            the items of each record, None or '1*' where defaulted
+        keyword: str, optional
+            the keyword, to use its schema from SCHEMAS
+        record_names: list of str, optional
+            the column names, replacing the names of the schema
+        errors: str
+            'coerce' to set the items of the numeric columns that are not numbers to NaN with a warning, or 'raise'
+
+    Return:
+        pandas.DataFrame
+    """
+    if not isinstance(records, np.ndarray) or records.ndim != 2:
+        width = max([len(record) for record in records], default=0)
+        if any(len(record) != width for record in records):
+            records = [record + [None] * (width - len(record)) for record in records]
+        matrix = np.empty((len(records), width), dtype=object)
+        if width > 0:
+            matrix[:] = records
+        records = matrix
+
+    schema = keyword_schema(keyword) if keyword is not None else None
+    schema = [] if schema is None else list(schema)
+    date_name = 'date'
+    if record_names is not None:
+        if len(record_names) > 0 and str(record_names[0]).lower().startswith('date'):
+            date_name, record_names = record_names[0], record_names[1:]
+        schema = [Column(name) if i >= len(schema) else schema[i]._replace(name=name) for i, name in enumerate(record_names)]
+
+    width = records.shape[1]
+    if len(schema) == 0 and width > 0:
+        # the columns are named by its position, as there is no schema
+        schema = [Column(i) for i in range(1, width + 1)]
+    elif record_names is not None and width < len(schema) and keyword_schema(keyword) is None:
+        print(f"The last {len(schema) - width} records were not present in the dataset.")
+    # the items after the last named column keep their position as name
+    schema = schema + [Column(i + 1) for i in range(len(schema), width)]
+
+    if not np.issubdtype(np.asarray(dates).dtype, np.datetime64):
+        dates = date_table(list(dates))
+    data = {date_name: np.asarray(dates, dtype='datetime64[ns]')}
+    missing = [None] * len(index)
+    for i, column in enumerate(schema):
+        if i < width:
+            data[column.name] = _column(records[:, i], column.dtype, column.default, column.name, errors)
+        elif keyword_schema(keyword) is not None:
+            # the schema columns not present in any record take their default
+            data[column.name] = _column(missing, column.dtype, column.default)
+        else:
+            data[column.name] = np.array(missing, dtype=object)
+    return pd.DataFrame(data, index=pd.Index(index))
@@ -1,9 +1,16 @@
 import pandas as pd
-import numpy as np
-from .dates import parse_dates
 from .schedule_keywords import extract_keyword
 
 
+def _ffill_vfp(wcon_table):
+    """
+    a defaulted VFP table in WCONHIST or WCONINJH keeps the previous one of the well. The table is updated in place.
+    """
+    if len(wcon_table) > 0:
+        wcon_table['VFP'] = wcon_table.groupby('well', observed=True)['VFP'].ffill()
+    return wcon_table
+
+
 def extract_wconprod(schedule_dict):
     """
     Shortcut for `extract_keyword` for the WCONPROD keyword.
@@ -16,21 +23,7 @@ def extract_wconprod(schedule_dict):
     Return:
         pandas.DataFrame
     """
-    wconprod_columns = ['date', 'well', 'status', 'control mode', 'OIL rate', 'WATER rate', 'GAS rate', 'LIQUID rate', 'RESERVOIR fluid rate', 
-                        'BHP limit', 'THP limit', 'VFP', 'ALQ',
-                        'wet gas rate', 'total molar rate', 'steam rate',
-                        'pressure offset', 'temperature offset', 'calorific target rate', 'linearly combined rate', 'NGL rate'] 
-    wconprod_table = extract_keyword(schedule_dict, 'WCONPROD', wconprod_columns)  # {}
-    if len(wconprod_table) > 0:
-        wconprod_table['date'] = parse_dates(wconprod_table['date'].to_list())  # to parse dates exactly as stated by DATES eclipse format
-        wconprod_table['well'] = [well.strip("'") for well in wconprod_table['well']]
-        wconprod_table['well'] = wconprod_table['well'].astype('category')
-        wconprod_table.replace('1*', np.nan, inplace=True)
-        wconprod_table.replace("'1*'", np.nan, inplace=True)
-        wconprod_table.loc[:, 'status'].fillna('OPEN', inplace=True)
-        wconprod_table.loc[:, 'control mode'].fillna('', inplace=True)
-        wconprod_table.loc[:, 'status'].fillna('OPEN', inplace=True)
-        wconprod_table.loc[:, 'ALQ'].fillna(0, inplace=True)
+    wconprod_table = extract_keyword(schedule_dict, 'WCONPROD')  # columns, types and defaults from schemas.SCHEMAS
     return wconprod_table
 
 
@@ -46,18 +39,7 @@ def extract_wconinje(schedule_dict):
     Return:
         pandas.DataFrame
     """
-    wconinje_columns = ['date', 'well', 'injector type', 'status', 'control mode', 'SURFACE fluid rate', 'RESERVOIR fluid rate', 'BHP limit', 'THP limit', 'VFP',
-                        'vap oil concentration', 'thermal ratio of gas to steam', 'OIL proportion', 'WATER proportion', 'GAS proportion', 'ratio of oil oil to steam'] 
-    wconinje_table = extract_keyword(schedule_dict, 'WCONINJE', wconinje_columns)  # {}
-    if len(wconinje_table) > 0:
-        wconinje_table['date'] = parse_dates(wconinje_table['date'].to_list())  # to parse dates exactly as stated by DATES eclipse format
-        wconinje_table['well'] = [well.strip("'") for well in wconinje_table['well']]
-        wconinje_table['well'] = wconinje_table['well'].astype('category')
-        wconinje_table.replace('1*', np.nan, inplace=True)
-        wconinje_table.replace("'1*'", np.nan, inplace=True)
-        wconinje_table.loc[:, 'status'].fillna('OPEN', inplace=True)
-        wconinje_table.loc[:, ['vap oil concentration', 'thermal ratio of gas to steam', 
-                               'OIL proportion', 'WATER proportion', 'GAS proportion', 'ratio of oil oil to steam']].fillna(0, inplace=True)
+    wconinje_table = extract_keyword(schedule_dict, 'WCONINJE')  # columns, types and defaults from schemas.SCHEMAS
     return wconinje_table
 
 
@@ -73,18 +55,8 @@ def extract_wconhist(schedule_dict):
     Return:
         pandas.DataFrame
     """
-    wconhist_columns = ['date', 'well', 'status', 'control mode', 'OIL rate', 'WATER rate', 'GAS rate', 'VFP', 'ALQ',
-                        'THP limit', 'BHP limit', 'wet gas rate', 'NGL rate']
-    wconhist_table = extract_keyword(schedule_dict, 'WCONHIST', wconhist_columns)  # {}
-    if len(wconhist_table) > 0:
-        wconhist_table['date'] = parse_dates(wconhist_table['date'].to_list())  # to parse dates exactly as stated by DATES eclipse format
-        wconhist_table['well'] = [well.strip("'") for well in wconhist_table['well']]
-        wconhist_table['well'] = wconhist_table['well'].astype('category')
-        wconhist_table.replace('1*', np.nan, inplace=True)
-        wconhist_table.replace("'1*'", np.nan, inplace=True)
-        wconhist_table.loc[:, ['status']].fillna('OPEN', inplace=True)
-        wconhist_table.loc[:, ['OIL rate', 'WATER rate', 'GAS rate', 'THP limit', 'BHP limit', 'wet gas rate', 'NGL rate']].fillna(0, inplace=True)
-        wconhist_table.loc[:, ['VFP']].fillna(method='ffill', inplace=True)
+    wconhist_table = extract_keyword(schedule_dict, 'WCONHIST')  # columns, types and defaults from schemas.SCHEMAS
+    _ffill_vfp(wconhist_table)
     return wconhist_table
 
 
@@ -100,17 +72,6 @@ def extract_wconinjh(schedule_dict):
     Return:
         pandas.DataFrame
     """
-    wconinjh_columns = ['date', 'well', 'injector type', 'status', 'injection rate', 'BHP', 'THP', 'VFP',
-                        'vap oil concentration', 'OIL proportion', 'WATER proportion', 'GAS proportion', 'control model']
-    wconinjh_table = extract_keyword(schedule_dict, 'WCONINJH', wconinjh_columns)  # {}
-    if len(wconinjh_table) > 0:
-        wconinjh_table['date'] = parse_dates(wconinjh_table['date'].to_list())  # to parse dates exactly as stated by DATES eclipse format
-        wconinjh_table['well'] = [well.strip("'") for well in wconinjh_table['well']]
-        wconinjh_table['well'] = wconinjh_table['well'].astype('category')
-        wconinjh_table.replace('1*', np.nan, inplace=True)
-        wconinjh_table.replace("'1*'", np.nan, inplace=True)
-        wconinjh_table.loc[:, ['status']].fillna('OPEN', inplace=True)
-        wconinjh_table.loc[:, ['injection rate', 'BHP', 'THP', 'vap oil concentration', 'OIL proportion', 'WATER proportion', 'GAS proportion',]].fillna(0, inplace=True)
-        wconinjh_table.loc[:, ['VFP']].fillna(method='ffill', inplace=True)
-        wconinjh_table.loc[:, ['control model']].fillna('RATE', inplace=True)
+    wconinjh_table = extract_keyword(schedule_dict, 'WCONINJH')  # columns, types and defaults from schemas.SCHEMAS
+    _ffill_vfp(wconinjh_table)
     return wconinjh_table
@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+from .all_keywords import extract_all
+
+__all__ = ['WellMatrices', 'build_matrices', 'well_matrices']
+
+_SHUT = frozenset(['SHUT', 'STOP'])
+# the control keywords of the wells, a record of any of them replaces the control of the well by the others
+_CONTROLS = ('WCONHIST', 'WCONPROD', 'WCONINJE', 'WCONINJH')
+
+
+def _default_columns(table):
+    """
+    the rate and limit columns of the table: float columns with 'rate' or 'limit' in the name, and BHP and THP of WCONINJH.
+    """
+    return [column for column in table.columns
+            if table[column].dtype == np.float64 and ('rate' in column.lower() or 'limit' in column.lower() or column in ('BHP', 'THP'))]
+
+
+def _is_shut(values):
+    """
+    True for the SHUT and STOP status, each different status is compared only once.
+    """
+    codes, uniques = pd.factorize(values)
+    return np.append([str(status).strip().upper() in _SHUT for status in uniques], False).astype(bool)[codes]
+
+
+def _last_events(cells, order, size):
+    """
+    the position (in `cells`) of the last event of each cell by `order`, -1 for the cells without events.
+    The events with a negative cell are skipped.
+    """
+    last = np.full(size, -1, dtype=np.int64)
+    sort = np.lexsort((order, cells))
+    sort = sort[cells[sort] >= 0]
+    if len(sort) == 0:
+        return last
+    ends = np.flatnonzero(np.append(cells[sort][1:] != cells[sort][:-1], True))
+    last[cells[sort][ends]] = sort[ends]
+    return last
+
+
+def _ffill(last, steps):
+    """
+    forward fill along the report steps of the (wells * steps) flat array of events, -1 before the first event of a well.
+    """
+    last = last.reshape(-1, steps)
+    filled = np.where(last >= 0, np.arange(steps), -1)
+    np.maximum.accumulate(filled, axis=1, out=filled)
+    rows = np.take_along_axis(last, np.maximum(filled, 0), axis=1)
+    rows[filled < 0] = -1
+    return rows
+
+
+def _cells(table, well_column, wells, dates):
+    """
+    the flat (well, report step) cell of each row of the table, -1 for the wells not in the axis.
+    A record is in effect from the last report date up to its date, the records before the first DATES from the first step.
+    """
+    codes, names = pd.factorize(table[well_column])
+    codes = np.append(pd.Index(wells).get_indexer(names.astype(str)), -1)[codes].astype(np.int64)
+    times = table['date'].to_numpy(dtype='datetime64[ns]')
+    steps = np.maximum(np.searchsorted(dates, times, side='right') - 1, 0)
+    steps[np.isnat(times)] = 0
+    return np.where(codes >= 0, codes * len(dates) + steps, -1)
+
+
+class WellMatrices(object):
+    """
+    the controls of one keyword (WCONHIST, WCONPROD, WCONINJE, ...) as dense matrices of wells x report dates.
+
+    Attributes:
+        keyword: str
+        wells: numpy.ndarray of str
+            the rows of the matrices
+        dates: numpy.ndarray of datetime64[ns]
+            the columns of the matrices, the report dates
+        values: dict {column: numpy.ndarray}
+            a C-contiguous (wells, dates) array for each column, NaN before the first record of the well
+        defined: numpy.ndarray of bool
+            True where a record of the keyword is in effect
+        shut: numpy.ndarray of bool
+            True where the well is SHUT or STOP, by the keyword status or WELOPEN
+    """
+    def __init__(self, keyword, wells, dates, values, defined, shut):
+        self.keyword = keyword
+        self.wells = wells
+        self.dates = dates
+        self.values = values
+        self.defined = defined
+        self.shut = shut
+
+    def __repr__(self):
+        return f"WellMatrices({self.keyword}, {len(self.wells)} wells x {len(self.dates)} dates, {len(self.values)} columns)"
+
+    def __getitem__(self, column):
+        return self.values[column]
+
+    @property
+    def columns(self):
+        return list(self.values)
+
+    def to_dataframe(self, column):
+        """
+        the matrix of the `column` as a DataFrame with the wells as index and the dates as columns.
+        """
+        return pd.DataFrame(self.values[column], index=pd.Index(self.wells, name='well'), columns=pd.DatetimeIndex(self.dates, name='date'))
+
+
+def build_matrices(table, wells=None, dates=None, columns=None, welopen=None, mask=True, dtype=np.float64, keyword=None, ends=None):
+    """
+    materializes the table of an extractor as wells x report dates matrices, forward filled:
+    each record is in effect until the next record of the well. Built with numpy indexing, without pivoting the table.
+
+    Params:
+        table: pandas.DataFrame
+            as returned by `extract_wconhist`, `extract_wconprod`, `extract_wconinje` or `extract_wconinjh`
+        wells: list of str, optional
+            the wells axis, by default the wells of the table (sorted)
+        dates: array of datetime64, optional
+            the report dates axis, by default the dates of the table
+        columns: list of str, optional
+            by default the rate and limit columns
+        welopen: pandas.DataFrame, optional
+            the WELOPEN table from `extract_keyword`, to apply its well SHUT, STOP and OPEN in order with the records
+        mask: bool
+            set the rates to zero where the well is SHUT or STOP
+        dtype: numpy dtype
+            float64 by default, float32 halves the memory
+        keyword: str, optional
+            only the name stored in the result
+        ends: list of pandas.DataFrame, optional
+            the tables of the other control keywords: a record of the well in any of them ends the record of the table in effect,
+            i.e.: the WCONHIST rates of a well are not in effect after its WCONPROD. The index of every table must be the order in the schedule.
+
+    Return:
+        WellMatrices
+    """
+    if wells is None:
+        wells = np.sort(table['well'].astype(str).unique())
+    wells = np.asarray(wells, dtype=object)
+    if dates is None:
+        dates = table['date'].dropna().unique()
+    dates = np.unique(np.asarray(dates, dtype='datetime64[ns]'))
+    dates = dates[~np.isnat(dates)]
+    columns = _default_columns(table) if columns is None else list(columns)
+    size, steps = len(wells) * len(dates), len(dates)
+
+    cells = _cells(table, 'well', wells, dates)
+    order = table.index.to_numpy()
+    if ends is not None and len(ends) > 0:
+        # the records of the other keywords are events past the end of the table, the cells where they are in effect are undefined
+        ends = [end for end in ends if len(end) > 0]
+        events = np.concatenate([cells] + [_cells(end, 'well', wells, dates) for end in ends])
+        rows = _ffill(_last_events(events, np.concatenate([order] + [end.index.to_numpy() for end in ends]), size), steps)
+        rows[rows >= len(table)] = -1
+    else:
+        rows = _ffill(_last_events(cells, order, size), steps)
+    defined = rows >= 0
+
+    # the status events of the keyword and the WELOPEN of the whole well, the last one of each step wins
+    shut_events = _is_shut(table['status']) if 'status' in table else np.zeros(len(table), dtype=bool)
+    status_rows = rows
+    status_cells, status_order = cells, order
+    if welopen is not None and len(welopen) > 0 and 1 in welopen:
+        # the records are as long as the longest of the keyword: a defaulted status is OPEN and defaulted I, J, K apply to the whole well
+        welopen = welopen.reindex(columns=['date', 1, 2, 3, 4, 5, 6, 7])
+        whole_well = welopen[[3, 4, 5, 6, 7]].isna().all(axis=1).to_numpy()
+        welopen_cells = _cells(welopen, 1, wells, dates)
+        status_cells = np.concatenate([status_cells, welopen_cells[whole_well]])
+        status_order = np.concatenate([status_order, welopen.index.to_numpy()[whole_well]])
+        shut_events = np.concatenate([shut_events, _is_shut(welopen[2])[whole_well]])
+        status_rows = _ffill(_last_events(status_cells, status_order, size), steps)
+    shut = np.append(shut_events, False)[status_rows]
+
+    values = {}
+    for column in columns:
+        column_values = np.append(table[column].to_numpy(dtype=np.float64, na_value=np.nan), np.nan).astype(dtype)
+        matrix = column_values[rows]
+        if mask and 'rate' in column.lower():
+            matrix[shut & defined] = 0
+        values[column] = matrix
+    return WellMatrices(keyword, wells, dates, values, defined, shut)
+
+
+def well_matrices(schedule_dict, keywords=('WCONHIST', 'WCONPROD', 'WCONINJE'), columns=None, wells=None, mask=True, dtype=np.float64):
+    """
+    extracts the `keywords` in one pass with `extract_all` and materializes each of them with `build_matrices`,
+    all of them on the same wells axis and the same report dates axis (the DATES of the schedule).
+
+    Params:
+        schedule_dict: dict, ScheduleDict or ColumnarSchedule
+            shedule dictionary prepared by the .data_reader.read_data function
+        keywords: list of str
+        columns: dict {keyword: list of str}, optional
+            by default the rate and limit columns of each keyword
+        wells: list of str, optional
+            by default all the wells of the keywords, sorted
+        mask: bool
+            set the rates to zero where the well is SHUT or STOP, by its status or by WELOPEN.
+        dtype: numpy dtype
+
+    The record of a control keyword is in effect until the next record of the well in any of the control keywords
+    (WCONHIST, WCONPROD, WCONINJE and WCONINJH), so the matrices of a well switching from history to prediction end at the switch.
+
+    Return:
+        dict {keyword: WellMatrices}
+
+    Example:
+        history = well_matrices(read_data('MODEL.DATA'), ['WCONHIST', 'WCONINJH'])
+        history['WCONHIST']['OIL rate']  # numpy array of wells x dates
+    """
+    keywords = [keyword.upper() for keyword in keywords]
+    tables = extract_all(schedule_dict, list(dict.fromkeys(keywords + list(_CONTROLS) + ['WELOPEN', 'DATES'])))
+    dates = tables['DATES'].to_numpy(dtype='datetime64[ns]')
+    if wells is None:
+        wells = np.sort(pd.unique(np.concatenate([tables[keyword]['well'].astype(str).to_numpy() for keyword in keywords if keyword in tables]
+                                                 + [np.zeros(0, dtype=object)])))
+    output = {}
+    for keyword in keywords:
+        if keyword not in tables:
+            continue
+        ends = [tables[control] for control in _CONTROLS if control in tables and control != keyword] if keyword in _CONTROLS else None
+        output[keyword] = build_matrices(tables[keyword], wells, dates, None if columns is None else columns.get(keyword),
+                                         tables.get('WELOPEN'), mask, dtype, keyword, ends)
+    return output
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from .all_keywords import extract_all
+from .compdat import expand_connections
+
+__all__ = ['WellStateIndex']
+
+# the columns identifying what a record updates: a new record replaces the previous one with the same key.
+# The completions are expanded to one row per connected cell first, a record updates only the layers of its K range.
+_KEYS = {
+    'COMPDAT': ['well', 'I', 'J', 'K'],
+    'COMPDATL': ['well', 'local grid', 'I', 'J', 'K'],
+    'COMPDATM': ['well', 'local grid', 'I', 'J', 'K'],
+}
+_KEYWORDS = ['WELSPECS', 'WELSPECL', 'WELLSPEC', 'COMPDAT', 'COMPDATL', 'WCONPROD', 'WCONINJE', 'WCONHIST', 'WCONINJH']
+_NEVER = np.iinfo(np.int64).max
+
+
+def _time(date):
+    """
+    the date (str, datetime or numpy.datetime64) as int64 nanoseconds.
+    """
+    return int(np.datetime64(pd.Timestamp(date), 'ns').astype(np.int64))
+
+
+class _Intervals(object):
+    """
+    the records of one keyword sorted by key and date, each one in effect from its date until the next record of the same key.
+
+    The search key of each record combines the code of its key and the rank of its date in the table,
+    so the record in effect for every key is found with a single `numpy.searchsorted`.
+    """
+    def __init__(self, table, key):
+        codes = table.groupby(key, sort=False, observed=True, dropna=False).ngroup().to_numpy(dtype=np.int64)
+        times = table['date'].to_numpy(dtype='datetime64[ns]').astype(np.int64)  # NaT (no DATES yet) sorts first
+        order = np.lexsort((times, codes))
+        self.table = table.iloc[order]
+        self.codes = codes[order]
+        self.times = times[order]
+        self.wells = np.empty(int(self.codes.max()) + 1 if len(self.codes) > 0 else 0, dtype=object)
+        self.wells[self.codes] = self.table['well'].astype(str).to_numpy()
+        self.dates = np.unique(self.times)
+        self.search = self.codes * (len(self.dates) + 1) + np.searchsorted(self.dates, self.times) + 1
+        same = np.append(self.codes[1:] == self.codes[:-1], False)
+        self.until = np.where(same, np.append(self.times[1:], _NEVER), _NEVER)
+
+    def _key_codes(self, wells):
+        if wells is None:
+            return np.arange(len(self.wells), dtype=np.int64)
+        return np.flatnonzero(np.isin(self.wells, [str(well) for well in wells])).astype(np.int64)
+
+    def _position(self, codes, time):
+        """
+        the position, for every key code, of the last record up to `time` and if there is one.
+        """
+        query = codes * (len(self.dates) + 1) + np.searchsorted(self.dates, time, side='right')
+        position = np.searchsorted(self.search, query, side='right') - 1
+        found = position >= 0
+        found[found] = self.codes[position[found]] == codes[found]
+        return position, found
+
+    def _rows(self, rows):
+        output = self.table.iloc[rows].copy()
+        until = self.until[rows]
+        output['until'] = np.where(until == _NEVER, np.iinfo(np.int64).min, until).astype('datetime64[ns]')
+        return output
+
+    def at(self, time, wells=None):
+        codes = self._key_codes(wells)
+        position, found = self._position(codes, time)
+        return self._rows(position[found])
+
+    def between(self, start, end, wells=None):
+        codes = self._key_codes(wells)
+        first, found = self._position(codes, start)
+        first = np.where(found, first, first + 1)
+        last, _ = self._position(codes, end)
+        lengths = np.maximum(last + 1 - first, 0)
+        rows = np.repeat(first - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        # records replaced on their own date were never in effect
+        rows = rows[self.until[rows] != self.times[rows]]
+        return self._rows(rows)
+
+
+class WellStateIndex(object):
+    """
+    point in time index of the state of the wells, built once from the tables of the extractors.
+
+    Every record is in effect from its date until the next record of the same well (the same connected cell for COMPDAT),
+    so the state at any date is found by bisection over the dates of each well instead of filtering the whole history.
+    The keywords are indexed independently: i.e. a well under WCONHIST and later WCONPROD has a record in effect for both.
+
+    Params:
+        tables: dict {keyword: pandas.DataFrame}
+            as returned by `extract_all`, or any of the extractors. Tables without 'well' or 'date' columns are ignored.
+        keys: dict {keyword: list of str}, optional
+            the columns identifying what a record of the keyword updates, by default the well
+            or the well and the I, J, K of each connected cell for COMPDAT and COMPDATL, expanded by `expand_connections`.
+
+    Example:
+        state = WellStateIndex.from_schedule(read_data('MODEL.DATA'))
+        state.state_at('2001-01-01')['WCONPROD']       # the controls of the producers at that date
+        state.open_completions('2001-01-01', wells=['P1'])
+        state.state_between('2001-01-01', '2002-01-01')['WELSPECS']
+    """
+    def __init__(self, tables, keys=None):
+        keys = dict(_KEYS, **({} if keys is None else {keyword.upper(): key for keyword, key in keys.items()}))
+        self._intervals = {}
+        for keyword, table in tables.items():
+            key = keys.get(keyword, ['well'])
+            if not isinstance(table, pd.DataFrame):
+                continue
+            if 'K' in key and 'K' not in table and 'K_up' in table:
+                table = expand_connections(table)
+            if 'date' not in table or not all(column in table for column in key):
+                continue
+            self._intervals[keyword] = _Intervals(table, key)
+
+    @classmethod
+    def from_schedule(cls, schedule_dict, keywords=None, keys=None):
+        """
+        extracts the `keywords` (by default the well, completion and control keywords) with `extract_all` and indexes them.
+        """
+        return cls(extract_all(schedule_dict, _KEYWORDS if keywords is None else keywords), keys)
+
+    @property
+    def keywords(self):
+        return list(self._intervals)
+
+    def __repr__(self):
+        return f"WellStateIndex({', '.join(f'{keyword}: {len(each.table)}' for keyword, each in self._intervals.items())})"
+
+    def _select(self, keywords):
+        if keywords is None:
+            return list(self._intervals)
+        return [keyword.upper() for keyword in ([keywords] if isinstance(keywords, str) else keywords)]
+
+    def state_at(self, date, keywords=None, wells=None):
+        """
+        the records in effect at the `date`, the last one of each well (or connected cell) up to the date included.
+
+        Params:
+            date: str, datetime or numpy.datetime64
+            keywords: str or list of str, optional
+                by default all the indexed keywords
+            wells: list of str, optional
+                only these wells
+
+        Return:
+            dict {keyword: pandas.DataFrame}, the rows of the extractor table with an 'until' column,
+            the date of the next record of the same well (NaT if it is the last one).
+            The completions have one row for each connected cell, with a 'K' column instead of 'K_up' and 'K_low'.
+        """
+        time = _time(date)
+        return {keyword: self._intervals[keyword].at(time, wells) for keyword in self._select(keywords)}
+
+    def state_between(self, start, end, keywords=None, wells=None):
+        """
+        every record in effect at any moment between the `start` and the `end` dates (both included):
+        the state at `start` and the records of the following dates up to `end`.
+
+        Return:
+            dict {keyword: pandas.DataFrame}, like `state_at`
+        """
+        start, end = _time(start), _time(end)
+        if end < start:
+            raise ValueError("the end date is before the start date")
+        return {keyword: self._intervals[keyword].between(start, end, wells) for keyword in self._select(keywords)}
+
+    def open_completions(self, date, wells=None, keyword='COMPDAT'):
+        """
+        the connected cells of the `keyword` (COMPDAT or COMPDATL) in effect at the `date` with OPEN status, one row for each cell.
+        """
+        completions = self.state_at(date, keyword, wells)[keyword.upper()]
+        return completions[completions['status'] == 'OPEN']
@@ -0,0 +1,95 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+MODEL = """RUNSPEC
+TITLE
+TEST MODEL
+DIMENS
+ 3 3 4 /
+OIL
+WATER
+START
+ 1 'JAN' 2000 /
+GRID
+INCLUDE
+ './inc/grid.grdecl' /
+PATHS
+ 'INC' 'inc' /
+/
+PROPS
+SCHEDULE
+RPTSCHED
+ 'WELLS=2' /
+WELSPECS
+ 'P1' 'G1' 2 2 1* 'OIL' /
+ 'I1' 'G2' 3 3 1* 'WATER' /
+/
+COMPDAT
+ 'P1' 2* 1 3 'OPEN' 2* 0.2 /
+ 'I1' 3 3 1 4 'OPEN' /
+/
+WCONHIST
+ 'P1' 'OPEN' 'ORAT' 100 10 1000 /
+/
+WCONINJH
+ 'I1' 'WATER' 'OPEN' 500 /
+/
+GCONPROD
+ 'G1' 'ORAT' 1000 /
+/
+INCLUDE
+ '$INC/sched1.inc' /
+TUNING
+1 2 /
+/
+3 /
+DATES
+ 1 'MAR' 2000 /
+ 1 'APR' 2000 /
+/
+WCONPROD
+ 'P1' 'OPEN' 'ORAT' 200 4* 50 /
+/
+WELOPEN
+ 'P1' 'SHUT' /
+/
+DATES
+ 1 'MAY' 2000 /
+/
+"""
+
+SCHEDULE_INCLUDE = """-- comment
+DATES
+ 1 'FEB' 2000 /
+/
+WCONHIST
+ 'P1' 'OPEN' 'ORAT' 150 20 1500 /
+/
+WCONINJE
+ 'I1' 'WATER' 'OPEN' 'RATE' 600 1* 300 /
+/
+"""
+
+GRID = """PORO
+ 36*0.2 /
+ACTNUM
+ 10*1 8*0 18*1 /
+SATNUM
+ 18*1 18*2 /
+"""
+
+
+@pytest.fixture
+def deck(tmp_path):
+    """
+    a .DATA file (3 x 3 x 4 grid, two wells, four report dates) with a grid include and a schedule include found through PATHS.
+    """
+    (tmp_path / 'inc').mkdir()
+    (tmp_path / 'inc' / 'sched1.inc').write_text(SCHEDULE_INCLUDE)
+    (tmp_path / 'inc' / 'grid.grdecl').write_text(GRID)
+    path = tmp_path / 'MODEL.DATA'
+    path.write_text(MODEL)
+    return str(path)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from schedule_reader import ActiveGrid, get_dimens, properties2df
+
+PROPERTIES = """ACTNUM
+ 0 3*1 /
+PORO
+ 0.1 0.2 0.3 0.4 /
+"""
+
+
+def test_active_cells(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text(PROPERTIES)
+    df = properties2df(str(path), ['PORO'], (2, 2, 1), active=True)
+    assert np.allclose(df['PORO'], [0.2, 0.3, 0.4])
+
+
+def test_active_without_dimens(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text(PROPERTIES)
+    with pytest.raises(ValueError, match='dimens is required'):
+        properties2df(str(path), ['PORO'], active=True)
+
+
+def test_active_grid_of_the_deck(deck, tmp_path):
+    grid = ActiveGrid.read(str(tmp_path / 'inc' / 'grid.grdecl'), get_dimens(deck))
+    assert (grid.size, len(grid)) == (36, 28)
+    assert grid.to_active([9, 10, 18]).tolist() == [9, -1, 10]
+    assert grid.to_global([9, 10]).tolist() == [9, 18]
+    assert [each[10].item() for each in grid.ijk()] == [1, 1, 3]
+    grid.load(str(tmp_path / 'inc' / 'grid.grdecl'), ['PORO', 'SATNUM'])
+    assert len(grid.properties['PORO']) == 28
+    assert grid.aggregate('PORO', by='SATNUM', how='count').to_dict() == {1: 10, 2: 18}
+    assert np.isclose(grid.aggregate('PORO', by='SATNUM').loc[2], 18 * 0.2)
+    assert np.isnan(grid.expand('PORO')[10:18]).all()
+    df = properties2df(deck, ['PORO'], active=True)
+    assert df.index.tolist() == grid.global_index.tolist()
+    assert np.allclose(df['PORO'], 0.2)
+
+
+def test_actnum_of_the_wrong_size():
+    with pytest.raises(ValueError, match='ACTNUM has 3 cells'):
+        ActiveGrid(np.ones(3), (2, 2, 1))
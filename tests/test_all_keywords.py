@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+from schedule_reader import extract_all, extract_keyword, read_data
+from schedule_reader.compdat import extract_compdat
+from schedule_reader.wcon import extract_wconhist, extract_wconinje, extract_wconinjh, extract_wconprod
+from schedule_reader.welspec import extract_welspecs
+
+EXTRACTORS = {'COMPDAT': extract_compdat, 'WELSPECS': extract_welspecs, 'WCONHIST': extract_wconhist, 'WCONPROD': extract_wconprod,
+              'WCONINJE': extract_wconinje, 'WCONINJH': extract_wconinjh}
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_same_tables_as_the_extractors(deck, columnar):
+    schedule = read_data(deck)
+    tables = extract_all(read_data(deck, columnar=columnar))
+    assert set(tables) == set(EXTRACTORS) | {'RPTSCHED', 'GCONPROD', 'TUNING', 'WELOPEN', 'DATES'}
+    for keyword, extractor in EXTRACTORS.items():
+        pd.testing.assert_frame_equal(tables[keyword], extractor(schedule))
+    for keyword in ('GCONPROD', 'WELOPEN'):
+        pd.testing.assert_frame_equal(tables[keyword], extract_keyword(schedule, keyword))
+    assert (tables['DATES'].to_numpy() == schedule.date_table).all()
+
+
+def test_selected_keywords(deck):
+    tables = extract_all(read_data(deck), ['compdat'])
+    # WELSPECS is read to complete the defaulted I and J, but it is not returned
+    assert list(tables) == ['COMPDAT']
+    assert tables['COMPDAT'][['I', 'J']].values.tolist() == [[2, 2], [3, 3]]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from schedule_reader import ColumnarSchedule, read_data
+from schedule_reader.all_keywords import extract_all
+
+
+def test_columnar_round_trip(deck):
+    schedule = read_data(deck)
+    columnar = read_data(deck, columnar=True)
+    assert columnar.to_dict() == dict(schedule)
+    assert ColumnarSchedule.from_dict(schedule).to_dict() == dict(schedule)
+    assert dict(columnar.view) == dict(schedule)
+    assert len(columnar.view) == len(schedule)
+
+
+def test_columnar_keyword_columns(deck):
+    columnar = read_data(deck, columnar=True)
+    assert 'WCONHIST' in columnar and 'DATES' in columnar and 'WELSPECL' not in columnar
+    records = columnar.records('WCONHIST')
+    assert records.shape[0] == 2
+    assert records[:, 3].tolist() == ['100', '150']
+    assert columnar.record_dates('WCONHIST').tolist() == ["1 'JAN' 2000", "1 'FEB' 2000"]
+    assert (columnar.record_datetimes('WCONHIST') == np.array(['2000-01-01', '2000-02-01'], dtype='datetime64[ns]')).all()
+    assert columnar.record(18) == {'WELOPEN': ["'P1'", "'SHUT'"]}
+    with pytest.raises(KeyError):
+        columnar.record(len(columnar))
+
+
+def test_extractors_on_the_columnar_store(deck):
+    expected = extract_all(read_data(deck), ['WELSPECS', 'COMPDAT', 'WCONHIST', 'GCONPROD'])
+    output = extract_all(read_data(deck, columnar=True), ['WELSPECS', 'COMPDAT', 'WCONHIST', 'GCONPROD'])
+    for keyword in ('WELSPECS', 'COMPDAT', 'WCONHIST', 'GCONPROD'):
+        pd.testing.assert_frame_equal(output[keyword], expected[keyword])
+
+
+def test_finalized_store_is_read_only():
+    columnar = ColumnarSchedule()
+    columnar.append(0, 'DATES', "1 'JAN' 2000")
+    with pytest.raises(ValueError, match='in order'):
+        columnar.append(2, 'WELOPEN', ["'P1'", "'SHUT'"])
+    columnar.finalize()
+    with pytest.raises(ValueError, match='finalized'):
+        columnar.append(1, 'WELOPEN', ["'P1'", "'SHUT'"])
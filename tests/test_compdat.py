@@ -0,0 +1,63 @@
+import pandas as pd
+from schedule_reader import connections2df, expand_connections, read_data, read_property
+from schedule_reader.compdat import extract_compdat
+
+SCHEDULE = """SCHEDULE
+WELSPECS
+ 'P1' 'G1' 2 3 1* 'OIL' /
+ 'P2' 'G1' 5 5 1* 'OIL' /
+/
+COMPDAT
+ 'P1' 2* 1 1 'OPEN' /
+ 'P2' 1* 4 1 1 'OPEN' /
+ 'P3' 2* 1 1 'OPEN' /
+/
+DATES
+ 1 'FEB' 2000 /
+/
+WELSPECS
+ 'P1' 'G1' 7 8 1* 'OIL' /
+/
+COMPDAT
+ 'P1' 2* 2 2 'OPEN' /
+ 'P1' 1 1 3 3 'OPEN' /
+/
+"""
+
+
+def test_defaulted_ij_from_the_welspecs_in_effect(tmp_path):
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(SCHEDULE)
+    compdat = extract_compdat(read_data(str(path), start_date='1 JAN 2000'))
+    assert compdat[['well', 'I', 'J', 'K_up']].astype({'well': str}).values.tolist() == [
+        ['P1', 2, 3, 1],
+        ['P2', 5, 4, 1],  # only the defaulted I is taken from WELSPECS
+        ['P3', 0, 0, 1],  # no WELSPECS for the well
+        ['P1', 7, 8, 2],  # the WELSPECS of the COMPDAT date
+        ['P1', 1, 1, 3],
+    ]
+
+
+def test_defaulted_ij_in_the_deck(deck):
+    compdat = extract_compdat(read_data(deck))
+    assert compdat[['I', 'J']].values.tolist() == [[2, 2], [3, 3]]
+
+
+def test_connections_of_the_deck(deck, tmp_path):
+    connections = connections2df(deck)
+    assert connections[['well', 'I', 'J', 'K']].astype({'well': str}).values.tolist() == (
+        [['P1', 2, 2, k] for k in (1, 2, 3)] + [['I1', 3, 3, k] for k in (1, 2, 3, 4)])
+    assert connections.index.tolist() == [4, 4, 4, 5, 5, 5, 5]
+    assert connections['cell'].tolist() == [4, 13, 22, 8, 17, 26, 35]
+    assert 'K_up' not in connections and 'K_low' not in connections
+    satnum = read_property(str(tmp_path / 'inc' / 'grid.grdecl'), 'SATNUM')
+    assert satnum[connections['cell']].tolist() == [1, 1, 2, 1, 1, 2, 2]
+
+
+def test_connections_outside_the_grid():
+    compdat = pd.DataFrame({'well': ['P1', 'P1', 'L1'], 'I': [1, 4, 1], 'J': [1, 1, 1], 'K_up': [2, 1, 1], 'K_low': [0, 1, 1],
+                            'local grid': [None, None, 'LG1']})
+    connections = expand_connections(compdat, (3, 3, 3))
+    # a defaulted K_low connects only K_up
+    assert connections['K'].tolist() == [2, 1, 1]
+    assert connections['cell'].tolist() == [9, -1, -1]
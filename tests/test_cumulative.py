@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from schedule_reader import cumulative_volumes, read_data, well_matrices
+from schedule_reader.cumulative import integrate_rates
+
+SCHEDULE = """SCHEDULE
+WCONHIST
+ 'P1' 'OPEN' 'ORAT' 100 /
+ 'P2' 'OPEN' 'ORAT' 10 /
+/
+DATES
+ 11 'JAN' 2000 /
+/
+WCONPROD
+ 'P1' 'OPEN' 'ORAT' 50 /
+/
+DATES
+ 21 'JAN' 2000 /
+/
+DATES
+ 31 'JAN' 2000 /
+/
+"""
+
+
+def _schedule(tmp_path):
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(SCHEDULE)
+    return read_data(str(path), start_date='1 JAN 2000')
+
+
+def test_history_ends_at_the_switch_to_prediction(tmp_path):
+    history = well_matrices(_schedule(tmp_path), ['WCONHIST', 'WCONPROD'])
+    assert history['WCONHIST'].defined.tolist() == [[True, False, False, False], [True, True, True, True]]
+    assert np.allclose(history['WCONHIST']['OIL rate'], [[100, np.nan, np.nan, np.nan], [10, 10, 10, 10]], equal_nan=True)
+    assert history['WCONPROD'].defined[0].tolist() == [False, True, True, True]
+
+
+def test_cumulative_after_a_control_switch(tmp_path):
+    cumulative = cumulative_volumes(_schedule(tmp_path))
+    assert cumulative.wells.tolist() == ['P1', 'P2']
+    assert np.allclose(cumulative['OIL'], [[0, 1000, 1000, 1000], [0, 100, 200, 300]])
+    field = cumulative_volumes(_schedule(tmp_path), by='field')
+    assert np.allclose(field['OIL'], [[0, 1100, 1200, 1300]])
+
+
+def test_integrate_rates():
+    dates = np.array(['2000-01-01', '2000-01-11', '2000-01-31'], dtype='datetime64[ns]')
+    rates = np.array([[10, 20, 30], [np.nan, 1, 1]])
+    assert np.allclose(integrate_rates(rates, dates), [[0, 100, 500], [0, 0, 20]])
+
+
+def test_cumulative_of_the_deck(deck):
+    cumulative = cumulative_volumes(read_data(deck))
+    assert cumulative.wells.tolist() == ['I1', 'P1']
+    assert cumulative.columns == ['OIL', 'WATER', 'GAS', 'WATER injected']
+    assert np.allclose(cumulative['OIL'][1], [0, 3100, 7450, 12100, 12100])
+    assert np.allclose(cumulative['WATER'][1], [0, 310, 890, 1510, 1510])
+    # the WCONINJH rate ends at the WCONINJE of February
+    assert np.allclose(cumulative['WATER injected'][0], [0, 15500, 15500, 15500, 15500])
+    groups = cumulative_volumes(read_data(deck), by='group')
+    assert groups.wells.tolist() == ['G1', 'G2']
+    assert np.allclose(groups['OIL'], cumulative['OIL'][::-1])
+    with pytest.raises(ValueError):
+        cumulative_volumes(read_data(deck), by='region')
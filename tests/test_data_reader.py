@@ -0,0 +1,136 @@
+import gc
+import numpy as np
+import pytest
+from schedule_reader import read_data
+from schedule_reader.data_reader import _dates_offsets
+from schedule_reader.keyword_table import KEYWORD_TABLE, register_keyword
+
+SCHEDULE = """SCHEDULE
+ECHO
+GCONPROD
+ 'G1' 'ORAT' 1000 /
+ 'G2' 'ORAT' 1000 2000 /
+/
+MYKEY
+ 1 2 3 /
+/
+COMPDATM
+ 'P1' 'LG1' 1 1 1 1 'OPEN' /
+/
+NOECHO
+WELOPEN
+ 'P1' 'SHUT' /
+ 'P2' 'OPEN' /
+/
+"""
+
+
+def _read(tmp_path, text=SCHEDULE, **kwargs):
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(text)
+    return read_data(str(path), start_date='1 JAN 2000', **kwargs)
+
+
+def _keywords(schedule):
+    return [keyword for record in schedule.values() for keyword in record]
+
+
+def test_keyword_rules(tmp_path):
+    schedule = _read(tmp_path)
+    # ECHO and NOECHO have no data, MYKEY is not a well, group or completion keyword: it is skipped
+    assert _keywords(schedule) == ['DATES', 'ECHO', 'GCONPROD', 'GCONPROD', 'COMPDATL', 'NOECHO', 'WELOPEN', 'WELOPEN']
+    assert schedule[1]['ECHO'] is None
+    # the generic keywords are padded to the longest record of the block
+    assert schedule[2]['GCONPROD'] == ["'G1'", "'ORAT'", '1000', '1*']
+    assert len(schedule[4]['COMPDATL']) == 15
+    assert [schedule[6]['WELOPEN'], schedule[7]['WELOPEN']] == [["'P1'", "'SHUT'"], ["'P2'", "'OPEN'"]]
+
+
+def test_registered_keyword(tmp_path, monkeypatch):
+    monkeypatch.setitem(KEYWORD_TABLE, 'MYKEY', None)
+    register_keyword('mykey', columns=4)
+    schedule = _read(tmp_path)
+    assert schedule[4]['MYKEY'] == ['1', '2', '3', '1*']
+
+
+def test_garbage_collector_restored(tmp_path):
+    assert gc.isenabled()
+    _read(tmp_path)
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        _read(tmp_path)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+    with pytest.raises(ValueError):
+        _read(tmp_path, SCHEDULE + "INCLUDE\n 'missing.inc'\n")
+    assert gc.isenabled()
+
+
+def test_parallel_includes_equal_the_serial_read(deck, tmp_path):
+    # a second schedule include, with an include of its own
+    (tmp_path / 'inc' / 'sched2.inc').write_text("WELOPEN\n 'I1' 'SHUT' /\n/\nINCLUDE\n './inc/sched3.inc' /\n")
+    (tmp_path / 'inc' / 'sched3.inc').write_text("DATES\n 1 'JUN' 2000 /\n/\nWELOPEN\n 'I1' 'OPEN' /\n/\n")
+    with open(deck, 'a') as f:
+        f.write("INCLUDE\n './inc/sched2.inc' /\n")
+    serial = read_data(deck)
+    parallel = read_data(deck, workers=2)
+    assert dict(parallel) == dict(serial)
+    assert (parallel.timesteps == serial.timesteps).all()
+    assert (parallel.date_table == serial.date_table).all()
+    assert serial[len(serial) - 1] == {'WELOPEN': ["'I1'", "'OPEN'"]}
+
+
+def test_split_schedule_equals_the_serial_read(tmp_path):
+    blocks = []
+    for month in ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT'):
+        blocks.append(f"DATES\n 1 '{month}' 2001 /\n 15 '{month}' 2001 /\n/\n"
+                      f"WCONHIST\n 'P1' 'OPEN' 'ORAT' {len(blocks) + 1}00 /\n 'P2' 'OPEN' 'ORAT' 50 /\n/\n"
+                      "-- DATES in a comment is not a cut\nWELOPEN\n 'P2' 'SHUT' /\n/\n")
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(''.join(blocks))
+    serial = read_data(str(path), start_date='1 JAN 2000')
+    split = read_data(str(path), start_date='1 JAN 2000', workers=2, split_size=200)
+    assert dict(split) == dict(serial)
+    assert (split.timesteps == serial.timesteps).all()
+    assert len(serial.date_table) == 21
+    # every chunk after the first starts at a DATES keyword
+    offsets = _dates_offsets(str(path), 200)
+    assert len(offsets) > 2
+    assert all(path.read_bytes()[offset:offset + 5] == b'DATES' for offset in offsets[1:-1])
+
+
+def test_selected_keywords(deck):
+    full = read_data(deck)
+    selected = read_data(deck, keywords=['wconhist', 'WELOPEN'])
+    assert set(_keywords(selected)) == {'DATES', 'WCONHIST', 'WELOPEN'}
+    expected = [record for record in full.values() if set(record) & {'DATES', 'WCONHIST', 'WELOPEN'}]
+    assert list(selected.values()) == expected
+    assert (selected.date_table == full.date_table).all()
+
+
+def test_skipped_data_is_not_read_as_keywords(tmp_path):
+    text = "WELSPECS\n 'WCONHIST' 'G1' 1 1 1* 'OIL' /\n/\nCOMPDATM\n 'P1' 'LG1' 1 1 1 1 'OPEN' /\n/\n" + SCHEDULE
+    schedule = _read(tmp_path, text, keywords=['WCONHIST', 'COMPDATL'])
+    assert _keywords(schedule) == ['DATES', 'COMPDATL', 'COMPDATL']
+
+
+def test_date_window(deck):
+    full = read_data(deck)
+    window = read_data(deck, start='1 FEB 2000', end='1 MAR 2000')
+    assert list(window.values()) == list(full.values())[9:16]
+    assert window.date_table.tolist() == full.date_table[1:3].tolist()
+    later = read_data(deck, start='1 MAR 2000')
+    assert list(later.values()) == list(full.values())[15:]
+
+
+def test_end_stops_reading(deck):
+    with open(deck, 'a') as f:
+        f.write("INCLUDE\n './inc/missing.inc' /\n")
+    with pytest.raises(ValueError):
+        read_data(deck)
+    schedule = read_data(deck, end='1 APR 2000')
+    assert _keywords(schedule)[-1] == 'WELOPEN'
+    # the first DATES after the end is not kept
+    assert schedule.date_table[-1] == np.datetime64('2000-04-01')
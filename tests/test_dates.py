@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+import schedule_reader.dates
+from schedule_reader import extract_keyword, read_data
+from schedule_reader.dates import date_table, parse_dates
+
+
+def test_date_table_parses_each_date_once(monkeypatch):
+    parsed = []
+    parse_date = schedule_reader.dates.parse_date
+
+    def counted(record):
+        parsed.append(record)
+        return parse_date(record)
+
+    monkeypatch.setattr(schedule_reader.dates, 'parse_date', counted)
+    table = date_table(["1 'JAN' 2000", "1 'FEB' 2000", "1 'JAN' 2000", 'not a date'])
+    assert parsed == ["1 'JAN' 2000", "1 'FEB' 2000", 'not a date']
+    assert table[:3].tolist() == np.array(['2000-01-01', '2000-02-01', '2000-01-01'], dtype='datetime64[ns]').tolist()
+    assert np.isnat(table[3])
+    with pytest.raises(ValueError):
+        parse_dates(['not a date'])
+
+
+def test_timestep_of_every_record(deck):
+    schedule = read_data(deck)
+    assert schedule.has_dates
+    assert schedule.dates == ["1 'JAN' 2000", "1 'FEB' 2000", "1 'MAR' 2000", "1 'APR' 2000", "1 'MAY' 2000"]
+    positions = [position for position, record in schedule.items() if 'WCONHIST' in record]
+    assert [schedule.timestep(position) for position in positions] == [0, 1]
+    assert schedule.record_dates(positions).tolist() == schedule.date_table[[0, 1]].tolist()
+    with pytest.raises(KeyError):
+        schedule.timestep(len(schedule))
+
+
+def test_extractors_without_the_date_table(deck):
+    schedule = read_data(deck)
+    expected = extract_keyword(schedule, 'WELOPEN')
+    edited = read_data(deck)
+    edited[len(edited)] = {'GCONPROD': ["'G2'", "'ORAT'", '10']}
+    assert not edited.has_dates
+    pd.testing.assert_frame_equal(extract_keyword(edited, 'WELOPEN'), expected)
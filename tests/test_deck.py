@@ -0,0 +1,42 @@
+from pathlib import Path
+import pandas as pd
+import schedule_reader.deck
+from schedule_reader import ScheduleDeck, read_data
+from schedule_reader.compdat import extract_compdat
+
+
+def test_deck_reads_the_files_once(deck, monkeypatch):
+    calls = []
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return read_data(*args, **kwargs)
+
+    monkeypatch.setattr(schedule_reader.deck, 'read_data', counted)
+    session = ScheduleDeck(deck)
+    assert len(calls) == 0
+    compdat = session.compdat
+    assert session.compdat is compdat
+    session.wconhist, session.keyword('GCONPROD'), session.dates
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(compdat, extract_compdat(read_data(deck)))
+
+
+def test_invalidate_reads_the_changes(deck):
+    session = ScheduleDeck(deck)
+    gconprod = session.keyword('gconprod')
+    assert session.keyword('GCONPROD') is gconprod
+    session.invalidate('GCONPROD')
+    assert session.keyword('GCONPROD') is not gconprod
+    Path(deck).write_text(Path(deck).read_text().replace("'G1' 'ORAT' 1000", "'G1' 'ORAT' 2000"))
+    assert session.keyword('GCONPROD')[3].tolist() == ['1000']
+    session.invalidate()
+    assert session.keyword('GCONPROD')[3].tolist() == ['2000']
+
+
+def test_deck_from_a_schedule_dictionary(deck):
+    session = ScheduleDeck(read_data(deck))
+    assert session.path is None
+    assert session.welspecs['well'].tolist() == ['P1', 'I1']
+    session.invalidate()
+    assert session.welspecs['well'].tolist() == ['P1', 'I1']
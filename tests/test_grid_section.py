@@ -0,0 +1,112 @@
+import warnings
+import numpy as np
+import pytest
+from schedule_reader import get_dimens, index_properties, read_grid_properties
+
+DECK = """RUNSPEC
+TITLE
+COPY OF THE MODEL
+DIMENS
+ 2 2 1 /
+GRID
+PERMX
+ 4*100 /
+PORO
+ 4*0.1 /
+PORO
+ 4*0.3 /
+EQUALS
+ NTG 0.8 /
+/
+COPY
+ PERMX PERMY /
+/
+SCHEDULE
+"""
+
+
+def _deck(tmp_path):
+    path = tmp_path / 'MODEL.DATA'
+    path.write_text(DECK)
+    return str(path)
+
+
+def test_repeated_keyword_reads_the_last_copy(tmp_path):
+    path = _deck(tmp_path)
+    assert np.allclose(read_grid_properties(path, ['PORO'])['PORO'], 0.3)
+    values = read_grid_properties(path, ['PORO', 'PERMX'])
+    assert np.allclose(values['PORO'], 0.3)
+    assert np.allclose(values['PERMX'], 100)
+
+
+def test_repeated_keyword_cached_by_copy(tmp_path):
+    path = _deck(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    locations = index_properties(path, ['PORO'])['PORO']
+    assert len(locations) == 2
+    from schedule_reader.property_keywords import read_properties
+    first = read_properties(path, ['PORO'], cache_dir=cache_dir, offset=locations[0].offset)['PORO']
+    last = read_properties(path, ['PORO'], cache_dir=cache_dir, offset=locations[1].offset)['PORO']
+    assert np.allclose(first, 0.1)
+    assert np.allclose(last, 0.3)
+    assert np.allclose(read_grid_properties(path, ['PORO'], cache_dir=cache_dir)['PORO'], 0.3)
+
+
+def test_data_lines_are_not_keywords(tmp_path):
+    index = index_properties(_deck(tmp_path))
+    assert set(index) == {'TITLE', 'DIMENS', 'PERMX', 'PORO', 'EQUALS', 'COPY'}
+    assert [location.section for location in index['PORO']] == ['GRID', 'GRID']
+
+
+def test_flag_keywords_not_in_the_table(tmp_path):
+    (tmp_path / 'inc').mkdir()
+    (tmp_path / 'dim.inc').write_text("DIMENS\n 2 2 1 /\n")
+    (tmp_path / 'inc' / 'g.inc').write_text("PORO\n 4*0.2 /\n")
+    path = tmp_path / 'M.DATA'
+    path.write_text("RUNSPEC\nINCLUDE\n './dim.inc' /\nHWELLS\nNOCASC\nSTONE1\nGRID\nINCLUDE\n './inc/g.inc' /\nSCHEDULE\n")
+    index = index_properties(str(path))
+    assert {'DIMENS', 'HWELLS', 'NOCASC', 'STONE1', 'PORO'} <= set(index)
+    assert index['PORO'][0].section == 'GRID'
+    assert np.allclose(read_grid_properties(str(path), ['PORO'])['PORO'], 0.2)
+
+
+def test_dimens_in_an_include(tmp_path):
+    (tmp_path / 'dim.inc').write_text("-- the grid\nDIMENS\n 3 2 1 /\n")
+    path = tmp_path / 'M.DATA'
+    path.write_text(f"RUNSPEC\nINCLUDE\n '{tmp_path / 'dim.inc'}' /\nGRID\nPORO\n 6*0.2 /\nSCHEDULE\n")
+    assert get_dimens(str(path)) == (3, 2, 1)
+    assert get_dimens(str(tmp_path / 'dim.inc')) == (3, 2, 1)
+    (tmp_path / 'N.DATA').write_text("RUNSPEC\nGRID\nPORO\n 6*0.2 /\n")
+    assert get_dimens(str(tmp_path / 'N.DATA')) == (None, None, None)
+
+
+def test_edits_after_the_definition_warn(tmp_path):
+    path = tmp_path / 'EDITS.DATA'
+    path.write_text(DECK.replace("SCHEDULE\n", "MULTIPLY\n 'PORO' 2 /\n/\nBOX\n 1 1 1 1 1 1 /\nPERMX\n 1*5 /\nENDBOX\nSCHEDULE\n"))
+    index = index_properties(str(path))
+    assert index['COPY'][0].targets == ('PERMY',)
+    assert index['MULTIPLY'][0].targets == ('PORO',)
+    assert [location.box for location in index['PERMX']] == [False, True]
+    with pytest.warns(UserWarning, match='PORO is modified by MULTIPLY'):
+        assert np.allclose(read_grid_properties(str(path), ['PORO'])['PORO'], 0.3)
+    with pytest.warns(UserWarning, match='PERMX is modified by BOX'):
+        assert np.allclose(read_grid_properties(str(path), ['PERMX'])['PERMX'], 100)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        read_grid_properties(_deck(tmp_path), ['PORO', 'PERMX'])
+
+
+def test_properties_through_the_include_chain(deck):
+    index = index_properties(deck)
+    assert index['PORO'][0].path.endswith('inc/grid.grdecl')
+    assert index['PORO'][0].section == 'GRID'
+    # the SCHEDULE section is not indexed
+    assert 'WELSPECS' not in index and 'DATES' not in index
+    serial = read_grid_properties(deck, ['SATNUM', 'PORO', 'ACTNUM'])
+    parallel = read_grid_properties(deck, ['SATNUM', 'PORO', 'ACTNUM'], workers=2)
+    assert list(parallel) == list(serial) == ['SATNUM', 'PORO', 'ACTNUM']
+    for keyword in serial:
+        assert np.array_equal(parallel[keyword], serial[keyword])
+    assert serial['ACTNUM'].sum() == 28
+    with pytest.raises(ValueError, match='NTG'):
+        read_grid_properties(deck, ['PORO', 'NTG'])
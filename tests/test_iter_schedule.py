@@ -0,0 +1,31 @@
+from pathlib import Path
+import pytest
+from schedule_reader import iter_schedule, read_data
+
+
+def test_same_records_as_read_data(deck):
+    records = list(iter_schedule(deck))
+    schedule = read_data(deck)
+    assert [{keyword: record} for _, keyword, record, _, _ in records] == list(schedule.values())
+    dates = [record['DATES'] for record in schedule.values() if 'DATES' in record]
+    assert [date for date, *_ in records] == [dates[step] for step in schedule.timesteps]
+
+
+def test_source_and_line_of_each_record(deck, tmp_path):
+    records = list(iter_schedule(deck))
+    wconhist = [(date, Path(source).name, line) for date, keyword, _, source, line in records if keyword == 'WCONHIST']
+    # the lines are counted from 1, the first record is in the .DATA and the second one in the include found through PATHS
+    assert wconhist == [("1 'JAN' 2000", 'MODEL.DATA', 29), ("1 'FEB' 2000", 'sched1.inc', 6)]
+    assert Path(deck).read_text().splitlines()[29 - 1].split()[0] == "'P1'"
+
+
+def test_records_are_read_lazily(deck):
+    with open(deck, 'a') as f:
+        f.write("INCLUDE\n './inc/missing.inc' /\n")
+    records = iter_schedule(deck)
+    for _, keyword, record, _, _ in records:
+        if keyword == 'WELOPEN':
+            break
+    assert record == ["'P1'", "'SHUT'"]
+    with pytest.raises(ValueError):
+        list(records)
@@ -0,0 +1,46 @@
+import os
+from schedule_reader import read_data
+
+
+def _read(deck, cache_dir, capsys, **kwargs):
+    schedule = read_data(deck, cache_dir=cache_dir, verbose=True, **kwargs)
+    return schedule, 'loaded schedule from cache' in capsys.readouterr().out
+
+
+def test_cached_schedule_is_the_same(deck, tmp_path, capsys):
+    cache_dir = str(tmp_path / 'cache')
+    first, cached = _read(deck, cache_dir, capsys)
+    assert not cached
+    second, cached = _read(deck, cache_dir, capsys)
+    assert cached
+    assert dict(second) == dict(first) == dict(read_data(deck))
+    assert (second.timesteps == first.timesteps).all()
+
+
+def test_include_change_invalidates_the_cache(deck, tmp_path, capsys):
+    cache_dir = str(tmp_path / 'cache')
+    _read(deck, cache_dir, capsys)
+    include = tmp_path / 'inc' / 'sched1.inc'
+    include.write_text(include.read_text().replace('150', '175'))
+    schedule, cached = _read(deck, cache_dir, capsys)
+    assert not cached
+    assert schedule[10]['WCONHIST'][3] == '175'
+
+
+def test_touched_file_with_the_same_content_uses_the_cache(deck, tmp_path, capsys):
+    cache_dir = str(tmp_path / 'cache')
+    _read(deck, cache_dir, capsys)
+    include = tmp_path / 'inc' / 'sched1.inc'
+    stat = os.stat(include)
+    os.utime(include, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    _, cached = _read(deck, cache_dir, capsys)
+    assert cached
+
+
+def test_options_are_part_of_the_key(deck, tmp_path, capsys):
+    cache_dir = str(tmp_path / 'cache')
+    _read(deck, cache_dir, capsys)
+    selected, cached = _read(deck, cache_dir, capsys, keywords=['WCONHIST'])
+    assert not cached
+    assert {keyword for record in selected.values() for keyword in record} == {'DATES', 'WCONHIST'}
+    assert len(os.listdir(cache_dir)) == 4
@@ -0,0 +1,39 @@
+import os
+import numpy as np
+from schedule_reader import properties2df
+from schedule_reader.property_keywords import read_properties
+
+
+def test_dataframe_shares_the_cached_arrays(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text("PORO\n 0.1 0.2 0.3 0.4 /\n")
+    cache_dir = str(tmp_path / 'cache')
+    properties2df(str(path), ['PORO'], (2, 2, 1), cache_dir=cache_dir)
+    assert isinstance(read_properties(str(path), ['PORO'], size=4, cache_dir=cache_dir)['PORO'], np.memmap)
+    df = properties2df(str(path), ['PORO'], (2, 2, 1), cache_dir=cache_dir)
+    assert np.allclose(df['PORO'], [0.1, 0.2, 0.3, 0.4])
+    # the column is a view of the memory mapped cache file, not a copy
+    values = df['PORO'].to_numpy()
+    while values is not None and not isinstance(values, np.memmap):
+        values = values.base
+    assert isinstance(values, np.memmap)
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text("PORO\n 0.1 0.2 0.3 0.4 /\n")
+    cache_dir = str(tmp_path / 'cache')
+    parsed = read_properties(str(path), ['PORO'], cache_dir=cache_dir)['PORO']
+    assert not isinstance(parsed, np.memmap)
+    cached = read_properties(str(path), ['PORO'], cache_dir=cache_dir)['PORO']
+    assert isinstance(cached, np.memmap) and not cached.flags.writeable
+    assert np.array_equal(cached, parsed)
+    # the dtype is part of the key
+    assert not isinstance(read_properties(str(path), ['PORO'], {'PORO': np.float32}, cache_dir=cache_dir)['PORO'], np.memmap)
+    # a new content with the same size is parsed again
+    mtime = os.stat(path).st_mtime_ns
+    path.write_text("PORO\n 0.5 0.6 0.7 0.8 /\n")
+    os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    changed = read_properties(str(path), ['PORO'], cache_dir=cache_dir)['PORO']
+    assert not isinstance(changed, np.memmap)
+    assert changed.tolist() == [0.5, 0.6, 0.7, 0.8]
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+import schedule_reader.property_keywords
+from schedule_reader import (expand_keyword, ijk_arrays, ijk_index, parse_property, properties2df, read_keyword_from_include,
+                             read_properties, read_property)
+from schedule_reader.property_keywords import iter_keywords_data
+
+
+@pytest.mark.parametrize('data, expected', [
+    ('1 3* 2', [1, np.nan, np.nan, np.nan, 2]),
+    ('3*', [np.nan, np.nan, np.nan]),
+    ('1 2*', [1, np.nan, np.nan]),
+    ('2*0.25 1 3*7', [0.25, 0.25, 1, 7, 7, 7]),
+    ('0.1 0.2\n0.3', [0.1, 0.2, 0.3]),
+])
+def test_parse_property(data, expected):
+    assert np.allclose(parse_property(data), expected, equal_nan=True)
+
+
+@pytest.mark.parametrize('data', ['1 x 2', '1 2*x'])
+def test_parse_property_not_numbers(data):
+    with pytest.raises(ValueError, match='not numbers'):
+        parse_property(data)
+
+
+def test_parse_property_defaulted_integers():
+    with pytest.raises(ValueError):
+        parse_property('1 2*', np.int32)
+
+
+GRID = """-- porosity
+PORO
+ 0.1 2*0.2 -- a comment
+ 0.4 /
+SATNUM
+ 2*1 2*2 /
+"""
+
+
+def test_read_property_typed_arrays(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text(GRID)
+    poro = read_property(str(path), 'PORO')
+    assert poro.dtype == np.float64
+    assert poro.tolist() == [float(each) for each in expand_keyword(read_keyword_from_include(str(path), 'PORO')).split()]
+    satnum = read_property(str(path), 'satnum', size=4)
+    assert satnum.dtype == np.int32 and satnum.tolist() == [1, 1, 2, 2]
+    assert read_property(str(path), 'PORO', dtype=np.float32).dtype == np.float32
+
+
+@pytest.mark.parametrize('size, message', [(3, 'more than the 3 values'), (5, '4 values, 5 expected')])
+def test_read_property_wrong_size(tmp_path, size, message):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text(GRID)
+    with pytest.raises(ValueError, match=message):
+        read_property(str(path), 'PORO', size=size)
+
+
+def test_streamed_chunks(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    values = np.round(np.linspace(0, 1, 1000), 4)
+    lines = [' '.join(str(each) for each in values[start:start + 7]) + ' -- 1 2 3' for start in range(0, 1000, 7)]
+    path.write_text('PORO\n' + '\n'.join(lines) + '\n/\nPERMX\n 1000*5 /\n')
+    chunks = [chunk for _, chunk in iter_keywords_data(str(path), ['PORO'], chunk_size=100)]
+    assert len(chunks) > 10
+    # the chunks end at the end of a line and the comments are removed
+    assert all(len(parse_property(chunk)) % 7 == 0 for chunk in chunks[:-1])
+    assert np.array_equal(read_property(str(path), 'PORO', chunk_size=100), values)
+    assert np.array_equal(read_property(str(path), 'PORO', size=1000, chunk_size=100), values)
+
+
+def test_stream_stops_at_the_last_keyword(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text("PORO\n 0.1 0.2 /\nPORO\n 0.3 /\nPERMX\n 1 2 /\n")
+    assert [keyword for keyword, _ in iter_keywords_data(str(path), ['PORO'])] == ['PORO']
+    # the end of the data is missing
+    path.write_text("PORO\n 0.1 0.2\n 0.3\n")
+    assert read_property(str(path), 'PORO').tolist() == [0.1, 0.2, 0.3]
+
+
+def test_several_keywords_in_one_pass(tmp_path, monkeypatch):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text(GRID + "PERMX\n 4*100 /\n")
+    scans = []
+    scan = schedule_reader.property_keywords.iter_keywords_data
+
+    def counted(*args, **kwargs):
+        scans.append(args[1])
+        return scan(*args, **kwargs)
+
+    monkeypatch.setattr(schedule_reader.property_keywords, 'iter_keywords_data', counted)
+    values = read_properties(str(path), ['permx', 'SATNUM', 'PORO'], {'PERMX': np.float32})
+    assert len(scans) == 1
+    assert list(values) == ['PERMX', 'SATNUM', 'PORO']
+    assert values['PERMX'].dtype == np.float32 and values['PERMX'].tolist() == [100] * 4
+    assert values['SATNUM'].tolist() == [1, 1, 2, 2]
+    assert np.array_equal(values['PORO'], read_property(str(path), 'PORO'))
+    with pytest.raises(ValueError, match='NTG, PERMY are not in this file'):
+        read_properties(str(path), ['PORO', 'NTG', 'PERMY'])
+
+
+def test_ijk_arrays_in_the_order_of_the_properties():
+    expected = [(i, j, k) for k in range(1, 4) for j in range(1, 3) for i in range(1, 5)]
+    I, J, K = ijk_arrays(4, 2, 3)
+    assert I.dtype == J.dtype == K.dtype == np.int32
+    assert list(zip(I.tolist(), J.tolist(), K.tolist())) == expected
+    index = ijk_index((4, 2, 3))
+    assert index.names == ['I', 'J', 'K']
+    assert index.tolist() == expected
+    with pytest.raises(ValueError):
+        ijk_arrays(4, 2)
+
+
+def test_properties2df_cells(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text(GRID)
+    df = properties2df(str(path), ['PORO', 'SATNUM'], (2, 1, 2))
+    assert df.columns.tolist() == ['I', 'J', 'K', 'PORO', 'SATNUM']
+    assert df[['I', 'J', 'K']].values.tolist() == [[1, 1, 1], [2, 1, 1], [1, 1, 2], [2, 1, 2]]
+    assert df['SATNUM'].tolist() == [1, 1, 2, 2]
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from schedule_reader import RLEProperty, read_property, read_property_rle
+
+
+def test_read_without_expanding(tmp_path):
+    path = tmp_path / 'grid.grdecl'
+    path.write_text("SATNUM\n 3*1 2*2\n 2 4*1 /\n")
+    satnum = read_property_rle(str(path), 'satnum', chunk_size=1)
+    # consecutive runs of the same value are merged, also across chunks
+    assert satnum.values.tolist() == [1, 2, 1]
+    assert satnum.lengths.tolist() == [3, 3, 4]
+    assert len(satnum) == 10 and satnum.dtype == np.int32
+    assert np.array_equal(np.asarray(satnum), read_property(str(path), 'SATNUM'))
+
+
+def test_queries():
+    array = np.array([1, 1, 1, 2, 2, 2, 1, 1, 1, 1])
+    satnum = RLEProperty.from_array(array, 'SATNUM')
+    assert satnum[[0, 3, 9, -1]].tolist() == [1, 2, 1, 1]
+    assert satnum[5] == 2
+    with pytest.raises(IndexError):
+        satnum[10]
+    assert satnum.counts() == {1: 7, 2: 3}
+    assert satnum.ranges(1).tolist() == [[0, 3], [6, 10]]
+    assert np.array_equal(satnum.mask([2]).expand(), array == 2)
+    weights = np.arange(10, dtype=np.float64)
+    assert satnum.sum_by_value(weights) == {1: weights[array == 1].sum(), 2: weights[array == 2].sum()}
+    with pytest.raises(ValueError):
+        satnum.sum_by_value(weights[:5])
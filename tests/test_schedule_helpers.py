@@ -0,0 +1,23 @@
+from schedule_reader import read_data, wconhist2df, keyword2df, ScheduleDeck
+
+SCHEDULE = """SCHEDULE
+WCONHIST
+ 'P1' 'OPEN' 'ORAT' 100 /
+/
+DATES
+ 1 'FEB' 2000 /
+/
+WELOPEN
+ 'P1' 'SHUT' /
+/
+"""
+
+
+def test_helpers_accept_a_columnar_view(tmp_path):
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(SCHEDULE)
+    view = read_data(str(path), start_date='1 JAN 2000', columnar=True).view
+    expected = wconhist2df(read_data(str(path), start_date='1 JAN 2000'))
+    assert wconhist2df(view)['well'].tolist() == expected['well'].tolist() == ['P1']
+    assert keyword2df(view, 'WELOPEN')[1].tolist() == ['P1']
+    assert ScheduleDeck(view).wconhist['well'].tolist() == ['P1']
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from schedule_reader import extract_keyword, read_data
+from schedule_reader.schemas import SCHEMAS, build_table, register_schema
+
+
+def _wconhist(oil):
+    return [['P1', 'OPEN', 'ORAT', oil, '1*', '1*']]
+
+
+def test_fortran_exponents():
+    table = build_table([1], ['1 JAN 2000'], _wconhist('1.5D3'), 'WCONHIST')
+    assert table['OIL rate'].tolist() == [1500.0]
+
+
+def test_not_numbers_are_reported():
+    with pytest.warns(UserWarning, match='OIL rate'):
+        table = build_table([1], ['1 JAN 2000'], _wconhist('1O0'), 'WCONHIST')
+    assert np.isnan(table['OIL rate'].iloc[0])
+    with pytest.raises(ValueError, match='1O0'):
+        build_table([1], ['1 JAN 2000'], _wconhist('1O0'), 'WCONHIST', errors='raise')
+
+
+def test_typed_columns(deck):
+    table = extract_keyword(read_data(deck), 'WCONHIST')
+    assert isinstance(table['well'].dtype, pd.CategoricalDtype)
+    assert table['OIL rate'].dtype == np.float64
+    assert table['VFP'].dtype == 'Int64' and table['VFP'].isna().all()
+    assert table['THP limit'].tolist() == [0.0, 0.0]
+    assert table['status'].tolist() == ['OPEN', 'OPEN']
+    assert table['date'].tolist() == [pd.Timestamp('2000-01-01'), pd.Timestamp('2000-02-01')]
+
+
+def test_registered_schema(deck, monkeypatch):
+    monkeypatch.setitem(SCHEMAS, 'GCONPROD', None)
+    register_schema('GCONPROD', [('group', 'str'), ('control mode', 'category'), ('OIL rate', 'float'), ('WATER rate', 'float', -1.0)])
+    table = extract_keyword(read_data(deck), 'GCONPROD')
+    assert table.columns.tolist() == ['date', 'group', 'control mode', 'OIL rate', 'WATER rate']
+    assert table.iloc[0].tolist()[1:] == ['G1', 'ORAT', 1000.0, -1.0]
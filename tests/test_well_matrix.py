@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from schedule_reader import read_data, well_matrices
+
+SCHEDULE = """SCHEDULE
+WCONHIST
+ 'P1' 'OPEN' 'ORAT' 100 /
+/
+DATES
+ 1 'FEB' 2000 /
+/
+WELOPEN
+ 'P1' 'SHUT' /
+/
+DATES
+ 1 'MAR' 2000 /
+/
+WELOPEN
+ 'P1' /
+/
+"""
+
+
+def test_welopen_defaulted_status_opens_the_well(tmp_path):
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(SCHEDULE)
+    schedule = read_data(str(path), start_date='1 JAN 2000')
+    history = well_matrices(schedule, ['WCONHIST'])['WCONHIST']
+    assert np.allclose(history['OIL rate'][0], [100, 0, 100])
+    assert history.shut[0].tolist() == [False, True, False]
+
+
+def test_welopen_with_only_the_well_name(tmp_path):
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(SCHEDULE[:SCHEDULE.index('WELOPEN')] + "WELOPEN\n 'P1' /\n/\n")
+    schedule = read_data(str(path), start_date='1 JAN 2000')
+    history = well_matrices(schedule, ['WCONHIST'])['WCONHIST']
+    assert np.allclose(history['OIL rate'][0], [100, 100])
+
+
+def test_matrices_of_the_deck(deck):
+    matrices = well_matrices(read_data(deck), ['WCONHIST', 'WCONPROD', 'WCONINJE'], dtype=np.float32)
+    history, prediction = matrices['WCONHIST'], matrices['WCONPROD']
+    assert history.wells.tolist() == prediction.wells.tolist() == ['I1', 'P1']
+    assert len(history.dates) == 5
+    assert history['OIL rate'].dtype == np.float32 and history['OIL rate'].flags.c_contiguous
+    assert np.allclose(history['OIL rate'][1], [100, 150, 150, np.nan, np.nan], equal_nan=True)
+    assert history.defined[0].tolist() == [False] * 5
+    # WELOPEN shuts the well in the same step as its WCONPROD
+    assert np.allclose(prediction['OIL rate'][1], [np.nan, np.nan, np.nan, 0, 0], equal_nan=True)
+    assert prediction.shut[1].tolist() == [False, False, False, True, True]
+    assert np.allclose(matrices['WCONINJE']['SURFACE fluid rate'][0], [np.nan, 600, 600, 600, 600], equal_nan=True)
+    frame = history.to_dataframe('OIL rate')
+    assert frame.index.tolist() == ['I1', 'P1'] and frame.columns[1] == pd.Timestamp('2000-02-01')
+
+
+def test_matrices_without_mask(deck):
+    prediction = well_matrices(read_data(deck), ['WCONPROD'], mask=False)['WCONPROD']
+    # only the wells of the requested keywords
+    assert prediction.wells.tolist() == ['P1']
+    assert np.allclose(prediction['OIL rate'][0], [np.nan, np.nan, np.nan, 200, 200], equal_nan=True)
+    assert prediction.shut[0].tolist() == [False, False, False, True, True]
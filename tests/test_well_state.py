@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from schedule_reader import read_data, WellStateIndex
+
+SCHEDULE = """SCHEDULE
+WELSPECS
+ 'P1' 'G1' 1 1 1* 'OIL' /
+/
+COMPDAT
+ 'P1' 1 1 1 4 'OPEN' /
+/
+DATES
+ 1 'FEB' 2000 /
+/
+COMPDAT
+ 'P1' 1 1 2 2 'SHUT' /
+/
+"""
+
+
+def test_partial_shut_of_a_completion(tmp_path):
+    path = tmp_path / 'SCHEDULE.inc'
+    path.write_text(SCHEDULE)
+    state = WellStateIndex.from_schedule(read_data(str(path), start_date='1 JAN 2000'))
+    assert state.open_completions('2000-01-15')['K'].tolist() == [1, 2, 3, 4]
+    assert state.open_completions('2000-02-15')['K'].tolist() == [1, 3, 4]
+
+
+def test_state_at_a_date(deck):
+    state = WellStateIndex.from_schedule(read_data(deck))
+    assert set(state.keywords) == {'WELSPECS', 'COMPDAT', 'WCONPROD', 'WCONINJE', 'WCONHIST', 'WCONINJH'}
+    before = state.state_at('2000-01-31')
+    assert before['WCONHIST']['OIL rate'].tolist() == [100]
+    assert before['WCONHIST']['until'].tolist() == [pd.Timestamp('2000-02-01')]
+    assert len(before['WCONPROD']) == 0
+    after = state.state_at('2000-02-01', ['wconhist', 'WCONINJE'])
+    assert list(after) == ['WCONHIST', 'WCONINJE']
+    assert after['WCONHIST']['OIL rate'].tolist() == [150]
+    assert pd.isna(after['WCONHIST']['until']).all()
+    assert state.state_at('2000-04-01', 'WCONPROD', wells=['P1', 'I1'])['WCONPROD']['well'].tolist() == ['P1']
+    assert state.state_at('2000-04-01', 'WCONPROD', wells=['I1'])['WCONPROD'].empty
+
+
+def test_state_between_dates(deck):
+    state = WellStateIndex.from_schedule(read_data(deck))
+    history = state.state_between('2000-01-15', '2000-03-01', 'WCONHIST')['WCONHIST']
+    assert history['OIL rate'].tolist() == [100, 150]
+    assert state.state_between('2000-02-15', '2000-03-01', 'WCONHIST')['WCONHIST']['OIL rate'].tolist() == [150]
+    with pytest.raises(ValueError):
+        state.state_between('2000-03-01', '2000-01-01')